@@ -0,0 +1,90 @@
+"""
+Benchmark: profile rule evaluation throughput.
+
+Compiles a synthetic rule set (PROFILES-style condition strings over the
+telemetry metrics) and measures how many snapshots per second RuleSet.select
+can classify, and how many rule evaluations per second that amounts to.
+
+    python bench_profile_rules.py --rules 2000 --snapshots 20000
+"""
+
+import argparse
+import random
+import time
+
+from cs2tune.profile_rules import RuleSet, metrics_from_snapshot
+from cs2tune.telemetry_snapshot import TelemetrySnapshot
+
+METRICS = {
+    "gpu_temp": (50, 95), "gpu_usage": (30, 100), "cpu_temp": (40, 95),
+    "fps": (60, 400), "fps_p1_low": (30, 250), "vram_used": (1, 16),
+    "frame_time_p1_ms": (2, 30),
+}
+
+
+def make_definitions(count, conditions_per_rule):
+    definitions = {}
+    for i in range(count):
+        conditions = {}
+        for metric in random.sample(sorted(METRICS), conditions_per_rule):
+            low, high = METRICS[metric]
+            threshold = round(random.uniform(low, high), 1)
+            if random.random() < 0.2:
+                conditions[metric] = f"> {threshold} and < {round(threshold + (high - low) / 4, 1)}"
+            else:
+                conditions[metric] = f"{random.choice(['<', '>', '<=', '>='])} {threshold}"
+        definitions[f"rule_{i}"] = {
+            "priority": random.randint(0, 1000),
+            "match": "any" if random.random() < 0.1 else "all",
+            "conditions": conditions,
+        }
+    return definitions
+
+
+def make_snapshot(t):
+    def rand(metric):
+        low, high = METRICS[metric]
+        return random.uniform(low, high)
+    return TelemetrySnapshot(timestamp=t, fps=rand("fps"), gpu_temp=rand("gpu_temp"),
+                             gpu_usage=rand("gpu_usage"), cpu_temp=rand("cpu_temp"),
+                             vram_used=rand("vram_used"), fps_p1_low=rand("fps_p1_low"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile rule engine benchmark")
+    parser.add_argument("--rules", type=int, default=2000, help="Rules in the set")
+    parser.add_argument("--conditions", type=int, default=3, help="Conditions per rule")
+    parser.add_argument("--snapshots", type=int, default=20000, help="Snapshots to classify")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    definitions = make_definitions(args.rules, args.conditions)
+    start = time.perf_counter()
+    rules = RuleSet.from_definitions(definitions, default="fallback")
+    compile_s = time.perf_counter() - start
+
+    values = [metrics_from_snapshot(make_snapshot(i)) for i in range(args.snapshots)]
+    start = time.perf_counter()
+    selected = [rules.select(v) for v in values]
+    select_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for v in values[:max(1, args.snapshots // 10)]:
+        rules.matching(v)
+    full_s = (time.perf_counter() - start) / max(1, args.snapshots // 10) * args.snapshots
+
+    fallback = selected.count("fallback") / len(selected) * 100
+    print(f"{args.rules} rules x {args.conditions} conditions compiled in {compile_s * 1000:.1f} ms")
+    print(f"{'mode':<10} {'snapshots/s':>12} {'rules/s':>14} {'us/snapshot':>12}")
+    for name, seconds in (("select", select_s), ("all-rules", full_s)):
+        # select() stops at the first match; "all-rules" evaluates every rule
+        rule_evals = args.rules * args.snapshots if name == "all-rules" else None
+        per_second = args.snapshots / seconds
+        rules_per_s = f"{rule_evals / seconds:>14,.0f}" if rule_evals else f"{'-':>14}"
+        print(f"{name:<10} {per_second:>12,.0f} {rules_per_s} {seconds / args.snapshots * 1e6:>12.1f}")
+    print(f"{fallback:.1f}% of snapshots matched no rule")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: JSON vs packed binary telemetry frames.
+
+Compares wire bytes per second and server CPU time per frame for the two
+encodings the socket.io channel supports. Socket.io packet framing is
+approximated: JSON frames are sent as `["telemetry", {...}]`, binary frames
+as a placeholder packet plus the raw attachment.
+
+    python bench_telemetry_codec.py --clients 4 --rate 30
+"""
+
+import argparse
+import json
+import random
+import time
+
+from cs2tune.telemetry_codec import SCHEMA_FIELDS, encode_frame, decode_frame
+
+BINARY_PLACEHOLDER = json.dumps(["telemetry", {"_placeholder": True, "num": 0}])
+
+
+def make_payload(seq):
+    payload = {
+        "fps": round(random.uniform(180, 320), 2),
+        "temp": round(random.uniform(60, 85), 2),
+        "load": round(random.uniform(50, 100), 2),
+        "vram": round(random.uniform(2, 12), 2),
+    }
+    payload["min"] = {k: v - 1 for k, v in payload.items()}
+    payload["max"] = {k: v + 1 for k, v in payload.items() if k in SCHEMA_FIELDS}
+    payload["samples"] = 1
+    payload["seq"] = seq
+    return payload
+
+
+def encode_json(payload):
+    return json.dumps(["telemetry", payload]).encode()
+
+
+def encode_binary(payload):
+    return BINARY_PLACEHOLDER.encode() + encode_frame(payload, payload["seq"], time.time())
+
+
+def bench(encoder, payloads):
+    start = time.process_time()
+    total = sum(len(encoder(p)) for p in payloads)
+    return total, time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry frame encoding benchmark")
+    parser.add_argument("--clients", type=int, default=4, help="Connected overlay/browser clients")
+    parser.add_argument("--rate", type=float, default=30, help="Frames per second per client")
+    parser.add_argument("--frames", type=int, default=100000, help="Frames to encode per encoding")
+    args = parser.parse_args()
+
+    payloads = [make_payload(i) for i in range(args.frames)]
+    frames_per_sec = args.clients * args.rate
+
+    sample = encode_frame(payloads[0], 1, time.time())
+    assert decode_frame(sample)["seq"] == 1
+
+    print(f"{args.clients} clients x {args.rate:g} Hz = {frames_per_sec:g} frames/s")
+    print(f"{'encoding':<8} {'bytes/frame':>12} {'bytes/s':>10} {'us/frame':>9} {'CPU %':>7}")
+    for name, encoder in (("json", encode_json), ("binary", encode_binary)):
+        total, cpu = bench(encoder, payloads)
+        per_frame = total / args.frames
+        us_per_frame = cpu / args.frames * 1e6
+        cpu_pct = us_per_frame * frames_per_sec / 1e4
+        print(f"{name:<8} {per_frame:>12.1f} {per_frame * frames_per_sec:>10.0f} "
+              f"{us_per_frame:>9.2f} {cpu_pct:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
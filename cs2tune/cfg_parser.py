@@ -0,0 +1,301 @@
+"""
+Parser and in-memory convar model for CS2 .cfg and .vcfg files.
+
+.cfg files are console scripts: statements separated by newlines or `;`,
+`//` comments, optional double quotes, and values often tab-aligned after
+the name. A statement with a value is a convar assignment, anything else
+(exec, bind, alias, ...) is kept as a command. `exec` includes are followed
+relative to the cfg folder, so load() gives the effective convar values of
+a whole config chain, each with the file and line that set it.
+
+.vcfg files are KeyValues blocks ("key" "value" / "key" { ... }); entries are
+flattened to "config/bindings/w"-style paths, and anything under a
+"convars" block is exposed as convars too.
+
+load() caches parsed files by mtime and size, including every file pulled in
+through exec, so repeated reads of unchanged profiles cost a few stat calls.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Console commands that take arguments but are not convar assignments
+COMMANDS = {
+    "exec", "exec_async", "execifexists", "bind", "unbind", "unbindall", "bind_osx",
+    "alias", "echo", "say", "say_team", "toggle", "incrementvar", "host_writeconfig",
+    "map", "map_workshop", "changelevel", "connect", "disconnect", "playdemo", "record",
+    "stop", "kick", "kickid", "bot_add", "bot_add_t", "bot_add_ct", "bot_kick",
+    "mp_restartgame", "mp_warmup_start", "mp_warmup_end", "mp_warmup_pausetimer",
+    "give", "ent_fire", "sv_cheats_flag", "game_mode_flags",
+}
+MAX_EXEC_DEPTH = 16
+
+
+@dataclass(frozen=True)
+class Location:
+    path: str
+    line: int
+    index: int = field(default=0, compare=False)  # statement number in the file, `;` splits included
+
+    def __str__(self):
+        return f"{self.path}:{self.line}"
+
+
+@dataclass(frozen=True)
+class Convar:
+    name: str
+    value: str
+    location: Location
+    comment: str = ""
+
+
+@dataclass(frozen=True)
+class Command:
+    name: str
+    args: Tuple[str, ...]
+    location: Location
+
+
+@dataclass
+class CfgFile:
+    """Ordered convar map plus the non-convar commands of one config chain.
+
+    Keys of `convars` are lower-case (the console is case-insensitive) and
+    the last assignment wins. parse_cfg() keeps each convar where it was
+    first assigned in the file. A chain merged by load() places each convar
+    where the replayed statements first set it, and replays a file's own
+    convars at their last assignment in that file.
+    """
+    path: str
+    convars: Dict[str, Convar] = field(default_factory=dict)
+    commands: List[Command] = field(default_factory=list)
+    includes: List[str] = field(default_factory=list)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        convar = self.convars.get(name.lower())
+        return convar.value if convar else default
+
+    def values(self) -> Dict[str, str]:
+        """{name: value} in file order."""
+        return {c.name: c.value for c in self.convars.values()}
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.convars
+
+    def __len__(self) -> int:
+        return len(self.convars)
+
+
+# --- Tokenizing --------------------------------------------------------------
+
+def _split_statement(line: str) -> Iterator[Tuple[List[str], str]]:
+    """Tokens of each `;`-separated statement on one line, with its trailing comment.
+
+    One left-to-right scan; quotes protect `;`, `//` and whitespace.
+    """
+    tokens: List[str] = []
+    current: List[str] = []
+    in_token = False
+    i, n = 0, len(line)
+    while i < n:
+        ch = line[i]
+        if ch == '"':
+            end = line.find('"', i + 1)
+            if end < 0:
+                end = n
+            current.append(line[i + 1:end])
+            in_token = True
+            i = end + 1
+            continue
+        if ch == "/" and line.startswith("//", i):
+            if in_token:
+                tokens.append("".join(current))
+            yield tokens, line[i + 2:].strip()
+            return
+        if ch == ";":
+            if in_token:
+                tokens.append("".join(current))
+            yield tokens, ""
+            tokens, current, in_token = [], [], False
+        elif ch in " \t\r\f\v":
+            if in_token:
+                tokens.append("".join(current))
+                current, in_token = [], False
+        else:
+            current.append(ch)
+            in_token = True
+        i += 1
+    if in_token:
+        tokens.append("".join(current))
+    yield tokens, ""
+
+
+def tokenize_cfg(text: str) -> Iterator[Tuple[int, List[str], str]]:
+    """(line number, tokens, trailing comment) for every statement in a .cfg."""
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line or line.isspace():
+            continue
+        if '"' not in line and ";" not in line and "//" not in line:
+            yield number, line.split(), ""    # the common case, no scanning needed
+            continue
+        for tokens, comment in _split_statement(line):
+            if tokens:
+                yield number, tokens, comment
+
+
+def parse_cfg(text: str, path: str = "<string>") -> CfgFile:
+    """Parse .cfg text without following exec includes."""
+    cfg = CfgFile(path=path)
+    for index, (number, tokens, comment) in enumerate(tokenize_cfg(text)):
+        name = tokens[0]
+        location = Location(path, number, index)
+        lowered = name.lower()
+        if len(tokens) == 1 or lowered in COMMANDS or name[0] in "+-":
+            cfg.commands.append(Command(name, tuple(tokens[1:]), location))
+            if lowered in ("exec", "exec_async", "execifexists") and len(tokens) > 1:
+                cfg.includes.append(tokens[1])
+            continue
+        value = tokens[1] if len(tokens) == 2 else " ".join(tokens[1:])
+        cfg.convars[lowered] = Convar(name, value, location, comment)
+    return cfg
+
+
+def tokenize_vcfg(text: str) -> Iterator[Tuple[int, str, bool]]:
+    """(line number, token, quoted) for a KeyValues file; braces are unquoted tokens."""
+    for number, line in enumerate(text.splitlines(), 1):
+        i, n = 0, len(line)
+        while i < n:
+            ch = line[i]
+            if ch in " \t\r":
+                i += 1
+            elif ch == "/" and line.startswith("//", i):
+                break
+            elif ch == '"':
+                end = line.find('"', i + 1)
+                end = n if end < 0 else end
+                yield number, line[i + 1:end], True
+                i = end + 1
+            elif ch in "{}":
+                yield number, ch, False
+                i += 1
+            else:
+                start = i
+                while i < n and line[i] not in ' \t\r"{}':
+                    i += 1
+                yield number, line[start:i], True
+
+
+def parse_vcfg(text: str, path: str = "<string>") -> Tuple[Dict[str, Tuple[str, Location]], CfgFile]:
+    """Parse a .vcfg into ({"a/b/key": (value, location)}, CfgFile of its "convars" blocks)."""
+    entries: Dict[str, Tuple[str, Location]] = {}
+    cfg = CfgFile(path=path)
+    stack: List[str] = []
+    pending: Optional[str] = None
+    for number, token, quoted in tokenize_vcfg(text):
+        if not quoted and token == "{":
+            stack.append(pending or "")
+            pending = None
+        elif not quoted and token == "}":
+            if stack:
+                stack.pop()
+            pending = None
+        elif pending is None:
+            pending = token
+        else:
+            location = Location(path, number)
+            entries["/".join(stack + [pending])] = (token, location)
+            if stack and stack[-1].lower() == "convars":
+                cfg.convars[pending.lower()] = Convar(pending, token, location)
+            pending = None
+    return entries, cfg
+
+
+# --- Loading with exec includes and an mtime cache ---------------------------
+
+_cache: Dict[Tuple[str, str], Tuple[Tuple[Tuple[str, int, int], ...], CfgFile]] = {}
+_cache_lock = threading.Lock()
+
+
+def _stamp(path: Path) -> Tuple[str, int, int]:
+    try:
+        st = path.stat()
+        return str(path), st.st_mtime_ns, st.st_size
+    except OSError:
+        return str(path), -1, -1
+
+
+def _resolve_exec(name: str, cfg_dir: Path) -> Path:
+    target = cfg_dir / name.replace("\\", "/")
+    return target if target.suffix else target.with_suffix(".cfg")
+
+
+def _read(path: Path) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _load_chain(path: Path, cfg_dir: Path, stack: Tuple[Path, ...], deps: List[Path]) -> CfgFile:
+    """`path` with its exec includes expanded in place, as the console would run it."""
+    deps.append(path)
+    if path.suffix.lower() == ".vcfg":
+        return parse_vcfg(_read(path), str(path))[1]
+    own = parse_cfg(_read(path), str(path))
+    merged = CfgFile(path=str(path), includes=list(own.includes))
+    # Replay statements in file order, so an exec overrides exactly what
+    # precedes it, even within one `;`-separated line
+    statements = list(own.convars.values()) + own.commands
+    for item in sorted(statements, key=lambda statement: statement.location.index):
+        if isinstance(item, Convar):
+            merged.convars[item.name.lower()] = item
+            continue
+        merged.commands.append(item)
+        if item.name.lower() in ("exec", "exec_async", "execifexists") and item.args:
+            target = _resolve_exec(item.args[0], cfg_dir)
+            if target in stack or len(stack) >= MAX_EXEC_DEPTH:
+                continue
+            if not target.is_file():
+                deps.append(target)  # so creating it later invalidates the cache
+                continue
+            included = _load_chain(target, cfg_dir, stack + (target,), deps)
+            merged.convars.update(included.convars)
+            merged.commands.extend(included.commands)
+    return merged
+
+
+def load(path, cfg_dir=None, follow_exec: bool = True) -> CfgFile:
+    """Parse a .cfg/.vcfg file (following exec includes), cached by mtime.
+
+    `cfg_dir` is where exec looks for files; it defaults to the file's folder.
+    Convars set by an included file override earlier ones at the point of the
+    exec, as they do in game. The returned object is shared; don't mutate it.
+    """
+    path = Path(path)
+    cfg_dir = Path(cfg_dir) if cfg_dir else path.parent
+    key = (str(path.resolve()), f"{cfg_dir.resolve()}|{follow_exec}")
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and all(_stamp(Path(p)) == (p, m, s) for p, m, s in cached[0]):
+        return cached[1]
+
+    deps: List[Path] = []
+    if follow_exec:
+        cfg = _load_chain(path, cfg_dir, (path,), deps)
+    else:
+        deps.append(path)
+        text = _read(path)
+        cfg = parse_vcfg(text, str(path))[1] if path.suffix.lower() == ".vcfg" else parse_cfg(text, str(path))
+    with _cache_lock:
+        _cache[key] = (tuple(_stamp(p) for p in deps), cfg)
+    return cfg
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def load_dir(directory, pattern: str = "*.cfg") -> Dict[str, CfgFile]:
+    """Every matching file in a folder, keyed by file name, through the cache."""
+    return {p.name: load(p) for p in sorted(Path(directory).glob(pattern)) if p.is_file()}
@@ -0,0 +1,181 @@
+"""
+Real CS2 FPS ingestion for CS2Tune.
+Tails the console.log that CS2 writes when launched with `-condebug` and
+parses `cl_showfps` / `cl_printfps` output incrementally, publishing
+frame-time samples to every subscriber.
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_CONSOLE_LOG = Path(os.environ.get(
+    'CS2_CONSOLE_LOG',
+    Path(os.environ.get(
+        'CSGO_CFG_DIR',
+        Path.home() / "steamapps/common/Counter-Strike Global Offensive/game/csgo/cfg"
+    )).parent / "console.log"
+))
+DEFAULT_POLL_INTERVAL = 0.25  # seconds between log reads
+STALE_AFTER = 5.0             # seconds before the last sample no longer counts as live
+
+# "fps: 245.3", "FPS=245", "245.3 fps" -- but not fps_max / cl_showfps convars
+FPS_PATTERN = re.compile(
+    r"(?:\bfps\b\s*[:=]?\s*(?P<after>\d+(?:\.\d+)?))|(?:(?P<before>\d+(?:\.\d+)?)\s*fps\b)",
+    re.IGNORECASE,
+)
+FRAME_TIME_PATTERN = re.compile(
+    r"(?:frame\s*time\s*[:=]?\s*(?P<after>\d+(?:\.\d+)?)\s*ms)|(?:(?P<before>\d+(?:\.\d+)?)\s*ms\s*/\s*frame)",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class FrameSample:
+    """One FPS reading parsed from the console log."""
+    timestamp: float
+    fps: float
+    frame_time_ms: float
+
+
+def parse_fps_line(line, timestamp=None):
+    """Parse one console line into a FrameSample, or None if it carries no FPS."""
+    match = FPS_PATTERN.search(line)
+    if not match:
+        return None
+    fps = float(match.group("after") or match.group("before"))
+    if fps <= 0:
+        return None
+    frame_match = FRAME_TIME_PATTERN.search(line)
+    if frame_match:
+        frame_time = float(frame_match.group("after") or frame_match.group("before"))
+    else:
+        frame_time = 1000.0 / fps
+    return FrameSample(time.time() if timestamp is None else timestamp, fps, frame_time)
+
+
+class ConsoleLogTailer:
+    """Reads only the bytes appended since the last call.
+
+    Handles truncation (file shrank below the saved offset) and rotation
+    (file replaced, detected by a changed inode/file index) by starting over
+    from the beginning of the new file. Partial trailing lines are held
+    until their newline arrives.
+    """
+
+    def __init__(self, path, from_end=False):
+        self.path = Path(path)
+        self.offset = 0
+        self._file_id = None
+        self._partial = b""
+        self._from_end = from_end
+
+    def read_lines(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._from_end = False  # file appears later: read it from the start
+            return []
+        file_id = (stat.st_dev, stat.st_ino)
+        if self._file_id is None and self._from_end:
+            self.offset = stat.st_size
+        elif file_id != self._file_id and self._file_id is not None:
+            self.offset = 0  # rotated: new file
+            self._partial = b""
+        if stat.st_size < self.offset:
+            self.offset = 0  # truncated in place
+            self._partial = b""
+        self._file_id = file_id
+        if stat.st_size == self.offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        self.offset += len(chunk)
+        data = self._partial + chunk
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        return [line.decode('utf-8', errors='replace').rstrip("\r") for line in lines]
+
+
+class FpsIngest:
+    """Polls a ConsoleLogTailer and publishes FrameSamples to subscribers."""
+
+    def __init__(self, path=DEFAULT_CONSOLE_LOG, poll_interval=DEFAULT_POLL_INTERVAL, from_end=True):
+        self.tailer = ConsoleLogTailer(path, from_end=from_end)
+        self.poll_interval = poll_interval
+        self.latest = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback):
+        """Call `callback(sample)` for every parsed FrameSample."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def poll(self):
+        """Read new log lines once; return the samples published."""
+        samples = []
+        for line in self.tailer.read_lines():
+            sample = parse_fps_line(line)
+            if sample is not None:
+                samples.append(sample)
+        if samples:
+            with self._lock:
+                self.latest = samples[-1]
+                subscribers = list(self._subscribers)
+            for sample in samples:
+                for callback in subscribers:
+                    callback(sample)
+        return samples
+
+    def current_fps(self, max_age=STALE_AFTER):
+        """FPS of the newest sample, or None if nothing recent was logged."""
+        sample = self.latest
+        if sample is None or time.time() - sample.timestamp > max_age:
+            return None
+        return sample.fps
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="fps-ingest", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except OSError:
+                pass
+            self._stop.wait(self.poll_interval)
+
+
+_shared_ingest = None
+_shared_lock = threading.Lock()
+
+
+def get_fps_ingest():
+    """Return the process-wide FpsIngest (started on first use)."""
+    global _shared_ingest
+    with _shared_lock:
+        if _shared_ingest is None:
+            _shared_ingest = FpsIngest().start()
+        return _shared_ingest
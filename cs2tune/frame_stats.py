@@ -0,0 +1,208 @@
+"""
+Streaming frame-time statistics for CS2Tune.
+Each sample is an O(1) update: rolling sums give mean and variance, a
+log-bucketed quantile sketch gives the 1% / 0.1% lows, and stutters are
+counted as they arrive. The dashboards, overlay and auto-switcher query the
+same FrameStats instead of recomputing from raw lists.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+DEFAULT_WINDOWS = {"10s": 10.0, "60s": 60.0}
+SKETCH_ACCURACY = 0.01   # relative error of reported quantiles
+STUTTER_FACTOR = 2.0     # a frame this many times slower than the window mean is a stutter
+STUTTER_MIN_MS = 8.0     # ...and it must also take at least this long
+
+
+class QuantileSketch:
+    """Mergeable log-bucketed quantile sketch (DDSketch style).
+
+    Values land in buckets whose bounds grow geometrically, so any quantile
+    is reported within `accuracy` relative error. Insert and remove are O(1);
+    two sketches with the same accuracy merge by adding bucket counts.
+    """
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.accuracy = accuracy
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets = {}
+        self.count = 0
+
+    def _key(self, value):
+        return math.ceil(math.log(max(value, 1e-9)) / self._log_gamma)
+
+    def add(self, value, weight=1):
+        key = self._key(value)
+        self.buckets[key] = self.buckets.get(key, 0) + weight
+        self.count += weight
+
+    def remove(self, value):
+        key = self._key(value)
+        remaining = self.buckets.get(key, 0) - 1
+        if remaining > 0:
+            self.buckets[key] = remaining
+        else:
+            self.buckets.pop(key, None)
+        self.count = max(0, self.count - 1)
+
+    def merge(self, other):
+        if other.accuracy != self.accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, n in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Approximate q-quantile (0..1), or None if the sketch is empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+
+@dataclass(frozen=True)
+class FrameSummary:
+    """Statistics over one window; FPS values are 0 when the window is empty.
+
+    The 1% / 0.1% lows are the FPS at the 99th / 99.9th percentile frame time.
+    """
+    window: str
+    samples: int
+    avg_fps: float
+    mean_frame_ms: float
+    stdev_frame_ms: float
+    min_fps: float
+    max_fps: float
+    p1_low_fps: float
+    p01_low_fps: float
+    stutters: int
+
+    @property
+    def stability(self):
+        """Frame pacing score: 100 minus the frame-time coefficient of variation, in percent."""
+        if self.mean_frame_ms <= 0:
+            return 0.0
+        return max(0.0, 100.0 - self.stdev_frame_ms / self.mean_frame_ms * 100)
+
+
+class _Window:
+    """Time-bounded window with O(1) amortised add and evict."""
+
+    def __init__(self, name, seconds, accuracy):
+        self.name = name
+        self.seconds = seconds
+        self.samples = deque()  # (timestamp, frame_ms, is_stutter)
+        self.sketch = QuantileSketch(accuracy)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.stutters = 0
+
+    def add(self, timestamp, frame_ms, stutter_factor, stutter_min_ms):
+        mean = self.total / len(self.samples) if self.samples else frame_ms
+        is_stutter = frame_ms >= stutter_min_ms and frame_ms > mean * stutter_factor
+        self.samples.append((timestamp, frame_ms, is_stutter))
+        self.sketch.add(frame_ms)
+        self.total += frame_ms
+        self.total_sq += frame_ms * frame_ms
+        self.stutters += is_stutter
+
+    def evict(self, now):
+        cutoff = now - self.seconds
+        while self.samples and self.samples[0][0] < cutoff:
+            _, frame_ms, is_stutter = self.samples.popleft()
+            self.sketch.remove(frame_ms)
+            self.total -= frame_ms
+            self.total_sq -= frame_ms * frame_ms
+            self.stutters -= is_stutter
+        if not self.samples:
+            # Reset the running sums so float drift never accumulates
+            self.total = self.total_sq = 0.0
+
+    def summary(self):
+        n = len(self.samples)
+        if n == 0:
+            return FrameSummary(self.name, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0)
+        mean = self.total / n
+        variance = max(0.0, self.total_sq / n - mean * mean)
+        slowest = self.sketch.quantile(1.0)
+        fastest = self.sketch.quantile(0.0)
+        return FrameSummary(
+            window=self.name,
+            samples=n,
+            avg_fps=1000.0 / mean if mean > 0 else 0.0,
+            mean_frame_ms=mean,
+            stdev_frame_ms=math.sqrt(variance),
+            min_fps=1000.0 / slowest,
+            max_fps=1000.0 / fastest,
+            p1_low_fps=1000.0 / self.sketch.quantile(0.99),
+            p01_low_fps=1000.0 / self.sketch.quantile(0.999),
+            stutters=self.stutters,
+        )
+
+
+class FrameStats:
+    """Thread-safe streaming frame-time statistics over several time windows.
+
+    `windows` maps a window name to its length in seconds, e.g.
+    {"10s": 10, "60s": 60}. Feed it frame times (or FPS readings) as they
+    arrive and ask for a FrameSummary per window.
+    """
+
+    def __init__(self, windows=None, accuracy=SKETCH_ACCURACY,
+                 stutter_factor=STUTTER_FACTOR, stutter_min_ms=STUTTER_MIN_MS):
+        self.stutter_factor = stutter_factor
+        self.stutter_min_ms = stutter_min_ms
+        self._windows = {
+            name: _Window(name, seconds, accuracy)
+            for name, seconds in (windows or DEFAULT_WINDOWS).items()
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def windows(self):
+        return tuple(self._windows)
+
+    def add(self, frame_time_ms, timestamp=None):
+        if frame_time_ms <= 0:
+            return
+        now = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for window in self._windows.values():
+                window.evict(now)
+                window.add(now, frame_time_ms, self.stutter_factor, self.stutter_min_ms)
+
+    def add_fps(self, fps, timestamp=None):
+        if fps and fps > 0:
+            self.add(1000.0 / fps, timestamp)
+
+    def add_sample(self, sample):
+        """Subscriber callback for cs2tune.fps_ingest FrameSamples."""
+        self.add(sample.frame_time_ms, sample.timestamp)
+
+    def summary(self, window=None, now=None):
+        """FrameSummary for `window` (defaults to the first configured window)."""
+        name = window or next(iter(self._windows))
+        with self._lock:
+            target = self._windows[name]
+            target.evict(time.time() if now is None else now)
+            return target.summary()
+
+    def merged_sketch(self, *stats, window=None):
+        """Sketch combining this window with the same window of other FrameStats."""
+        name = window or next(iter(self._windows))
+        merged = QuantileSketch(self._windows[name].sketch.accuracy)
+        for source in (self, *stats):
+            with source._lock:
+                merged.merge(source._windows[name].sketch)
+        return merged
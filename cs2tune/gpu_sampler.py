@@ -0,0 +1,240 @@
+"""
+Shared GPU sampler for CS2Tune.
+Holds one NVML handle (or one long-running `nvidia-smi --loop-ms` stream) open
+and serves cached readings, so callers never fork nvidia-smi per query.
+"""
+
+import logging
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+
+DEFAULT_SAMPLE_INTERVAL = 1.0  # seconds between backend reads
+FIRST_READING_TIMEOUT = 3.0    # seconds to wait for a stream backend's first line
+
+
+@dataclass(frozen=True)
+class GPUReading:
+    """One GPU sample; memory values are in MB."""
+    temperature: float
+    utilization: float
+    memory_used: float
+    memory_total: float
+    timestamp: float
+    name: str = ""
+
+
+class NvmlBackend:
+    """Reads the GPU through a single persistent NVML handle."""
+
+    name = "nvml"
+
+    def __init__(self, index=0):
+        import pynvml
+        pynvml.nvmlInit()
+        self._nvml = pynvml
+        self._handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+        gpu_name = pynvml.nvmlDeviceGetName(self._handle)
+        self._gpu_name = gpu_name.decode() if isinstance(gpu_name, bytes) else gpu_name
+
+    def read(self):
+        nvml = self._nvml
+        temp = nvml.nvmlDeviceGetTemperature(self._handle, nvml.NVML_TEMPERATURE_GPU)
+        util = nvml.nvmlDeviceGetUtilizationRates(self._handle)
+        mem = nvml.nvmlDeviceGetMemoryInfo(self._handle)
+        return GPUReading(
+            temperature=float(temp),
+            utilization=float(util.gpu),
+            memory_used=mem.used / (1024 * 1024),
+            memory_total=mem.total / (1024 * 1024),
+            timestamp=time.time(),
+            name=self._gpu_name,
+        )
+
+    def close(self):
+        try:
+            self._nvml.nvmlShutdown()
+        except Exception:
+            pass
+
+
+class NvidiaSmiStreamBackend:
+    """Keeps one `nvidia-smi --loop-ms` process running and parses its output."""
+
+    name = "nvidia-smi"
+
+    def __init__(self, interval_ms=1000, index=0):
+        self._latest = None
+        self._lock = threading.Lock()
+        self._first = threading.Event()
+        self._proc = subprocess.Popen(
+            [
+                "nvidia-smi",
+                f"--id={index}",
+                "--query-gpu=temperature.gpu,utilization.gpu,memory.used,memory.total,name",
+                "--format=csv,noheader,nounits",
+                f"--loop-ms={interval_ms}",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._reader = threading.Thread(target=self._read_stream, daemon=True)
+        self._reader.start()
+
+    @staticmethod
+    def parse_line(line):
+        """Parse one CSV line of nvidia-smi output into a GPUReading."""
+        parts = [p.strip() for p in line.split(',')]
+        temp, usage, mem_used, mem_total = map(float, parts[:4])
+        name = parts[4] if len(parts) > 4 else ""
+        return GPUReading(temp, usage, mem_used, mem_total, time.time(), name)
+
+    def _read_stream(self):
+        for line in self._proc.stdout:
+            try:
+                reading = self.parse_line(line)
+            except ValueError:
+                continue
+            with self._lock:
+                self._latest = reading
+            self._first.set()
+
+    def read(self):
+        self._first.wait(FIRST_READING_TIMEOUT)
+        with self._lock:
+            return self._latest
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+
+
+class FakeBackend:
+    """Serves scripted readings so the sampler can be exercised without a GPU.
+
+    `readings` is a sequence of (temperature, utilization) or
+    (temperature, utilization, memory_used, memory_total) tuples; the last one
+    is repeated once the sequence is exhausted.
+    """
+
+    name = "fake"
+
+    def __init__(self, readings=((70.0, 80.0),), gpu_name="Fake GPU"):
+        self._readings = list(readings)
+        self._gpu_name = gpu_name
+        self.reads = 0
+        self.closed = False
+
+    def read(self):
+        values = self._readings[min(self.reads, len(self._readings) - 1)]
+        self.reads += 1
+        temp, usage = values[0], values[1]
+        mem_used = values[2] if len(values) > 2 else 0.0
+        mem_total = values[3] if len(values) > 3 else 0.0
+        return GPUReading(float(temp), float(usage), float(mem_used), float(mem_total),
+                          time.time(), self._gpu_name)
+
+    def close(self):
+        self.closed = True
+
+
+def open_backend(interval=DEFAULT_SAMPLE_INTERVAL):
+    """Open the best available backend: NVML first, then an nvidia-smi stream."""
+    try:
+        return NvmlBackend()
+    except Exception as e:
+        logging.debug(f"NVML unavailable: {e}")
+    if shutil.which("nvidia-smi"):
+        try:
+            return NvidiaSmiStreamBackend(interval_ms=int(interval * 1000))
+        except OSError as e:
+            logging.debug(f"nvidia-smi stream unavailable: {e}")
+    return None
+
+
+class GPUSampler:
+    """Long-lived sampler that polls one backend on a daemon thread.
+
+    Every caller gets the most recent cached reading from `latest()`; the
+    backend is read at most once per `interval` regardless of caller count.
+    """
+
+    def __init__(self, backend=None, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.backend = backend
+        self.interval = interval
+        self._latest = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._unavailable = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Open the backend (if needed), take a first reading and start polling."""
+        if self.running:
+            return self
+        if self.backend is None:
+            self.backend = open_backend(self.interval)
+        if self.backend is None:
+            logging.warning("No GPU backend available (NVML and nvidia-smi both failed)")
+            self._unavailable = True
+            return self
+        logging.info(f"GPU sampler started with {self.backend.name} backend")
+        self._sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gpu-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        if self.backend is not None:
+            self.backend.close()
+
+    def latest(self):
+        """Return the most recent GPUReading, or None if no GPU is available."""
+        if not self.running and not self._unavailable:
+            self.start()
+        with self._lock:
+            return self._latest
+
+    def _sample(self):
+        try:
+            reading = self.backend.read()
+        except Exception as e:
+            logging.error(f"GPU sampler read failed: {e}")
+            return
+        if reading is not None:
+            with self._lock:
+                self._latest = reading
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+
+_shared_sampler = None
+_shared_lock = threading.Lock()
+
+
+def get_sampler(interval=DEFAULT_SAMPLE_INTERVAL):
+    """Return the process-wide GPUSampler, creating it on first use."""
+    global _shared_sampler
+    with _shared_lock:
+        if _shared_sampler is None:
+            _shared_sampler = GPUSampler(interval=interval)
+        return _shared_sampler
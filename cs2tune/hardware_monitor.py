@@ -10,10 +10,20 @@ import time
 import json
 import logging
 import argparse
-import subprocess
 import psutil
 from pathlib import Path
 
+from cs2tune.fps_ingest import get_fps_ingest
+from cs2tune.frame_stats import FrameStats
+from cs2tune.gpu_sampler import get_sampler
+from cs2tune.netcon import NetconClient
+from cs2tune.process_watcher import get_process_watcher
+from cs2tune.profile_apply import apply_profile
+from cs2tune.profile_controller import ProfileController
+from cs2tune.profile_rules import load_rules
+from cs2tune.telemetry_snapshot import SnapshotCollector
+from cs2tune.telemetry_recorder import TelemetryRecorder
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,44 +46,56 @@ DEFAULT_GPU_USAGE_HIGH = 95
 DEFAULT_FPS_LOW = 180
 DEFAULT_POLLING_INTERVAL = 5
 
-# Profile definitions
+# Set from --netcon-port; profile changes are then also sent to the running game
+netcon_client = None
+
+# Profile definitions: the highest-priority profile whose conditions match
+# the smoothed metrics is selected; `hold` keeps the active profile until the
+# metrics are back past its exit thresholds. Profiles in PROFILES_DIR can
+# override these with `// @when ...` directives (see cs2tune.profile_rules).
 PROFILES = {
     "max_fps": {
         "description": "Maximum FPS with minimal visual quality",
-        "conditions": {
-            "gpu_temp": "< 80",
-            "gpu_usage": "< 95"
-        }
+        "priority": 0,
+        "conditions": {}
     },
     "balanced": {
         "description": "Good balance of performance and visuals",
+        "priority": 50,
         "conditions": {
-            "gpu_temp": "< 85",
-            "fps": "> 200"
+            "fps": f"< {DEFAULT_FPS_LOW}"
+        },
+        "hold": {
+            "fps": f"< {DEFAULT_FPS_LOW + 20}"
         }
     },
     "gpu_saver": {
         "description": "Reduces GPU load to prevent overheating",
+        "priority": 100,
+        "match": "any",
         "conditions": {
-            "gpu_temp": "> 85",
-            "gpu_usage": "> 95"
+            "gpu_temp_forecast": f">= {DEFAULT_GPU_TEMP_HIGH}",
+            "gpu_usage": f">= {DEFAULT_GPU_USAGE_HIGH}"
+        },
+        "hold": {
+            "gpu_temp_forecast": f">= {DEFAULT_GPU_TEMP_HIGH - 5}",
+            "gpu_usage": f">= {DEFAULT_GPU_USAGE_HIGH - 5}"
         }
     }
 }
 
+def get_gpu_snapshot():
+    """Get GPU temperature, usage and VRAM used (GB) from one sampler reading"""
+    reading = get_sampler().latest()
+    if reading is None:
+        logging.error("Failed to get GPU info: no GPU sampler reading available")
+        return 70, 80, 0.0  # Default values if no GPU backend is available
+    return reading.temperature, reading.utilization, reading.memory_used / 1024
+
 def get_gpu_info():
-    """Get NVIDIA GPU temperature and usage using nvidia-smi"""
-    try:
-        output = subprocess.check_output([
-            "nvidia-smi", 
-            "--query-gpu=temperature.gpu,utilization.gpu", 
-            "--format=csv,noheader,nounits"
-        ]).decode()
-        temp, usage = map(float, output.strip().split(','))
-        return temp, usage
-    except Exception as e:
-        logging.error(f"Failed to get GPU info: {e}")
-        return 70, 80  # Default values if nvidia-smi fails
+    """Get NVIDIA GPU temperature and usage from the shared GPU sampler"""
+    temp, usage, _ = get_gpu_snapshot()
+    return temp, usage
 
 def get_cpu_temp():
     """Get CPU temperature using psutil"""
@@ -86,11 +108,16 @@ def get_cpu_temp():
         logging.error(f"Failed to get CPU temp: {e}")
         return 70
 
-def get_fps():
-    """Get current FPS from CS2 (simulated for now)"""
-    # TODO: Implement actual CS2 FPS reading from game files or memory
-    # For now, we'll simulate based on GPU usage
-    _, gpu_usage = get_gpu_info()
+def get_fps(gpu_usage=None):
+    """Get current FPS from CS2's console log (estimated if the game isn't logging)"""
+    fps = get_fps_ingest().current_fps()
+    if fps is not None:
+        return fps
+    
+    # No live cl_showfps/cl_printfps output (CS2 not started with -condebug):
+    # fall back to an estimate based on GPU usage
+    if gpu_usage is None:
+        _, gpu_usage = get_gpu_info()
     base_fps = 250
     fps = max(1, base_fps * (0.5 + (gpu_usage/100) * 0.5))
     
@@ -106,15 +133,19 @@ def get_fps():
         
     return fps
 
+# Streaming frame-time statistics, fed by every FPS sample CS2 logs while
+# monitor_loop runs
+frame_stats = FrameStats()
+
+# One collector per process; every consumer of a tick shares its snapshot
+collector = SnapshotCollector(get_gpu_snapshot, get_cpu_temp, get_fps, frame_stats)
+
 def is_cs2_running():
-    """Check if CS2 is currently running"""
-    for proc in psutil.process_iter(['name']):
-        if proc.info['name'] in ['cs2.exe', 'cs2']:
-            return True
-    return False
+    """Check if CS2 is currently running (cached by the shared process watcher)"""
+    return get_process_watcher().running
 
-def set_profile(profile_name):
-    """Set CS2 profile by copying the appropriate config file"""
+def set_profile(profile_name, snapshot=None):
+    """Write a profile into autoexec.cfg's managed section, only if convars change"""
     profile_file = PROFILES_DIR / f"{profile_name}.cfg"
     autoexec_file = CONFIG_DIR / "autoexec.cfg"
     
@@ -123,62 +154,31 @@ def set_profile(profile_name):
         return False
     
     try:
-        # Backup autoexec if doesn't exist already
-        backup_file = CONFIG_DIR / "autoexec.cfg.backup"
-        if not backup_file.exists() and autoexec_file.exists():
-            with open(autoexec_file, 'r') as src:
-                with open(backup_file, 'w') as dst:
-                    dst.write(src.read())
-            logging.info("Created backup of autoexec.cfg")
-        
-        # Copy profile to autoexec.cfg
-        with open(profile_file, 'r') as src:
-            profile_content = src.read()
-            
-        with open(autoexec_file, 'r') as current:
-            current_content = current.read()
-            
-        # Replace the profile section or append it
-        if "// PROFILE SETTINGS START" in current_content:
-            parts = current_content.split("// PROFILE SETTINGS START")
-            if len(parts) > 1:
-                second_parts = parts[1].split("// PROFILE SETTINGS END")
-                if len(second_parts) > 1:
-                    new_content = parts[0] + "// PROFILE SETTINGS START\n" + profile_content + "\n// PROFILE SETTINGS END" + second_parts[1]
-                    with open(autoexec_file, 'w') as f:
-                        f.write(new_content)
+        result = apply_profile(profile_file, autoexec_file, backup=CONFIG_DIR / "autoexec.cfg.backup")
+        commands = result.delta.commands()
+        if commands:
+            logging.debug(f"Profile {profile_name} console delta: {result.delta.batch()}")
+        if commands and netcon_client is not None:
+            live = netcon_client.send_batch(commands)
+            if live.ok:
+                ack = f"{live.ack_ms:.1f} ms" if live.ack_ms is not None else "no ack"
+                logging.info(f"Live-applied {live.sent} convars over netcon ({ack})")
             else:
-                with open(autoexec_file, 'a') as f:
-                    f.write("\n// PROFILE SETTINGS START\n" + profile_content + "\n// PROFILE SETTINGS END\n")
-        else:
-            with open(autoexec_file, 'a') as f:
-                f.write("\n// PROFILE SETTINGS START\n" + profile_content + "\n// PROFILE SETTINGS END\n")
+                logging.info(f"Live apply skipped, netcon unavailable: {live.error}")
         
         # Update OBS overlay
-        update_obs_overlay(profile_name)
-        
-        logging.info(f"Applied profile: {profile_name}")
+        update_obs_overlay(profile_name, snapshot)
         return True
     except Exception as e:
         logging.error(f"Failed to set profile {profile_name}: {e}")
         return False
 
-def update_obs_overlay(profile_name):
-    """Update OBS overlay JSON file with current metrics"""
+def update_obs_overlay(profile_name, snapshot=None):
+    """Update OBS overlay JSON file with the metrics of one snapshot"""
     try:
-        gpu_temp, gpu_usage = get_gpu_info()
-        cpu_temp = get_cpu_temp()
-        fps = get_fps()
-        
-        overlay_data = {
-            "profile": profile_name,
-            "fps": int(fps),
-            "gpu_temp": round(gpu_temp, 1),
-            "gpu_usage": round(gpu_usage, 1),
-            "cpu_temp": round(cpu_temp, 1),
-            "timestamp": time.strftime("%H:%M:%S"),
-            "date": time.strftime("%Y-%m-%d")
-        }
+        if snapshot is None:
+            snapshot = collector.collect()
+        overlay_data = snapshot.as_overlay(profile_name)
         
         # Create metrics file for internal use
         with open(METRICS_FILE, 'w') as f:
@@ -191,60 +191,73 @@ def update_obs_overlay(profile_name):
     except Exception as e:
         logging.error(f"Failed to update OBS overlay: {e}")
 
-def select_best_profile(gpu_temp, gpu_usage, fps):
-    """Select the best profile based on current metrics"""
-    if gpu_temp > DEFAULT_GPU_TEMP_HIGH or gpu_usage > DEFAULT_GPU_USAGE_HIGH:
-        return "gpu_saver"
-    elif fps < DEFAULT_FPS_LOW:
-        return "balanced"
-    else:
-        return "max_fps"
-
 def monitor_loop(args):
     """Main monitoring loop"""
     current_profile = None
-    profile_change_time = 0
-    min_change_interval = 30  # Minimum seconds between profile changes
+    rules = load_rules(PROFILES_DIR, PROFILES, default="max_fps")
+    controller = ProfileController(rules=rules)
+    recorder = None if args.no_history else TelemetryRecorder()
     
     logging.info(f"Starting CS2 auto-profile monitor with {args.interval}s polling interval")
+    logging.info(f"Profile rules by priority: {', '.join(rules.names)}")
+    if recorder:
+        logging.info(f"Recording telemetry history to {recorder.directory}")
     
-    while True:
-        try:
-            if not is_cs2_running():
-                if args.only_when_running:
-                    logging.info("CS2 not running, sleeping for 30 seconds")
-                    time.sleep(30)
-                    continue
-            
-            gpu_temp, gpu_usage = get_gpu_info()
-            fps = get_fps()
+    watcher = get_process_watcher() if args.only_when_running else None
+    if watcher and netcon_client is not None:
+        # A restarted game needs a fresh console connection
+        watcher.subscribe(lambda event, pid: netcon_client.close() if event == "stopped" else None)
+    
+    # Subscribing starts the console log tailer, so only do it when monitoring
+    get_fps_ingest().subscribe(frame_stats.add_sample)
+    try:
+        while True:
+            try:
+                if watcher and not watcher.running:
+                    logging.info("CS2 not running, waiting for it to start")
+                    while not watcher.wait_until_running(timeout=1.0):
+                        pass  # short waits keep Ctrl+C responsive
+                    logging.info(f"CS2 started (pid {watcher.pid}), resuming monitoring")
             
-            # Update metrics regardless of profile changes
-            update_obs_overlay(current_profile or "none")
+                # Read every sensor once; the overlay, metrics file and profile
+                # selection all see the same values for this tick
+                snapshot = collector.collect()
             
-            # Select best profile based on metrics
-            best_profile = select_best_profile(gpu_temp, gpu_usage, fps)
+                # Update metrics regardless of profile changes
+                update_obs_overlay(current_profile or "none", snapshot)
+                if recorder:
+                    recorder.record(snapshot)
             
-            # Only change profile if it's different and enough time has passed
-            now = time.time()
-            if (best_profile != current_profile and 
-                (now - profile_change_time) > min_change_interval):
+                # Rule-based selection on smoothed metrics; the controller
+                # enforces the dwell time between switches and escalates early
+                # on a rising temperature trend
+                best_profile = controller.update(snapshot)
+                if best_profile != current_profile:
+                    state = controller.state
+                    logging.info(f"Changing profile from {current_profile} to {best_profile} "
+                               f"({state.reason}; GPU: {snapshot.gpu_temp}°C, "
+                               f"Usage: {snapshot.gpu_usage}%, FPS: {int(snapshot.fps)})")
                 
-                logging.info(f"Changing profile from {current_profile} to {best_profile} "
-                           f"(GPU: {gpu_temp}°C, Usage: {gpu_usage}%, FPS: {int(fps)})")
-                
-                if set_profile(best_profile):
-                    current_profile = best_profile
-                    profile_change_time = now
+                    if set_profile(best_profile, snapshot):
+                        current_profile = best_profile
             
-            time.sleep(args.interval)
+                # Wake up early if the game exits, so monitoring pauses right away
+                if watcher:
+                    watcher.wait_until_stopped(timeout=args.interval)
+                else:
+                    time.sleep(args.interval)
             
-        except KeyboardInterrupt:
-            logging.info("Monitoring stopped by user")
-            break
-        except Exception as e:
-            logging.error(f"Error in monitor loop: {e}")
-            time.sleep(args.interval)
+            except KeyboardInterrupt:
+                logging.info("Monitoring stopped by user")
+                break
+            except Exception as e:
+                logging.error(f"Error in monitor loop: {e}")
+                time.sleep(args.interval)
+    finally:
+        get_fps_ingest().unsubscribe(frame_stats.add_sample)
+        # Seal the last segment however the loop ends
+        if recorder:
+            recorder.close()
 
 def main():
     parser = argparse.ArgumentParser(description="CS2 Auto Profile Switcher")
@@ -254,6 +267,10 @@ def main():
                        help="Set specific profile and exit")
     parser.add_argument("--only-when-running", action="store_true",
                        help="Only switch profiles when CS2 is running")
+    parser.add_argument("--no-history", action="store_true",
+                       help="Don't record telemetry history to disk")
+    parser.add_argument("--netcon-port", type=int,
+                       help="Also apply profile changes live through CS2's -netconport console")
     parser.add_argument("--debug", action="store_true",
                        help="Enable debug logging")
     
@@ -262,6 +279,10 @@ def main():
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    global netcon_client
+    if args.netcon_port:
+        netcon_client = NetconClient(port=args.netcon_port)
+    
     # Create directories if they don't exist
     PROFILES_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -0,0 +1,240 @@
+"""
+Live profile apply over the CS2 network console.
+
+CS2 started with `-netconport <port>` accepts console commands over a plain
+TCP connection and echoes console output back. NetconClient sends a batch
+of commands (normally ProfileDelta.commands()) in a single write, followed
+by an `echo` marker, and times how long the game takes to echo the marker
+back, so a profile switch takes effect mid-match without a restart:
+
+    client = NetconClient(port=2121)
+    result = client.send_batch(["fps_max 300", "r_shadows 0"])
+    result.ok, result.ack_ms
+
+StandInConsole is a small local TCP server that behaves like the game's
+console (it applies `name value` lines and answers echo), for tests and for
+trying the live path without the game: `python -m cs2tune.netcon --serve`.
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from cs2tune.cfg_parser import parse_cfg
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.environ.get("CS2_NETCON_PORT", 2121))
+CONNECT_TIMEOUT = 1.0
+ACK_TIMEOUT = 1.0
+ACK_PREFIX = "cs2tune_ack_"
+
+
+@dataclass
+class NetconResult:
+    sent: int                       # commands in the batch
+    ok: bool
+    write_ms: Optional[float] = None
+    ack_ms: Optional[float] = None  # None if the game did not echo the marker in time
+    error: str = ""
+
+
+class NetconClient:
+    """Persistent connection to a game's netcon port; reconnects once per batch on failure."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 timeout: float = CONNECT_TIMEOUT, ack_timeout: float = ACK_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.ack_timeout = ack_timeout
+        self.latencies = deque(maxlen=100)  # ack_ms of recent batches
+        self._sock: Optional[socket.socket] = None
+        self._buffer = b""
+        self._markers = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def connect(self):
+        if self._sock is None:
+            self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._buffer = b""
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _wait_for(self, marker: bytes, deadline: float) -> bool:
+        while marker not in self._buffer:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            self._sock.settimeout(remaining)
+            try:
+                chunk = self._sock.recv(4096)
+            except socket.timeout:
+                return False
+            if not chunk:
+                raise ConnectionError("console closed the connection")
+            # Console output before the marker is not needed; keep the tail so
+            # a marker split across two reads is still found
+            self._buffer = (self._buffer + chunk)[-4096:]
+        self._buffer = self._buffer.split(marker, 1)[1]
+        return True
+
+    def send_batch(self, commands: Sequence[str]) -> NetconResult:
+        """Send `commands` in one write and time the game's echo of a marker."""
+        commands = [c for c in commands if c.strip()]
+        if not commands:
+            return NetconResult(sent=0, ok=True)
+        with self._lock:
+            last_error = ""
+            for _ in range(2):  # the game may have restarted since the last batch
+                try:
+                    self.connect()
+                    marker = f"{ACK_PREFIX}{next(self._markers)}"
+                    payload = ("\n".join(commands + [f"echo {marker}"]) + "\n").encode("utf-8")
+                    started = time.perf_counter()
+                    self._sock.settimeout(self.timeout)
+                    self._sock.sendall(payload)
+                    written = time.perf_counter()
+                    acked = self._wait_for(marker.encode(), written + self.ack_timeout)
+                    result = NetconResult(sent=len(commands), ok=True,
+                                          write_ms=(written - started) * 1000)
+                    if acked:
+                        result.ack_ms = (time.perf_counter() - started) * 1000
+                        self.latencies.append(result.ack_ms)
+                    return result
+                except OSError as e:
+                    last_error = str(e)
+                    self._close()
+            return NetconResult(sent=len(commands), ok=False, error=last_error)
+
+
+# --- Local stand-in for the game console --------------------------------------
+
+class _ConsoleHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        with self.server.console.lock:
+            self.server.console.connections.add(self.connection)
+
+    def finish(self):
+        with self.server.console.lock:
+            self.server.console.connections.discard(self.connection)
+        super().finish()
+
+    def handle(self):
+        console = self.server.console
+        for raw in self.rfile:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            if console.delay:
+                time.sleep(console.delay)
+            with console.lock:
+                console.commands.append(line)
+                for convar in parse_cfg(line).convars.values():
+                    console.convars[convar.name] = convar.value
+            name, _, rest = line.partition(" ")
+            if name.lower() == "echo":
+                self.wfile.write((rest.strip('"') + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StandInConsole:
+    """A TCP server that accepts netcon commands like the game does.
+
+    `port=0` picks a free port; the chosen one is in `.port`.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = 0, delay: float = 0.0):
+        self.commands: List[str] = []
+        self.convars: Dict[str, str] = {}
+        self.delay = delay  # per-command processing time, to simulate a busy game
+        self.lock = threading.Lock()
+        self.connections = set()
+        self._server = _Server((host, port), _ConsoleHandler)
+        self._server.console = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = None
+
+    def start(self) -> "StandInConsole":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="netcon-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop listening and drop connected clients, like the game exiting."""
+        self._server.shutdown()
+        self._server.server_close()
+        with self.lock:
+            connections = list(self.connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CS2 netcon stand-in console / batch sender")
+    parser.add_argument("--serve", action="store_true", help="Run a local stand-in console")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("commands", nargs="*", help="Commands to send as one batch")
+    args = parser.parse_args()
+
+    if args.serve:
+        console = StandInConsole(args.host, args.port).start()
+        print(f"Stand-in console listening on {console.host}:{console.port}, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            console.stop()
+        return
+    with NetconClient(args.host, args.port) as client:
+        result = client.send_batch(args.commands)
+    if not result.ok:
+        logging.error(f"netcon send failed: {result.error}")
+        print(f"Failed: {result.error}")
+        return
+    ack = f"{result.ack_ms:.1f} ms" if result.ack_ms is not None else "no ack"
+    print(f"Sent {result.sent} command(s), write {result.write_ms:.2f} ms, ack {ack}")
+
+
+if __name__ == "__main__":
+    main()
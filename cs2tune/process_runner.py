@@ -0,0 +1,229 @@
+"""
+Streaming subprocess runner shared by the CLI pipelines, the Tk GUI and the
+Streamlit dashboards.
+
+Processes run on one background asyncio loop. Output is read line by line
+into a bounded scrollback, and the exit status is a
+concurrent.futures.Future, so no caller blocks on a pipe:
+
+    handle = start(["pro-drivers", "--list"])
+    handle.drain()      # lines produced since the last drain
+    handle.cancel()     # terminate, then kill after a grace period
+    handle.wait()       # exit status
+
+The adapters at the bottom connect a handle to each front end: stream_to_cli
+echoes lines as they arrive, TkStreamer polls from the Tk event loop with
+`after`, and stream_to_streamlit re-renders a placeholder at a fixed rate
+instead of once per line.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence
+
+DEFAULT_SCROLLBACK = 5000
+TERMINATE_GRACE = 5.0
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _event_loop():
+    """The shared runner loop, started on first use in a daemon thread."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="process-runner", daemon=True).start()
+        return _loop
+
+
+class ProcessHandle:
+    """A running (or finished) process and its captured output."""
+
+    def __init__(self, command: Sequence[str], scrollback: int = DEFAULT_SCROLLBACK,
+                 on_line: Optional[Callable[[str], None]] = None):
+        self.command = [str(part) for part in command]
+        self.lines = deque(maxlen=scrollback)   # most recent output, for redraws
+        self.future: Future = Future()          # resolves to the exit status
+        self.cancelled = False
+        self.dropped = 0                        # lines lost because nobody drained them
+        self._pending = deque(maxlen=scrollback)
+        self._lock = threading.Lock()
+        self._on_line = on_line
+        self._process = None
+
+    def _add(self, line: str):
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self.lines.append(line)
+            self._pending.append(line)
+        if self._on_line is not None:
+            self._on_line(line)
+
+    def drain(self) -> List[str]:
+        """Lines produced since the previous drain() call."""
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+        return lines
+
+    def text(self) -> str:
+        with self._lock:
+            return "\n".join(self.lines)
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    @property
+    def returncode(self) -> Optional[int]:
+        if not self.future.done() or self.future.exception() is not None:
+            return None
+        return self.future.result()
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Block until the process exits; raises OSError if it could not start."""
+        return self.future.result(timeout)
+
+    def cancel(self, grace: float = TERMINATE_GRACE):
+        """Terminate the process, killing it if it has not exited after `grace` seconds."""
+        self.cancelled = True
+        if self._process is not None and not self.done:
+            asyncio.run_coroutine_threadsafe(self._terminate(grace), _event_loop())
+
+    async def _terminate(self, grace: float):
+        process = self._process
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), grace)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            process.kill()
+
+    async def _run(self, cwd, env, merge_stderr):
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *self.command, cwd=cwd, env=env, stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            self.future.set_exception(e)
+            return
+        if self.cancelled:  # cancel() arrived before the process existed
+            self._process.terminate()
+        streams = [self._process.stdout] + ([] if merge_stderr else [self._process.stderr])
+        await asyncio.gather(*(self._read(stream) for stream in streams))
+        self.future.set_result(await self._process.wait())
+
+    async def _read(self, stream):
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            self._add(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+
+
+def start(command: Sequence[str], cwd=None, env=None, scrollback: int = DEFAULT_SCROLLBACK,
+          on_line: Optional[Callable[[str], None]] = None, merge_stderr: bool = True) -> ProcessHandle:
+    """Start `command` (an argument list, no shell) and return its handle immediately.
+
+    `on_line` is called on the runner thread for every line; front ends that
+    need their own thread should poll drain() instead.
+    """
+    handle = ProcessHandle(command, scrollback, on_line)
+    env = None if env is None else {**os.environ, **env}
+    asyncio.run_coroutine_threadsafe(handle._run(cwd, env, merge_stderr), _event_loop())
+    return handle
+
+
+# --- Front-end adapters ------------------------------------------------------
+
+def stream_to_cli(handle: ProcessHandle, write: Callable[[str], None] = None,
+                  interval: float = 0.05) -> int:
+    """Echo a process's output as it arrives and return its exit status.
+
+    Ctrl+C cancels the process instead of leaving it running.
+    """
+    write = write or (lambda line: print(line, flush=True))
+    try:
+        while not handle.done:
+            for line in handle.drain():
+                write(line)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        handle.cancel()
+        handle.future.exception()  # wait for it to go away
+        raise
+    for line in handle.drain():
+        write(line)
+    return handle.wait()
+
+
+def run(command: Sequence[str], write: Callable[[str], None] = None, **kwargs) -> int:
+    """CLI convenience: start, stream and wait."""
+    return stream_to_cli(start(command, **kwargs), write)
+
+
+class TkStreamer:
+    """Appends a handle's output to a Tk text widget from the Tk event loop.
+
+    Lines are fetched every `interval_ms` with widget.after, so the window
+    keeps responding while the process runs. `on_done(returncode)` is called
+    once on the Tk thread; returncode is None if the process failed to start.
+    """
+
+    def __init__(self, widget, handle: ProcessHandle, interval_ms: int = 50,
+                 on_done: Optional[Callable[[Optional[int]], None]] = None, max_lines: int = DEFAULT_SCROLLBACK):
+        self.widget = widget
+        self.handle = handle
+        self.interval_ms = interval_ms
+        self.on_done = on_done
+        self.max_lines = max_lines
+        widget.after(interval_ms, self._poll)
+
+    def _poll(self):
+        finished = self.handle.done
+        lines = self.handle.drain()
+        if lines:
+            self.widget.insert("end", "\n".join(lines) + "\n")
+            excess = int(self.widget.index("end-1c").split(".")[0]) - self.max_lines
+            if excess > 0:
+                self.widget.delete("1.0", f"{excess + 1}.0")
+            self.widget.see("end")
+        if not finished:
+            self.widget.after(self.interval_ms, self._poll)
+            return
+        error = self.handle.future.exception()
+        if error is not None:
+            self.widget.insert("end", f"Failed to start {self.handle.command[0]}: {error}\n")
+        if self.on_done is not None:
+            self.on_done(self.handle.returncode)
+
+
+def stream_to_streamlit(handle: ProcessHandle, placeholder, refresh: float = 0.25,
+                        language: str = "bash") -> Optional[int]:
+    """Render a handle's scrollback into a Streamlit placeholder, batched.
+
+    The placeholder is redrawn at most every `refresh` seconds with the
+    bounded scrollback, rather than once per line with the full output.
+    Returns the exit status, or None if the process failed to start.
+    """
+    while not handle.done:
+        time.sleep(refresh)
+        if handle.drain():
+            placeholder.code(handle.text(), language=language)
+    handle.drain()
+    error = handle.future.exception()
+    if error is not None:
+        placeholder.error(f"Failed to start {handle.command[0]}: {error}")
+        return None
+    placeholder.code(handle.text(), language=language)
+    return handle.returncode
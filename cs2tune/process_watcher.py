@@ -0,0 +1,210 @@
+"""
+CS2 process detection without walking the process table every tick.
+
+A ProcessWatcher thread scans for the game at a low rate. Once found, it
+keeps only that PID and blocks until the process exits:
+
+- on Linux through a pidfd (os.pidfd_open), which becomes readable at exit
+- elsewhere through psutil's Process.wait, which is a kernel wait on Windows
+
+The watcher then goes back to scanning. On Windows with the `wmi` package
+installed, the scan waits on a WMI process-creation event for cs2.exe
+instead of sleeping, so the start is seen within a couple of seconds.
+(procfs does not emit inotify events, so Linux relies on the low-rate scan
+for starts.)
+
+Callers read `running` (no system calls), block on wait_until_running() /
+wait_until_stopped(), or subscribe(callback) to receive
+("started" | "stopped", pid) events on the watcher thread.
+"""
+
+import logging
+import os
+import select
+import sys
+import threading
+from typing import Callable, Iterable, List, Optional
+
+import psutil
+
+CS2_PROCESS_NAMES = ("cs2.exe", "cs2")
+RESCAN_INTERVAL = 5.0    # seconds between scans while the game is not running
+WAIT_SLICE = 1.0         # longest blocking wait, so stop() returns promptly
+
+
+class ProcessWatcher:
+    """Tracks one named process and reports when it starts and stops."""
+
+    def __init__(self, names: Iterable[str] = CS2_PROCESS_NAMES, rescan_interval: float = RESCAN_INTERVAL,
+                 match: Optional[Callable[[dict], bool]] = None, use_wmi: bool = True):
+        self.names = {name.lower() for name in names}
+        self.rescan_interval = rescan_interval
+        self._match = match or (lambda info: (info.get("name") or "").lower() in self.names)
+        self._use_wmi = use_wmi and sys.platform == "win32"
+        self._process: Optional[psutil.Process] = None
+        self._lock = threading.Lock()
+        self._started = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self._stop = threading.Event()
+        self._listeners: List[Callable[[str, int], None]] = []
+        self._thread = None
+        self.scans = 0  # full process-table scans so far
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "ProcessWatcher":
+        """Scan once synchronously, so `running` is accurate on return, then watch."""
+        if self.alive:
+            return self
+        self._stop.clear()
+        # A watcher restarted after stop() may hold a process that has exited
+        # since; forget it so the scan below decides `running` from scratch
+        with self._lock:
+            self._process = None
+        self._started.clear()
+        self._stopped.set()
+        self._scan()
+        self._thread = threading.Thread(target=self._run, name="process-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=WAIT_SLICE + self.rescan_interval + 1)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        if not self.alive:
+            self.start()
+        return self._started.is_set()
+
+    @property
+    def pid(self) -> Optional[int]:
+        with self._lock:
+            return self._process.pid if self._process is not None else None
+
+    def subscribe(self, callback: Callable[[str, int], None]):
+        """Call `callback(event, pid)` on the watcher thread for every start/stop."""
+        self._listeners.append(callback)
+
+    def wait_until_running(self, timeout: Optional[float] = None) -> bool:
+        if not self.alive:
+            self.start()
+        return self._started.wait(timeout)
+
+    def wait_until_stopped(self, timeout: Optional[float] = None) -> bool:
+        if not self.alive:
+            self.start()
+        return self._stopped.wait(timeout)
+
+    def _emit(self, event: str, pid: int):
+        logging.info(f"Process {event}: pid {pid}")
+        for callback in list(self._listeners):
+            try:
+                callback(event, pid)
+            except Exception as e:
+                logging.error(f"Process watcher callback failed: {e}")
+
+    def _scan(self) -> bool:
+        self.scans += 1
+        for proc in psutil.process_iter(["pid", "name"]):
+            try:
+                if self._match(proc.info):
+                    with self._lock:
+                        self._process = proc
+                    self._stopped.clear()
+                    self._started.set()
+                    self._emit("started", proc.pid)
+                    return True
+            except psutil.Error:
+                continue
+        return False
+
+    def _wait_exit(self, process: psutil.Process) -> bool:
+        """Block until `process` exits (True) or self.stop() is called (False)."""
+        pidfd = None
+        if hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(process.pid)
+            except OSError:
+                pidfd = None
+        try:
+            # The pidfd was opened after the game was found; make sure the PID
+            # was not reused in between
+            if not process.is_running():
+                return True
+            while not self._stop.is_set():
+                if pidfd is not None:
+                    readable, _, _ = select.select([pidfd], [], [], WAIT_SLICE)
+                    if readable:
+                        return True
+                else:
+                    try:
+                        process.wait(WAIT_SLICE)
+                        return True
+                    except psutil.TimeoutExpired:
+                        pass
+                    except psutil.NoSuchProcess:
+                        return True
+            return False
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
+    def _wait_for_start(self, wmi_watch):
+        """Sleep until the next scan, or until WMI reports a matching process."""
+        if wmi_watch is None:
+            self._stop.wait(self.rescan_interval)
+            return
+        try:
+            wmi_watch(timeout_ms=int(self.rescan_interval * 1000))
+        except Exception:  # wmi.x_wmi_timed_out, or WMI going away
+            pass
+
+    def _run(self):
+        wmi_watch = self._open_wmi() if self._use_wmi else None
+        while not self._stop.is_set():
+            with self._lock:
+                process = self._process
+            if process is None:
+                self._wait_for_start(wmi_watch)
+                if not self._stop.is_set():
+                    self._scan()
+                continue
+            if not self._wait_exit(process):
+                return
+            with self._lock:
+                self._process = None
+            self._started.clear()
+            self._stopped.set()
+            self._emit("stopped", process.pid)
+
+    def _open_wmi(self):
+        try:
+            import pythoncom
+            import wmi
+            pythoncom.CoInitialize()
+            connection = wmi.WMI()
+            name = next((n for n in sorted(self.names) if n.endswith(".exe")), min(self.names))
+            return connection.Win32_Process.watch_for("creation", Name=name)
+        except Exception as e:  # package missing or WMI unavailable
+            logging.debug(f"WMI process events unavailable, scanning every {self.rescan_interval}s: {e}")
+            return None
+
+
+_shared_watcher = None
+_shared_lock = threading.Lock()
+
+
+def get_process_watcher() -> ProcessWatcher:
+    """Return the process-wide CS2 watcher, started on first use."""
+    global _shared_watcher
+    with _shared_lock:
+        if _shared_watcher is None:
+            _shared_watcher = ProcessWatcher()
+        return _shared_watcher.start()
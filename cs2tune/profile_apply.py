@@ -0,0 +1,157 @@
+"""
+Atomic, incremental profile application for autoexec.cfg.
+
+A profile is written into a managed section of autoexec.cfg, between
+SECTION_START and SECTION_END, leaving the user's own lines alone:
+
+    result = apply_profile(PROFILES_DIR / "balanced.cfg", CONFIG_DIR / "autoexec.cfg")
+    result.written          # False when autoexec already had this profile
+    result.delta.batch()    # 'fps_max 300; r_shadows 1' - only what changed
+
+The convar diff is taken between the effective values of the old and new
+autoexec (cfg_parser), so the console batch holds just the convars that
+differ and can be sent to a running game instead of re-exec'ing the whole
+file. The file itself is replaced with a temp file + fsync + rename, so the
+game never reads a half-written config.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cs2tune.cfg_parser import CfgFile, parse_cfg
+
+SECTION_START = "// PROFILE SETTINGS START"
+SECTION_END = "// PROFILE SETTINGS END"
+
+_write_lock = threading.Lock()
+
+
+@dataclass
+class ProfileDelta:
+    """Convar-level difference between two configs, keyed by lower-case name."""
+    changed: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # name -> (old, new)
+    added: Dict[str, str] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)                  # can't be unset from the console
+    names: Dict[str, str] = field(default_factory=dict)               # key -> name as written
+
+    @property
+    def empty(self) -> bool:
+        return not (self.changed or self.added or self.removed)
+
+    def commands(self) -> List[str]:
+        """Console commands that take a running game from the old to the new values."""
+        updates = [(key, new) for key, (_, new) in self.changed.items()] + list(self.added.items())
+        return [f"{self.names.get(key, key)} {_quote(value)}" for key, value in updates]
+
+    def batch(self) -> str:
+        return "; ".join(self.commands())
+
+    def summary(self) -> str:
+        if self.empty:
+            return "no convar changes"
+        parts = [f"{len(self.changed)} changed", f"{len(self.added)} added"]
+        if self.removed:
+            parts.append(f"{len(self.removed)} removed")
+        return ", ".join(parts)
+
+
+@dataclass
+class ApplyResult:
+    profile: str
+    path: Path
+    written: bool
+    delta: ProfileDelta
+    backup: Optional[Path] = None
+
+
+def _quote(value: str) -> str:
+    if value and not any(ch in value for ch in ' \t;"/'):
+        return value
+    return '"' + value.replace('"', "'") + '"'
+
+
+def diff_convars(current: CfgFile, target: CfgFile) -> ProfileDelta:
+    delta = ProfileDelta()
+    for key, convar in target.convars.items():
+        delta.names[key] = convar.name
+        old = current.convars.get(key)
+        if old is None:
+            delta.added[key] = convar.value
+        elif old.value != convar.value:
+            delta.changed[key] = (old.value, convar.value)
+    delta.removed = [c.name for key, c in current.convars.items() if key not in target.convars]
+    return delta
+
+
+def replace_section(text: str, profile_text: str) -> str:
+    """autoexec text with its managed section set to `profile_text`.
+
+    A start marker without an end marker (an interrupted edit) owns the rest
+    of the file; no start marker appends a new section.
+    """
+    lines = text.splitlines(keepends=True)
+    stripped = [line.strip() for line in lines]
+    section = SECTION_START + "\n" + profile_text.rstrip("\n") + "\n" + SECTION_END + "\n"
+    if SECTION_START not in stripped:
+        prefix = text if not text or text.endswith("\n") else text + "\n"
+        return prefix + ("\n" if prefix else "") + section
+    start = stripped.index(SECTION_START)
+    try:
+        end = stripped.index(SECTION_END, start + 1) + 1
+    except ValueError:
+        end = len(lines)
+    return "".join(lines[:start]) + section + "".join(lines[end:])
+
+
+def atomic_write(path: Path, text: str):
+    """Replace `path` with `text` via a temp file in the same folder and a rename."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def apply_profile(profile_path, autoexec_path, backup: Optional[Path] = None) -> ApplyResult:
+    """Write `profile_path` into autoexec's managed section if anything changes.
+
+    `backup`, if given and not already present, receives the old autoexec
+    before the first write. Raises OSError if the profile can't be read or
+    autoexec can't be written.
+    """
+    profile_path, autoexec_path = Path(profile_path), Path(autoexec_path)
+    profile_text = profile_path.read_text(encoding="utf-8", errors="replace")
+    with _write_lock:
+        try:
+            with open(autoexec_path, encoding="utf-8", errors="replace", newline="") as f:
+                current_text = f.read()
+        except FileNotFoundError:
+            current_text = ""
+        new_text = replace_section(current_text, profile_text)
+        delta = diff_convars(parse_cfg(current_text, str(autoexec_path)),
+                             parse_cfg(new_text, str(autoexec_path)))
+        result = ApplyResult(profile_path.stem, autoexec_path, written=False, delta=delta)
+        if new_text == current_text:
+            return result
+        autoexec_path.parent.mkdir(parents=True, exist_ok=True)
+        if backup is not None and current_text and not Path(backup).exists():
+            atomic_write(Path(backup), current_text)
+            result.backup = Path(backup)
+            logging.info(f"Created backup of {autoexec_path.name}: {backup}")
+        atomic_write(autoexec_path, new_text)
+        result.written = True
+    logging.info(f"Applied profile {result.profile} to {autoexec_path}: {delta.summary()}")
+    return result
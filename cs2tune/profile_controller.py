@@ -0,0 +1,297 @@
+"""
+Profile switching controller with smoothing, hysteresis and a temperature
+trend predictor.
+
+Every tick's TelemetrySnapshot goes through time-based EWMAs, so one noisy
+reading can't flip the profile. Each condition has separate enter and exit
+thresholds, so a value hovering around a threshold doesn't cause flapping.
+A least-squares slope over the recent smoothed GPU temperature extrapolates
+`horizon` seconds ahead, so gpu_saver is entered while the GPU is still
+heating, before it reaches the throttle point.
+
+Which profile fits the smoothed metrics is decided by a profile_rules
+RuleSet. By default it is built from ControllerConfig; the monitor passes
+the PROFILES and cs2tune/profiles rules instead. Each rule's `hold`
+conditions are its exit thresholds. A switch to a higher-priority profile
+happens immediately; a switch down waits out `min_dwell`.
+
+The simulation harness replays a recorded trace (TelemetryHistory columns)
+through any policy and scores switch count against time over the
+temperature limit. A first-order thermal model shifts the recorded
+temperature by each profile's effect, so a policy that backs off early
+actually runs cooler in the replay:
+
+    python -m cs2tune.profile_controller --session 20250101_120000
+"""
+
+import argparse
+import math
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterable, List, Optional
+
+from cs2tune.profile_rules import RuleSet, metrics_from_snapshot
+from cs2tune.telemetry_snapshot import TelemetrySnapshot
+
+MAX_FPS, BALANCED, GPU_SAVER = "max_fps", "balanced", "gpu_saver"
+
+
+@dataclass(frozen=True)
+class ControllerConfig:
+    gpu_temp_enter: float = 85.0     # (predicted) °C to switch to gpu_saver
+    gpu_temp_exit: float = 80.0      # °C to leave it again
+    gpu_usage_enter: float = 95.0
+    gpu_usage_exit: float = 90.0
+    fps_low_enter: float = 180.0     # smoothed FPS below this -> balanced
+    fps_low_exit: float = 200.0
+    smoothing: float = 10.0          # EWMA time constant, seconds
+    trend_window: float = 30.0       # seconds of history for the slope
+    horizon: float = 20.0            # seconds to look ahead
+    min_dwell: float = 30.0          # seconds between non-urgent switches
+
+
+class Ewma:
+    """Exponentially weighted moving average over irregular sample times."""
+
+    def __init__(self, time_constant: float):
+        self.time_constant = time_constant
+        self.value: Optional[float] = None
+        self._last_t: Optional[float] = None
+
+    def update(self, value: float, t: float) -> float:
+        if self.value is None or self.time_constant <= 0:
+            self.value = value
+        else:
+            dt = max(0.0, t - self._last_t)
+            alpha = 1.0 - math.exp(-dt / self.time_constant)
+            self.value += alpha * (value - self.value)
+        self._last_t = t
+        return self.value
+
+
+class TrendPredictor:
+    """Linear extrapolation from a least-squares fit over a sliding time window."""
+
+    def __init__(self, window: float):
+        self.window = window
+        self._points = deque()
+
+    def update(self, value: float, t: float):
+        self._points.append((t, value))
+        while self._points and t - self._points[0][0] > self.window:
+            self._points.popleft()
+
+    def slope(self) -> float:
+        """Units per second; 0 until the window holds a usable span of samples."""
+        n = len(self._points)
+        if n < 3 or self._points[-1][0] - self._points[0][0] < self.window / 4:
+            return 0.0
+        mean_t = sum(t for t, _ in self._points) / n
+        mean_v = sum(v for _, v in self._points) / n
+        var = sum((t - mean_t) ** 2 for t, _ in self._points)
+        if var == 0:
+            return 0.0
+        return sum((t - mean_t) * (v - mean_v) for t, v in self._points) / var
+
+    def predict(self, current: float, horizon: float) -> float:
+        return current + self.slope() * horizon
+
+
+@dataclass
+class ControllerState:
+    gpu_temp: float = 0.0
+    gpu_usage: float = 0.0
+    fps: float = 0.0
+    temp_slope: float = 0.0          # °C/s
+    predicted_temp: float = 0.0
+    reason: str = ""
+
+
+def default_definitions(config: ControllerConfig = ControllerConfig()) -> Dict[str, dict]:
+    """PROFILES-style rules equivalent to the config's thresholds."""
+    c = config
+    return {
+        GPU_SAVER: {
+            "priority": 100, "match": "any",
+            "conditions": {"gpu_temp_forecast": f">= {c.gpu_temp_enter:g}", "gpu_usage": f">= {c.gpu_usage_enter:g}"},
+            "hold": {"gpu_temp_forecast": f">= {c.gpu_temp_exit:g}", "gpu_usage": f">= {c.gpu_usage_exit:g}"},
+        },
+        BALANCED: {
+            "priority": 50,
+            "conditions": {"fps": f"< {c.fps_low_enter:g}"},
+            "hold": {"fps": f"< {c.fps_low_exit:g}"},
+        },
+        MAX_FPS: {"priority": 0},
+    }
+
+
+class ProfileController:
+    """Chooses a profile from a stream of snapshots using smoothed metrics and rules."""
+
+    def __init__(self, config: ControllerConfig = ControllerConfig(), initial: Optional[str] = None,
+                 rules: Optional[RuleSet] = None):
+        self.config = config
+        self.rules = rules or RuleSet.from_definitions(default_definitions(config), default=MAX_FPS)
+        self.profile = initial
+        self.state = ControllerState()
+        self.switched_at: Optional[float] = None
+        self._temp = Ewma(config.smoothing)
+        self._usage = Ewma(config.smoothing)
+        self._fps = Ewma(config.smoothing)
+        self._trend = TrendPredictor(config.trend_window)
+
+    def _priority(self, name: Optional[str]) -> float:
+        return self.rules[name].priority if name in self.rules else -math.inf
+
+    def update(self, snapshot: TelemetrySnapshot) -> str:
+        """Feed one tick; returns the profile that should be active now."""
+        t = snapshot.timestamp
+        s = self.state
+        s.gpu_temp = self._temp.update(snapshot.gpu_temp, t)
+        s.gpu_usage = self._usage.update(snapshot.gpu_usage, t)
+        s.fps = self._fps.update(snapshot.fps, t) if snapshot.fps > 0 else 0.0
+        self._trend.update(s.gpu_temp, t)
+        s.temp_slope = self._trend.slope()
+        s.predicted_temp = s.gpu_temp + s.temp_slope * self.config.horizon
+
+        # Rules see the smoothed values. Only a rising trend moves the
+        # forecast above the reading, so cooling never releases gpu_saver early.
+        # An FPS of 0 means no FPS source yet, not low FPS.
+        values = metrics_from_snapshot(
+            snapshot, gpu_temp=s.gpu_temp, gpu_usage=s.gpu_usage, fps=s.fps or None,
+            gpu_temp_forecast=max(s.gpu_temp, s.predicted_temp), gpu_temp_slope=s.temp_slope,
+        )
+        target = self.rules.select(values, current=self.profile)
+        s.reason = (f"{target} rule: GPU {s.gpu_temp:.1f}°C (forecast {s.predicted_temp:.1f}°C in "
+                    f"{self.config.horizon:.0f}s), usage {s.gpu_usage:.0f}%, FPS {s.fps:.0f}")
+        if target is None or target == self.profile:
+            return self.profile
+        urgent = self.profile is None or self._priority(target) > self._priority(self.profile)
+        if urgent or self.switched_at is None or t - self.switched_at >= self.config.min_dwell:
+            self.profile = target
+            self.switched_at = t
+        return self.profile
+
+
+class ThresholdPolicy:
+    """The previous instantaneous-threshold selection with a fixed cooldown, for comparison."""
+
+    def __init__(self, temp_high: float = 85.0, usage_high: float = 95.0,
+                 fps_low: float = 180.0, cooldown: float = 30.0):
+        self.temp_high, self.usage_high, self.fps_low, self.cooldown = temp_high, usage_high, fps_low, cooldown
+        self.profile: Optional[str] = None
+        self._changed = -math.inf
+
+    def update(self, snapshot: TelemetrySnapshot) -> str:
+        if snapshot.gpu_temp > self.temp_high or snapshot.gpu_usage > self.usage_high:
+            best = GPU_SAVER
+        elif snapshot.fps < self.fps_low:
+            best = BALANCED
+        else:
+            best = MAX_FPS
+        if best != self.profile and snapshot.timestamp - self._changed > self.cooldown:
+            self.profile = best
+            self._changed = snapshot.timestamp
+        return self.profile
+
+
+# --- Trace replay ------------------------------------------------------------
+
+# Steady-state GPU temperature change of each profile relative to the one the
+# trace was recorded with, and how fast the GPU settles after a switch
+PROFILE_TEMP_OFFSET = {MAX_FPS: 0.0, BALANCED: -3.0, GPU_SAVER: -8.0}
+THERMAL_TIME_CONSTANT = 25.0
+
+
+@dataclass
+class SimulationScore:
+    switches: int = 0
+    duration_s: float = 0.0
+    over_limit_s: float = 0.0
+    peak_temp: float = 0.0
+    profile_time: Dict[str, float] = field(default_factory=dict)
+    timeline: List[tuple] = field(default_factory=list)   # (timestamp, profile) at each switch
+
+    def format(self, label: str) -> str:
+        shares = ", ".join(f"{name} {100 * t / self.duration_s:.0f}%"
+                           for name, t in sorted(self.profile_time.items())) if self.duration_s else "-"
+        return (f"{label:<12} switches {self.switches:>3}  over limit {self.over_limit_s:>6.0f}s  "
+                f"peak {self.peak_temp:5.1f}°C  [{shares}]")
+
+
+def trace_from_columns(columns: Dict[str, Iterable[float]]) -> List[TelemetrySnapshot]:
+    """Snapshots from TelemetryHistory.slice() output (or any dict of equal-length columns)."""
+    names = ("timestamp", "fps", "gpu_temp", "gpu_usage", "cpu_temp", "vram_used", "fps_p1_low")
+    present = {name: list(columns[name]) for name in names if name in columns}
+    rows = len(present.get("timestamp", []))
+    return [TelemetrySnapshot(**{name: float(values[i]) for name, values in present.items()})
+            for i in range(rows)]
+
+
+def simulate(trace: Iterable[TelemetrySnapshot], policy, temp_limit: float = 85.0,
+             recorded_profile: str = MAX_FPS) -> SimulationScore:
+    """Replay `trace` through `policy` (anything with update(snapshot) -> profile)."""
+    score = SimulationScore()
+    offset = 0.0
+    baseline = PROFILE_TEMP_OFFSET.get(recorded_profile, 0.0)
+    profile, last_t = None, None
+    for snapshot in trace:
+        t = snapshot.timestamp
+        dt = 0.0 if last_t is None else max(0.0, t - last_t)
+        if profile is not None:
+            target = PROFILE_TEMP_OFFSET.get(profile, 0.0) - baseline
+            offset += (target - offset) * (1.0 - math.exp(-dt / THERMAL_TIME_CONSTANT))
+            score.profile_time[profile] = score.profile_time.get(profile, 0.0) + dt
+        simulated = replace(snapshot, gpu_temp=snapshot.gpu_temp + offset)
+        if last_t is not None and simulated.gpu_temp > temp_limit:
+            score.over_limit_s += dt
+        score.peak_temp = max(score.peak_temp, simulated.gpu_temp)
+        score.duration_s += dt
+
+        chosen = policy.update(simulated)
+        if chosen != profile:
+            if profile is not None:
+                score.switches += 1
+            score.timeline.append((t, chosen))
+            profile = chosen
+        last_t = t
+    return score
+
+
+def compare(trace: List[TelemetrySnapshot], policies: Dict[str, Callable[[], object]],
+            temp_limit: float = 85.0) -> Dict[str, SimulationScore]:
+    """Score a fresh instance of each policy on the same trace."""
+    return {name: simulate(trace, factory(), temp_limit) for name, factory in policies.items()}
+
+
+def main():
+    from cs2tune.telemetry_recorder import HISTORY_DIR, TelemetryHistory, list_sessions
+
+    parser = argparse.ArgumentParser(description="Replay a telemetry session through the profile policies")
+    parser.add_argument("--session", help="Recorded session to replay (default: newest)")
+    parser.add_argument("--history-dir", default=HISTORY_DIR)
+    parser.add_argument("--temp-limit", type=float, default=85.0)
+    parser.add_argument("--horizon", type=float, default=ControllerConfig.horizon)
+    args = parser.parse_args()
+
+    session = args.session
+    if session is None:
+        sessions = list_sessions(args.history_dir)
+        if not sessions:
+            print(f"No recorded sessions in {args.history_dir}")
+            return
+        session = sessions[0]
+    trace = trace_from_columns(TelemetryHistory(session, args.history_dir).slice())
+    print(f"Session {session}: {len(trace)} samples")
+    config = ControllerConfig(gpu_temp_enter=args.temp_limit, gpu_temp_exit=args.temp_limit - 5,
+                              horizon=args.horizon)
+    scores = compare(trace, {
+        "threshold": ThresholdPolicy,
+        "controller": lambda: ProfileController(config),
+    }, args.temp_limit)
+    for name, score in scores.items():
+        print(score.format(name))
+
+
+if __name__ == "__main__":
+    main()
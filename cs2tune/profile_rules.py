@@ -0,0 +1,243 @@
+"""
+Declarative profile rules.
+
+A rule says when a profile should be active, in the format of
+hardware_monitor.PROFILES:
+
+    "gpu_saver": {
+        "priority": 100,
+        "match": "any",                                  # default "all"
+        "conditions": {"gpu_temp_forecast": ">= 85", "gpu_usage": ">= 95"},
+        "hold": {"gpu_temp_forecast": ">= 80"},          # stay active while this holds
+    }
+
+Condition strings ("< 80", ">= 85 and < 95", "!= 0", "> 6GB") are compiled
+once into predicate closures. A RuleSet is evaluated in one pass over rules
+sorted by priority: the first match wins. The active profile is tested
+against its `hold` conditions instead of its entry conditions, which gives
+hysteresis. A rule without conditions always matches and works as the
+fallback.
+
+Metrics are whatever the evaluation dict holds. metrics_from_snapshot()
+provides every TelemetrySnapshot field plus frame_time_p1_ms. Names like
+vram, p1_low or cpu are aliases for those fields. A condition on a metric
+that is missing or None is false.
+
+Profiles in cs2tune/profiles can carry their own rules as comment
+directives, which the game ignores:
+
+    // @priority 100
+    // @match any
+    // @when gpu_temp_forecast >= 85
+    // @hold gpu_temp_forecast >= 80
+"""
+
+import operator
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+Metrics = Mapping[str, Optional[float]]
+Predicate = Callable[[Metrics], bool]
+
+OPERATORS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "==": operator.eq, "=": operator.eq, "!=": operator.ne,
+}
+ALIASES = {
+    "vram": "vram_used", "vram_gb": "vram_used",
+    "temp": "gpu_temp", "gpu": "gpu_temp", "cpu": "cpu_temp",
+    "usage": "gpu_usage", "load": "gpu_usage",
+    "p1": "fps_p1_low", "p1_low": "fps_p1_low", "fps_p1": "fps_p1_low",
+    "frame_time_p1": "frame_time_p1_ms", "frametime_p1": "frame_time_p1_ms",
+}
+_CLAUSE = re.compile(r"^\s*(<=|>=|==|!=|<|>|=)\s*(-?\d+(?:\.\d+)?)\s*(?:%|°?c|gb|mb|ms|fps)?\s*$", re.I)
+_DIRECTIVE = re.compile(r"^\s*//\s*@(\w+)\s*(.*?)\s*$")
+
+
+class RuleError(ValueError):
+    """A condition string or profile directive that can't be compiled."""
+
+
+def canonical_metric(name: str) -> str:
+    name = name.strip().lower()
+    return ALIASES.get(name, name)
+
+
+def compile_condition(metric: str, expression: str) -> Predicate:
+    """"< 80" or "> 60 and < 80" on `metric` -> predicate over a metrics dict."""
+    metric = canonical_metric(metric)
+    clauses: List[Tuple[Callable, float]] = []
+    for part in re.split(r"\s+and\s+|,", expression.strip(), flags=re.I):
+        match = _CLAUSE.match(part)
+        if not match:
+            raise RuleError(f"Can't parse condition {metric!r}: {expression!r}")
+        clauses.append((OPERATORS[match.group(1)], float(match.group(2))))
+
+    if len(clauses) == 1:
+        (op, threshold), = clauses
+
+        def predicate(values: Metrics) -> bool:
+            value = values.get(metric)
+            return value is not None and op(value, threshold)
+    else:
+        def predicate(values: Metrics) -> bool:
+            value = values.get(metric)
+            return value is not None and all(op(value, threshold) for op, threshold in clauses)
+    predicate.__name__ = f"{metric} {expression.strip()}"
+    return predicate
+
+
+def _combine(predicates: List[Predicate], match: str) -> Predicate:
+    if not predicates:
+        return lambda values: True
+    if len(predicates) == 1:
+        return predicates[0]
+    if match == "any":
+        return lambda values: any(p(values) for p in predicates)
+    return lambda values: all(p(values) for p in predicates)
+
+
+@dataclass
+class Rule:
+    name: str
+    priority: int = 0
+    conditions: Dict[str, str] = field(default_factory=dict)
+    hold: Dict[str, str] = field(default_factory=dict)
+    match: str = "all"
+    description: str = ""
+    source: str = ""
+
+    def __post_init__(self):
+        if self.match not in ("all", "any"):
+            raise RuleError(f"Rule {self.name}: match must be 'all' or 'any', not {self.match!r}")
+        self.enter = _combine([compile_condition(m, e) for m, e in self.conditions.items()], self.match)
+        self.stay = _combine([compile_condition(m, e) for m, e in self.hold.items()], self.match) \
+            if self.hold else self.enter
+
+    @property
+    def metrics(self) -> List[str]:
+        return sorted({canonical_metric(m) for m in list(self.conditions) + list(self.hold)})
+
+
+class RuleSet:
+    """Rules ordered by priority (highest first), evaluated in one pass."""
+
+    def __init__(self, rules: Iterable[Rule], default: Optional[str] = None):
+        self.rules = sorted(rules, key=lambda r: -r.priority)
+        self.default = default
+        self._by_name = {rule.name: rule for rule in self.rules}
+        # (name, entry predicate, hold predicate) so select() touches no attributes
+        self._compiled = [(rule.name, rule.enter, rule.stay) for rule in self.rules]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __getitem__(self, name: str) -> Rule:
+        return self._by_name[name]
+
+    @property
+    def names(self) -> List[str]:
+        return [rule.name for rule in self.rules]
+
+    def select(self, values: Metrics, current: Optional[str] = None) -> Optional[str]:
+        """Highest-priority profile whose rule matches `values`, else the default."""
+        for name, enter, stay in self._compiled:
+            if (stay if name == current else enter)(values):
+                return name
+        return self.default
+
+    def matching(self, values: Metrics) -> List[str]:
+        """Every profile whose entry conditions match, by priority; for diagnostics."""
+        return [name for name, enter, _ in self._compiled if enter(values)]
+
+    @classmethod
+    def from_definitions(cls, definitions: Mapping[str, dict], default: Optional[str] = None) -> "RuleSet":
+        """Build from a PROFILES-style {name: {"conditions": ..., ...}} mapping."""
+        return cls((rule_from_definition(name, d) for name, d in definitions.items()), default)
+
+
+def rule_from_definition(name: str, definition: dict, source: str = "") -> Rule:
+    return Rule(
+        name=name,
+        priority=int(definition.get("priority", 0)),
+        conditions=dict(definition.get("conditions", {})),
+        hold=dict(definition.get("hold", {})),
+        match=definition.get("match", "all"),
+        description=definition.get("description", ""),
+        source=source,
+    )
+
+
+def metrics_from_snapshot(snapshot, **extra) -> Dict[str, Optional[float]]:
+    """Every snapshot field plus derived metrics, as rule input."""
+    values = dict(snapshot.as_dict())
+    p1 = values.get("fps_p1_low") or 0.0
+    # 0 means no frame samples yet, not a 1% low of 0 FPS
+    values["fps_p1_low"] = p1 if p1 > 0 else None
+    values["frame_time_p1_ms"] = 1000.0 / p1 if p1 > 0 else None
+    values.update(extra)
+    return values
+
+
+def read_profile_metadata(path: Path) -> Optional[dict]:
+    """`// @key value` directives from a profile .cfg, as a PROFILES-style definition.
+
+    Only the leading comment block is read; returns None if it has no
+    directives.
+    """
+    definition: dict = {}
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if not line.lstrip().startswith("//"):
+                break
+            match = _DIRECTIVE.match(line)
+            if not match:
+                continue
+            key, value = match.group(1).lower(), match.group(2)
+            if key in ("when", "hold"):
+                parts = value.split(None, 1)
+                if len(parts) != 2:
+                    raise RuleError(f"{path}: @{key} needs a metric and a condition: {value!r}")
+                target = definition.setdefault("conditions" if key == "when" else "hold", {})
+                metric = canonical_metric(parts[0])
+                target[metric] = f"{target[metric]} and {parts[1]}" if metric in target else parts[1]
+            elif key == "priority":
+                definition["priority"] = int(value)
+            elif key in ("match", "description"):
+                definition[key] = value
+            else:
+                raise RuleError(f"{path}: unknown directive @{key}")
+    return definition or None
+
+
+def load_rules(profiles_dir: Path, definitions: Mapping[str, dict] = None,
+               default: Optional[str] = None) -> RuleSet:
+    """Rules for every profile: `definitions` overlaid with .cfg metadata.
+
+    A profile's @when/@hold directives replace the built-in conditions, hold
+    and match of the same name (other keys such as priority are kept unless
+    overridden too). A definition whose .cfg does not exist is dropped, since it could
+    never be applied.
+    """
+    profiles_dir = Path(profiles_dir)
+    merged = {}
+    for name, definition in (definitions or {}).items():
+        if (profiles_dir / f"{name}.cfg").is_file():
+            merged[name] = rule_from_definition(name, definition, "built-in")
+    for path in sorted(profiles_dir.glob("*.cfg")):
+        metadata = read_profile_metadata(path)
+        if metadata is not None:
+            base = dict((definitions or {}).get(path.stem, {}))
+            if "conditions" in metadata or "hold" in metadata:
+                # A profile's own conditions replace the built-in rule outright;
+                # inheriting its hold/match would pair new entry thresholds
+                # with unrelated exit thresholds
+                for key in ("conditions", "hold", "match"):
+                    base.pop(key, None)
+            base.update(metadata)
+            merged[path.stem] = rule_from_definition(path.stem, base, str(path))
+    return RuleSet(merged.values(), default)
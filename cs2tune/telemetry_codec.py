@@ -0,0 +1,66 @@
+"""
+Packed binary telemetry frames for the socket.io channel.
+
+Layout (little-endian), schema version 2:
+    header  u8 version | u8 field mask | u16 samples | u32 seq | f64 timestamp
+    body    for each field set in the mask, in SCHEMA_FIELDS order:
+            f32 mean | f32 min | f32 max
+
+The field mask has bit i set when SCHEMA_FIELDS[i] is present. JSON frames
+stay available for debugging; overlay/src/main.js decodes this format.
+
+Bump SCHEMA_VERSION whenever SCHEMA_FIELDS changes, so a decoder built
+against another field list rejects the frame instead of misreading it.
+Version 2 added p1_low.
+"""
+
+import struct
+
+SCHEMA_VERSION = 2
+SCHEMA_FIELDS = ("fps", "temp", "load", "vram", "p1_low")
+
+HEADER = struct.Struct("<BBHId")
+FIELD = struct.Struct("<fff")
+
+
+class FrameDecodeError(ValueError):
+    """Raised when a binary frame is truncated or uses an unknown schema."""
+
+
+def encode_frame(payload, seq, timestamp):
+    """Pack a decimated telemetry payload (see telemetry_fanout) into bytes."""
+    mask = 0
+    body = []
+    mins = payload.get("min", {})
+    maxs = payload.get("max", {})
+    for bit, field in enumerate(SCHEMA_FIELDS):
+        if field not in payload:
+            continue
+        mask |= 1 << bit
+        mean = payload[field]
+        body.append(FIELD.pack(mean, mins.get(field, mean), maxs.get(field, mean)))
+    samples = min(payload.get("samples", 1), 0xFFFF)
+    header = HEADER.pack(SCHEMA_VERSION, mask, samples, seq & 0xFFFFFFFF, timestamp)
+    return header + b"".join(body)
+
+
+def decode_frame(data):
+    """Unpack a binary frame into the same dict shape the JSON channel sends."""
+    if len(data) < HEADER.size:
+        raise FrameDecodeError(f"frame too short: {len(data)} bytes")
+    version, mask, samples, seq, timestamp = HEADER.unpack_from(data, 0)
+    if version != SCHEMA_VERSION:
+        raise FrameDecodeError(f"unsupported schema version {version}")
+    payload = {"min": {}, "max": {}, "samples": samples, "seq": seq, "timestamp": timestamp}
+    offset = HEADER.size
+    for bit, field in enumerate(SCHEMA_FIELDS):
+        if not mask & (1 << bit):
+            continue
+        if offset + FIELD.size > len(data):
+            raise FrameDecodeError("frame truncated")
+        mean, low, high = FIELD.unpack_from(data, offset)
+        offset += FIELD.size
+        payload[field] = mean
+        payload["min"][field] = low
+        payload["max"][field] = high
+    return payload
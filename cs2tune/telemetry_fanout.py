@@ -0,0 +1,132 @@
+"""
+Per-client telemetry subscriptions for the socket.io servers.
+The server samples once at the highest rate any client asked for; each
+subscriber accumulates min/max/mean over its own interval and only gets a
+frame when that interval elapses, so slow clients add no sampling work.
+"""
+
+import math
+import time
+
+DEFAULT_RATE = 2.0   # Hz, used when a client does not subscribe explicitly
+MIN_RATE = 0.1
+MAX_RATE = 60.0
+ENCODINGS = ("json", "binary")
+
+
+def parse_subscription(options):
+    """Extract (rate, fields, encoding) from a client's auth/subscribe payload.
+
+    Anything malformed falls back to the defaults instead of raising inside
+    a socket.io handler: a non-numeric or non-finite rate becomes None, a
+    "fps,temp" string is split into fields, and non-string fields are dropped.
+    """
+    if not isinstance(options, dict):
+        return None, None, "json"
+    rate = options.get("rate")
+    try:
+        rate = float(rate) if rate is not None else None
+    except (TypeError, ValueError):
+        rate = None
+    if rate is not None and not math.isfinite(rate):
+        rate = None
+    fields = options.get("fields")
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",")]
+    elif isinstance(fields, (list, tuple)):
+        fields = [f for f in fields if isinstance(f, str)]
+    else:
+        fields = None
+    return rate, fields, options.get("encoding", "json")
+
+
+class Subscription:
+    """Decimates a stream of frames down to one client's rate and field set."""
+
+    def __init__(self, fields, rate=DEFAULT_RATE, encoding="json"):
+        self.fields = tuple(fields)
+        self.rate = min(max(float(rate), MIN_RATE), MAX_RATE)
+        self.interval = 1.0 / self.rate
+        self.encoding = encoding if encoding in ENCODINGS else "json"
+        self.seq = 0
+        self._next_due = 0.0
+        self._reset()
+
+    def _reset(self):
+        self._count = 0
+        self._min = {}
+        self._max = {}
+        self._sum = dict.fromkeys(self.fields, 0.0)
+        self._n = dict.fromkeys(self.fields, 0)   # samples that carried each field
+
+    def add(self, frame):
+        for field in self.fields:
+            value = frame.get(field)
+            if value is None:
+                continue
+            self._sum[field] += value
+            self._n[field] += 1
+            if field not in self._min or value < self._min[field]:
+                self._min[field] = value
+            if field not in self._max or value > self._max[field]:
+                self._max[field] = value
+        self._count += 1
+
+    def flush(self, now):
+        """Return the decimated frame if this subscriber is due, else None."""
+        if now < self._next_due or self._count == 0:
+            return None
+        # Keep the cadence; after a stall restart it from now instead of
+        # sending the missed frames back to back
+        self._next_due += self.interval
+        if self._next_due <= now:
+            self._next_due = now + self.interval
+        payload = {}
+        for field in self.fields:
+            if field in self._min:
+                payload[field] = round(self._sum[field] / self._n[field], 2)
+        payload["min"] = dict(self._min)
+        payload["max"] = dict(self._max)
+        payload["samples"] = self._count
+        self.seq += 1
+        payload["seq"] = self.seq
+        self._reset()
+        return payload
+
+
+class TelemetryFanout:
+    """Tracks subscribers by socket.io sid and fans sampled frames out to them."""
+
+    def __init__(self, fields, default_rate=DEFAULT_RATE):
+        self.fields = tuple(fields)
+        self.default_rate = default_rate
+        self.subscribers = {}
+
+    def subscribe(self, sid, rate=None, fields=None, encoding="json"):
+        """Register or update a subscriber; unknown fields are ignored."""
+        wanted = [f for f in (fields or self.fields) if f in self.fields] or list(self.fields)
+        sub = Subscription(wanted, self.default_rate if rate is None else rate, encoding)
+        self.subscribers[sid] = sub
+        return sub
+
+    def unsubscribe(self, sid):
+        self.subscribers.pop(sid, None)
+
+    @property
+    def sample_rate(self):
+        """Highest rate requested by any subscriber (default rate when idle)."""
+        if not self.subscribers:
+            return self.default_rate
+        return max(sub.rate for sub in self.subscribers.values())
+
+    def push(self, frame):
+        for sub in self.subscribers.values():
+            sub.add(frame)
+
+    def due(self, now=None):
+        """Yield (sid, subscription, payload) for every subscriber whose interval has elapsed."""
+        now = time.monotonic() if now is None else now
+        for sid, sub in list(self.subscribers.items()):
+            payload = sub.flush(now)
+            if payload is not None:
+                yield sid, sub, payload
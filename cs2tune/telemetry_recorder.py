@@ -0,0 +1,232 @@
+"""
+Persistent telemetry history for CS2Tune.
+
+Each monitoring session gets its own directory of append-only, memory-mapped
+columnar segments. A segment is a fixed-size file:
+
+    header   4096 bytes: magic, u64 row count, JSON schema (columns, capacity)
+    columns  one fixed-width array per column, `capacity` rows each
+
+Segments rotate once full, so the size on disk is bounded per file. The
+reader maps segments read-only and binary-searches the timestamp column, so
+slicing a time range only touches the pages in that range.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+
+HISTORY_DIR = Path(os.environ.get('CS2TUNE_HISTORY_DIR', Path.home() / ".cs2tune" / "history"))
+MAGIC = b"CS2TLM1\0"
+HEADER_SIZE = 4096
+COUNT = struct.Struct("<Q")  # row count, stored right after MAGIC
+SEGMENT_BYTES = 8 * 1024 * 1024
+FLUSH_EVERY = 32  # rows between msync calls
+
+COLUMNS = (
+    ("timestamp", "<f8"),
+    ("fps", "<f4"),
+    ("fps_p1_low", "<f4"),
+    ("gpu_temp", "<f4"),
+    ("gpu_usage", "<f4"),
+    ("cpu_temp", "<f4"),
+    ("vram_used", "<f4"),
+)
+
+
+def _row_size(columns):
+    return sum(np.dtype(dtype).itemsize for _, dtype in columns)
+
+
+def _column_offsets(columns, capacity):
+    offsets = {}
+    offset = HEADER_SIZE
+    for name, dtype in columns:
+        offsets[name] = offset
+        offset += np.dtype(dtype).itemsize * capacity
+    return offsets, offset
+
+
+class SegmentWriter:
+    """One pre-sized, memory-mapped segment file being appended to."""
+
+    def __init__(self, path, columns=COLUMNS, capacity=None, session=""):
+        self.path = Path(path)
+        self.columns = tuple(columns)
+        self.capacity = capacity or max(1, (SEGMENT_BYTES - HEADER_SIZE) // _row_size(self.columns))
+        self.count = 0
+        offsets, size = _column_offsets(self.columns, self.capacity)
+        schema = json.dumps({
+            "version": 1,
+            "session": session,
+            "created": time.time(),
+            "capacity": self.capacity,
+            "columns": [list(c) for c in self.columns],
+        }).encode()
+        if len(MAGIC) + COUNT.size + len(schema) > HEADER_SIZE:
+            raise ValueError("Segment schema does not fit in the header")
+        with open(self.path, 'wb') as f:
+            f.truncate(size)
+            f.write(MAGIC + COUNT.pack(0) + schema)
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._arrays = {
+            name: np.ndarray((self.capacity,), dtype=dtype, buffer=self._map, offset=offsets[name])
+            for name, dtype in self.columns
+        }
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    def append(self, row):
+        for name, _ in self.columns:
+            self._arrays[name][self.count] = row.get(name, 0)
+        self.count += 1
+        # Publish the row only after every column is written
+        self._map[len(MAGIC):len(MAGIC) + COUNT.size] = COUNT.pack(self.count)
+        if self.count % FLUSH_EVERY == 0:
+            self._map.flush()
+
+    def close(self):
+        if self._map is None:
+            return
+        self._arrays = {}
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        self._map = None
+
+
+class TelemetryRecorder:
+    """Append-only recorder for one session; rotates segments by size."""
+
+    def __init__(self, history_dir=HISTORY_DIR, session=None, columns=COLUMNS,
+                 segment_rows=None):
+        self.session = session or time.strftime("%Y%m%d_%H%M%S")
+        self.directory = Path(history_dir) / self.session
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.columns = tuple(columns)
+        self.segment_rows = segment_rows
+        self._segment = None
+        self._index = len(list(self.directory.glob("segment_*.tlm")))
+
+    def _rotate(self):
+        if self._segment is not None:
+            self._segment.close()
+        path = self.directory / f"segment_{self._index:05d}.tlm"
+        self._index += 1
+        self._segment = SegmentWriter(path, self.columns, self.segment_rows, self.session)
+
+    def append(self, row):
+        """Append one row (dict keyed by column name; missing columns are 0)."""
+        if self._segment is None or self._segment.full:
+            self._rotate()
+        self._segment.append(row)
+
+    def record(self, snapshot):
+        """Append a cs2tune.telemetry_snapshot.TelemetrySnapshot."""
+        self.append(snapshot.as_dict())
+
+    def close(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+
+class SegmentReader:
+    """Read-only view of one segment file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if not header.startswith(MAGIC):
+            raise ValueError(f"{self.path} is not a telemetry segment")
+        schema_bytes = header[len(MAGIC) + COUNT.size:].rstrip(b"\0")
+        schema = json.loads(schema_bytes)
+        self.session = schema.get("session", "")
+        self.capacity = schema["capacity"]
+        self.columns = tuple((name, dtype) for name, dtype in schema["columns"])
+        self.count = COUNT.unpack_from(header, len(MAGIC))[0]
+        offsets, _ = _column_offsets(self.columns, self.capacity)
+        self._arrays = {
+            name: np.memmap(self.path, dtype=dtype, mode='r', offset=offsets[name],
+                            shape=(self.capacity,))[:self.count]
+            for name, dtype in self.columns
+        }
+
+    def column(self, name):
+        return self._arrays[name]
+
+    @property
+    def time_range(self):
+        ts = self._arrays["timestamp"]
+        return (float(ts[0]), float(ts[-1])) if len(ts) else (None, None)
+
+    def slice(self, start=None, end=None, columns=None):
+        """Rows with start <= timestamp <= end, as a dict of (memory-mapped) arrays."""
+        ts = self._arrays["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="right"))
+        names = columns or [name for name, _ in self.columns]
+        return {name: self._arrays[name][lo:hi] for name in names}
+
+
+class TelemetryHistory:
+    """Reader over every segment of one recorded session."""
+
+    def __init__(self, session, history_dir=HISTORY_DIR):
+        self.session = session
+        self.directory = Path(history_dir) / session
+        self.segments = [SegmentReader(p) for p in sorted(self.directory.glob("segment_*.tlm"))]
+
+    @property
+    def time_range(self):
+        ranges = [s.time_range for s in self.segments if s.count]
+        if not ranges:
+            return (None, None)
+        return (ranges[0][0], ranges[-1][1])
+
+    def slice(self, start=None, end=None, columns=None):
+        """Concatenate the matching rows of every overlapping segment."""
+        parts = []
+        for segment in self.segments:
+            first, last = segment.time_range
+            if first is None:
+                continue
+            if (end is not None and first > end) or (start is not None and last < start):
+                continue
+            parts.append(segment.slice(start, end, columns))
+        names = columns or [name for name, _ in COLUMNS]
+        if not parts:
+            return {name: np.empty(0) for name in names}
+        return {name: np.concatenate([p[name] for p in parts]) for name in names}
+
+    def summary(self):
+        """Per-column mean/min/max over the whole session, for session comparison."""
+        data = self.slice()
+        stats = {"rows": int(len(data["timestamp"]))}
+        if stats["rows"]:
+            stats["duration_s"] = float(data["timestamp"][-1] - data["timestamp"][0])
+            for name in data:
+                if name != "timestamp":
+                    stats[name] = {
+                        "mean": float(np.mean(data[name])),
+                        "min": float(np.min(data[name])),
+                        "max": float(np.max(data[name])),
+                    }
+        return stats
+
+
+def list_sessions(history_dir=HISTORY_DIR):
+    """Recorded session names, newest first."""
+    history_dir = Path(history_dir)
+    if not history_dir.exists():
+        return []
+    return sorted((p.name for p in history_dir.iterdir() if p.is_dir()), reverse=True)
@@ -0,0 +1,67 @@
+"""
+Per-tick telemetry snapshots for CS2Tune.
+Every sensor is read once per tick into an immutable record, and that same
+record is handed to profile selection, the OBS overlay and the metrics file.
+"""
+
+import time
+from dataclasses import dataclass, asdict
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    """All sensor readings taken during one monitor tick."""
+    timestamp: float
+    fps: float
+    gpu_temp: float
+    gpu_usage: float
+    cpu_temp: float
+    vram_used: float = 0.0  # GB
+    fps_p1_low: float = 0.0
+
+    def as_dict(self):
+        return asdict(self)
+
+    def as_overlay(self, profile_name):
+        """Overlay/metrics JSON payload, in the format update_obs_overlay has always written"""
+        local = time.localtime(self.timestamp)
+        return {
+            "profile": profile_name,
+            "fps": int(self.fps),
+            "gpu_temp": round(self.gpu_temp, 1),
+            "gpu_usage": round(self.gpu_usage, 1),
+            "cpu_temp": round(self.cpu_temp, 1),
+            "timestamp": time.strftime("%H:%M:%S", local),
+            "date": time.strftime("%Y-%m-%d", local)
+        }
+
+
+class SnapshotCollector:
+    """Reads every sensor exactly once per `collect()` call.
+
+    `read_gpu` returns (gpu_temp, gpu_usage, vram_used_gb), `read_cpu_temp`
+    returns a temperature and `read_fps` receives the GPU usage from the same
+    tick so FPS estimates never trigger a second GPU read. An optional
+    `frame_stats` (cs2tune.frame_stats.FrameStats) supplies the 1% low.
+    """
+
+    def __init__(self, read_gpu, read_cpu_temp, read_fps, frame_stats=None):
+        self._read_gpu = read_gpu
+        self._read_cpu_temp = read_cpu_temp
+        self._read_fps = read_fps
+        self._frame_stats = frame_stats
+        self.last = None
+
+    def collect(self):
+        gpu_temp, gpu_usage, vram_used = self._read_gpu()
+        snapshot = TelemetrySnapshot(
+            timestamp=time.time(),
+            fps=self._read_fps(gpu_usage),
+            gpu_temp=gpu_temp,
+            gpu_usage=gpu_usage,
+            cpu_temp=self._read_cpu_temp(),
+            vram_used=vram_used,
+            fps_p1_low=self._frame_stats.summary().p1_low_fps if self._frame_stats else 0.0,
+        )
+        self.last = snapshot
+        return snapshot
@@ -1,44 +1,152 @@
 import asyncio
-import random
+import logging
+import threading
+import time
+from collections import deque
 import socketio
 from fastapi import FastAPI
-from threading import Thread
-import GPUtil
+
+from cs2tune.fps_ingest import get_fps_ingest
+from cs2tune.frame_stats import FrameStats
+from cs2tune.gpu_sampler import get_sampler
+from cs2tune.telemetry_fanout import TelemetryFanout, parse_subscription
+from cs2tune.telemetry_codec import SCHEMA_FIELDS, encode_frame
+
+TELEMETRY_FIELDS = SCHEMA_FIELDS
+DEFAULT_RATE = 2.0         # Hz for clients that don't subscribe (dashboard default)
+GPU_MIN_INTERVAL = 0.1     # never poll the GPU backend faster than this
+NO_GPU_BACKOFF_MAX = 10.0  # longest wait between emits while no GPU is present
+RING_SIZE = 240
 
 sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
 app = FastAPI()
 asgi_app = socketio.ASGIApp(sio, other_asgi_app=app)
 
+
+class TelemetryRing:
+    """Fixed-size ring of telemetry frames shared by the sampler thread and the event loop."""
+
+    def __init__(self, size=RING_SIZE):
+        self._frames = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.seq = 0
+
+    def publish(self, frame):
+        with self._lock:
+            self.seq += 1
+            self._frames.append((self.seq, frame))
+
+    def latest(self):
+        """Return (seq, frame) for the newest frame, or (0, None) if empty."""
+        with self._lock:
+            return self._frames[-1] if self._frames else (0, None)
+
+    def since(self, seq):
+        """Return all (seq, frame) pairs newer than `seq` still held in the ring."""
+        newer = []
+        with self._lock:
+            for item in reversed(self._frames):
+                if item[0] <= seq:
+                    break
+                newer.append(item)
+        newer.reverse()
+        return newer
+
+
+ring = TelemetryRing()
+fanout = TelemetryFanout(TELEMETRY_FIELDS, default_rate=DEFAULT_RATE)
+frame_stats = FrameStats()
+
+
+def sample_interval():
+    """Sample once at the highest rate any connected client requested."""
+    return 1.0 / fanout.sample_rate
+
+
+def sample_frame():
+    """Read one telemetry frame, or None if no GPU is available."""
+    sampler = get_sampler()
+    sampler.interval = max(sample_interval(), GPU_MIN_INTERVAL)
+    reading = sampler.latest()
+    if reading is None:
+        return None
+    lows = frame_stats.summary()
+    return {
+        "fps": get_fps_ingest().current_fps(),  # None (omitted) until CS2 logs FPS
+        "temp": round(reading.temperature, 1),
+        "load": int(reading.utilization),
+        "vram": round(reading.memory_used / 1024, 2),  # GB
+        "p1_low": round(lows.p1_low_fps, 1) if lows.samples else None
+    }
+
+
+def sampler_loop(stop_event):
+    """Background thread: sample off the event loop and publish into the ring."""
+    while not stop_event.is_set():
+        started = time.monotonic()
+        try:
+            frame = sample_frame()
+        except Exception as e:
+            logging.error(f"Telemetry sampling failed: {e}")
+            frame = None
+        if frame is not None:
+            ring.publish(frame)
+        stop_event.wait(max(0.0, sample_interval() - (time.monotonic() - started)))
+
+
 @sio.event
-async def connect(sid, environ):
-    print(f"Client connected: {sid}")
+async def connect(sid, environ, auth=None):
+    sub = fanout.subscribe(sid, *parse_subscription(auth))
+    print(f"Client connected: {sid} ({sub.rate:g} Hz, {sub.encoding}, fields: {', '.join(sub.fields)})")
+
+@sio.event
+async def subscribe(sid, options):
+    """Change a connected client's rate and field set."""
+    sub = fanout.subscribe(sid, *parse_subscription(options))
+    return {"rate": sub.rate, "fields": list(sub.fields), "encoding": sub.encoding}
 
 @sio.event
 async def disconnect(sid):
+    fanout.unsubscribe(sid)
     print(f"Client disconnected: {sid}")
 
 async def emit_telemetry():
+    """Fan new frames out to subscribers; never touches the sensors itself."""
+    last_seq = 0
+    backoff = sample_interval()
     while True:
-        gpus = GPUtil.getGPUs()
-        if not gpus:
+        frames = ring.since(last_seq)
+        if not frames and last_seq == 0:
+            # No GPU (yet): back off instead of spinning
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, NO_GPU_BACKOFF_MAX)
             continue
-        gpu = gpus[0]
-        data = {
-            "fps": random.randint(120, 240),  # Replace with real FPS capture
-            "temp": round(gpu.temperature, 1),
-            "load": int(gpu.load * 100),
-            "vram": round(gpu.memoryUsed / 1024, 2)  # GB
-        }
-        await sio.emit("telemetry", data)
-        await asyncio.sleep(0.5)  # 2 FPS updates/sec
+        backoff = sample_interval()
+        for seq, frame in frames:
+            fanout.push(frame)
+            last_seq = seq
+        for sid, sub, payload in fanout.due():
+            if sub.encoding == "binary":
+                # bytes go out as a binary socket.io attachment
+                payload = encode_frame(payload, payload["seq"], time.time())
+            await sio.emit("telemetry", payload, to=sid)
+        await asyncio.sleep(sample_interval())
+
+_sampler_stop = threading.Event()
+
+@app.on_event("startup")
+async def start_telemetry():
+    get_fps_ingest().subscribe(frame_stats.add_sample)
+    threading.Thread(target=sampler_loop, args=(_sampler_stop,), name="telemetry-sampler", daemon=True).start()
+    sio.start_background_task(emit_telemetry)
+
+@app.on_event("shutdown")
+async def stop_telemetry():
+    _sampler_stop.set()
 
 def start_server():
     import uvicorn
     uvicorn.run(asgi_app, host="0.0.0.0", port=8000)
 
-def run_telemetry_loop():
-    asyncio.run(emit_telemetry())
-
 if __name__ == "__main__":
-    Thread(target=start_server).start()
-    run_telemetry_loop()
+    start_server()
@@ -0,0 +1,79 @@
+"""
+Fixed-capacity NumPy ring buffer for monitoring samples.
+Every row is written twice (at i and i + capacity), so the most recent N
+samples are always one contiguous slice and window() can hand plotting
+code a zero-copy view instead of rebuilding Python lists.
+"""
+
+import threading
+import numpy as np
+
+SAMPLE_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("fps", "f4"),
+    ("cpu_temp", "f4"),
+    ("gpu_temp", "f4"),
+    ("gpu_usage", "f4"),
+])
+
+
+class SampleRing:
+    """Thread-safe ring of structured samples with zero-copy window views.
+
+    Views returned by window() alias the live buffer: a row stays valid
+    until `capacity` newer samples have been appended. Use snapshot() when
+    the data must outlive that.
+    """
+
+    def __init__(self, capacity, dtype=SAMPLE_DTYPE):
+        self.capacity = capacity
+        self.dtype = dtype
+        self._buf = np.zeros(2 * capacity, dtype=dtype)
+        self._head = 0   # next write position in [0, capacity)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, *values, **fields):
+        """Append one sample, given positionally (dtype order) or by field name."""
+        row = values if values else tuple(fields.get(name, 0) for name in self.dtype.names)
+        with self._lock:
+            self._buf[self._head] = row
+            self._buf[self._head + self.capacity] = row
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def window(self, n=None):
+        """Read-only view of the newest `n` samples (all if None), oldest first."""
+        with self._lock:
+            n = self._count if n is None else min(n, self._count)
+            end = self._head + self.capacity
+            view = self._buf[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def since(self, start):
+        """Read-only view of the samples with timestamp >= `start`, oldest first.
+
+        Samples are appended in time order, so this is a binary search over
+        the contiguous window rather than a scan.
+        """
+        view = self.window()
+        return view[int(np.searchsorted(view["timestamp"], start, side="left")):]
+
+    def snapshot(self, n=None):
+        """Independent copy of window(n)."""
+        return self.window(n).copy()
+
+    def latest(self):
+        """Newest sample as a NumPy record, or None if empty."""
+        if self._count == 0:
+            return None
+        return self.window(1)[0]
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._count = 0
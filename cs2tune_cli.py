@@ -1,7 +1,8 @@
 import argparse
-import shutil
 import os
 
+from cs2tune.profile_apply import apply_profile
+
 
 CONFIG_DIR = "./cs2tune/profiles"
 ACTIVE_CONFIG_PATH = "/path/to/cs2/autoexec.cfg"
@@ -18,8 +19,15 @@ def switch_profile(profile_name):
     if not os.path.isfile(src):
         print(f"Profile '{profile_name}' not found.")
         return False
-    shutil.copy(src, ACTIVE_CONFIG_PATH)
-    print(f"Switched to profile {profile_name}")
+    try:
+        result = apply_profile(src, ACTIVE_CONFIG_PATH)
+    except OSError as e:
+        print(f"Failed to switch to profile {profile_name}: {e}")
+        return False
+    if result.written:
+        print(f"Switched to profile {profile_name} ({result.delta.summary()})")
+    else:
+        print(f"Profile {profile_name} is already active")
     return True
 
 
@@ -1,7 +1,6 @@
 import streamlit as st
 import subprocess
 import pandas as pd
-import numpy as np
 import time
 import json
 import os
@@ -11,9 +10,13 @@ from datetime import datetime
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from pathlib import Path
-import random
 from collections import deque
 
+from cs2tune.fps_ingest import get_fps_ingest
+from cs2tune.gpu_sampler import get_sampler
+from cs2tune.process_runner import start, stream_to_streamlit
+from cs2tune.timeseries import SampleRing
+
 # Fix unresolved import by ensuring the package is installed
 try:
     from streamlit_autorefresh import st_autorefresh
@@ -21,15 +24,24 @@ except ImportError:
     st.error("Please install the 'streamlit-autorefresh' package using pip.")
 
 # Global variables for monitoring
-fps_data = []
-cpu_temp_data = []
-gpu_temp_data = []
-gpu_usage_data = []
-timestamps = []
 current_profile = "none"
-monitoring_active = False
 max_data_points = 100
 
+
+# Sample store and sampler-thread flag live in the resource cache so they
+# survive Streamlit reruns (module globals are re-created on every rerun)
+@st.cache_resource
+def get_sample_store():
+    """Ring buffer of (timestamp, fps, cpu_temp, gpu_temp, gpu_usage) samples."""
+    return SampleRing(max_data_points)
+
+
+@st.cache_resource
+def get_monitoring_flag():
+    """Event that is set while the monitor thread should keep sampling."""
+    return threading.Event()
+
+
 # For telemetry dashboard
 max_len = 50
 fps_telemetry = deque(maxlen=max_len)
@@ -40,30 +52,16 @@ def run_command_live(cmd):
     """Run a command and display its output live in the Streamlit app."""
     with st.expander(f"📤 Output: {' '.join(cmd)}", expanded=True):
         placeholder = st.empty()
-        process = subprocess.Popen(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-            text=True, bufsize=1
-        )
-        output = ""
-        for line in process.stdout:
-            output += line
-            placeholder.code(output, language="bash")
-        process.wait()
-        return process.returncode
+        return stream_to_streamlit(start(cmd), placeholder)
 
 
-# Get NVIDIA GPU temperature and usage using nvidia-smi
+# Get NVIDIA GPU temperature and usage from the shared GPU sampler
 def get_gpu_info():
-    """Get NVIDIA GPU temperature and usage using nvidia-smi."""
-    try:
-        output = subprocess.check_output([
-            "nvidia-smi", "--query-gpu=temperature.gpu,utilization.gpu",
-            "--format=csv,noheader,nounits"
-        ]).decode()
-        temp, usage = map(float, output.strip().split(','))
-        return temp, usage
-    except subprocess.CalledProcessError:
+    """Get NVIDIA GPU temperature and usage from the shared GPU sampler."""
+    reading = get_sampler().latest()
+    if reading is None:
         return 0, 0
+    return reading.temperature, reading.utilization
 
 
 # Get CPU temperature using psutil
@@ -80,42 +78,22 @@ def get_cpu_temp():
         return 0
 
 
-# Simulate FPS reading (replace with actual CS2 FPS reading if available)
+# Read the live FPS that CS2 writes to its -condebug console log
 def get_fps():
-    """Simulate FPS reading (replace with actual CS2 FPS reading)."""
-    _, gpu_usage = get_gpu_info()
-    base_fps = 250
-    variance = np.random.normal(0, 15)
-    fps = max(1, base_fps * (0.5 + (gpu_usage / 100) * 0.5) + variance)
-    return fps
+    """Get the current CS2 FPS from the console log (0 if the game isn't logging)."""
+    fps = get_fps_ingest().current_fps()
+    return fps if fps is not None else 0
 
 
 # Monitor system performance metrics
-def monitor_system():
-    """Monitor system metrics and update global variables."""
-    global fps_data, cpu_temp_data, gpu_temp_data
-    global gpu_usage_data, timestamps, monitoring_active
-
-    while monitoring_active:
+def monitor_system(store, active):
+    """Sample system metrics into the shared ring buffer while `active` is set."""
+    while active.is_set():
         fps = get_fps()
         cpu_temp = get_cpu_temp()
         gpu_temp, gpu_usage = get_gpu_info()
 
-        current_time = datetime.now().strftime("%H:%M:%S")
-
-        fps_data.append(fps)
-        cpu_temp_data.append(cpu_temp)
-        gpu_temp_data.append(gpu_temp)
-        gpu_usage_data.append(gpu_usage)
-        timestamps.append(current_time)
-
-        # Keep only the last max_data_points
-        if len(fps_data) > max_data_points:
-            fps_data.pop(0)
-            cpu_temp_data.pop(0)
-            gpu_temp_data.pop(0)
-            gpu_usage_data.pop(0)
-            timestamps.pop(0)
+        store.append(time.time(), fps, cpu_temp, gpu_temp, gpu_usage)
 
         update_obs_overlay(fps, cpu_temp, gpu_temp, gpu_usage)
         time.sleep(1)
@@ -174,6 +152,9 @@ if 'monitoring' not in st.session_state:
 if 'current_profile' not in st.session_state:
     st.session_state.current_profile = "none"
 
+sample_store = get_sample_store()
+monitoring_flag = get_monitoring_flag()
+
 # Performance Monitor Tab
 with tab1:
     col1, col2 = st.columns(2)
@@ -182,18 +163,20 @@ with tab1:
         st.subheader("Real-time Performance Metrics")
         
         # Start/Stop monitoring button
-        if not monitoring_active:
+        if not monitoring_flag.is_set():
             if st.button("🟢 Start Performance Monitoring"):
-                monitoring_active = True
+                monitoring_flag.set()
                 monitor_thread = threading.Thread(
-                    target=monitor_system, daemon=True
+                    target=monitor_system,
+                    args=(sample_store, monitoring_flag),
+                    daemon=True
                 )
                 monitor_thread.start()
                 st.session_state.monitoring = True
                 st.success("Monitoring started!")
         else:
             if st.button("🔴 Stop Monitoring"):
-                monitoring_active = False
+                monitoring_flag.clear()
                 st.session_state.monitoring = False
                 st.info("Monitoring stopped.")
     
@@ -211,7 +194,13 @@ with tab1:
     # Performance Charts
     st.subheader("Performance Charts")
     
-    if fps_data:
+    samples = sample_store.window()
+    if len(samples):
+        # Column views into the ring buffer; no per-rerun list copies
+        timestamps = pd.to_datetime(
+            samples["timestamp"], unit="s", utc=True
+        ).tz_convert(datetime.now().astimezone().tzinfo)
+
         # Create performance charts using Plotly
         fig = make_subplots(
             rows=2, cols=1,
@@ -223,7 +212,7 @@ with tab1:
         # FPS Chart
         fig.add_trace(
             go.Scatter(
-                x=timestamps, y=fps_data, mode='lines', name='FPS',
+                x=timestamps, y=samples["fps"], mode='lines', name='FPS',
                 line=dict(color='green', width=2)
             ),
             row=1, col=1
@@ -233,7 +222,7 @@ with tab1:
         fig.add_trace(
             go.Scatter(
                 x=timestamps,
-                y=cpu_temp_data,
+                y=samples["cpu_temp"],
                 mode='lines',
                 name='CPU Temp (°C)',
                 line=dict(color='red', width=2)
@@ -244,7 +233,7 @@ with tab1:
         fig.add_trace(
             go.Scatter(
                 x=timestamps,
-                y=gpu_temp_data,
+                y=samples["gpu_temp"],
                 mode='lines',
                 name='GPU Temp (°C)',
                 line=dict(color='orange', width=2)
@@ -255,7 +244,7 @@ with tab1:
         fig.add_trace(
             go.Scatter(
                 x=timestamps,
-                y=gpu_usage_data,
+                y=samples["gpu_usage"],
                 mode='lines',
                 name='GPU Usage (%)',
                 line=dict(color='blue', width=2)
@@ -290,9 +279,8 @@ with tab1:
         st.success("Telemetry started!")
         
     if st.session_state.get("telemetry_active", False):
-        # Replace with real telemetry input
-        fps = random.randint(120, 300)
-        gpu_temp = random.uniform(60, 85)
+        fps = get_fps()
+        gpu_temp, _ = get_gpu_info()
 
         fps_telemetry.append(fps)
         gpu_temp_telemetry.append(gpu_temp)
@@ -460,15 +448,14 @@ with tab3:
             
             if os.path.exists(profile_path):
                 # Run the hardware monitor script with the selected profile
-                cmd = ["python", os.path.join(profiles_dir, "..", "hardware_monitor.py"), 
-                      "--profile", selected_profile]
+                cmd = ["python", "-m", "cs2tune.hardware_monitor",
+                       "--profile", selected_profile]
                 
                 retcode = run_command_live(cmd)
                 
                 if retcode == 0:
                     st.success(f"Profile {selected_profile} applied successfully!")
-                    # Update global variable
-                    global current_profile
+                    # Update module-level profile (this block runs at module scope)
                     current_profile = selected_profile
                 else:
                     st.error(f"Failed to apply profile. Exit code: {retcode}")
@@ -486,16 +473,16 @@ with tab3:
     if auto_switch:
         try:
             # Start the hardware monitor in auto mode
-            cmd = ["python", os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                                         "cs2tune", "hardware_monitor.py"),
-                  "--only-when-running"]
+            cmd = ["python", "-m", "cs2tune.hardware_monitor",
+                   "--only-when-running"]
             
             st.info("Starting auto-switching monitor in the background...")
             
             # Use Popen to run in background
             process = subprocess.Popen(
                 cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                text=True, bufsize=1
+                text=True, bufsize=1,
+                cwd=os.path.dirname(os.path.abspath(__file__))
             )
             
             st.session_state.auto_switch_pid = process.pid
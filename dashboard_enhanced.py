@@ -5,15 +5,18 @@ Real-time monitoring and configuration management for Counter-Strike 2
 """
 
 import streamlit as st
-import random
 import time
 import subprocess
 import os
-import shutil
 from collections import deque
 from datetime import datetime
 from pathlib import Path
 
+from cs2tune.fps_ingest import get_fps_ingest
+from cs2tune.frame_stats import FrameStats
+from cs2tune.profile_apply import apply_profile
+from cs2tune.telemetry_recorder import TelemetryHistory, list_sessions
+
 # Import required packages with error handling
 try:
     import plotly.graph_objects as go
@@ -40,6 +43,14 @@ vram_data = deque(maxlen=100)
 timestamps = deque(maxlen=100)
 
 
+@st.cache_resource
+def get_frame_stats():
+    """Streaming frame-time statistics fed by CS2's console log; survives reruns."""
+    stats = FrameStats(windows={"10s": 10.0, "30s": 30.0})
+    get_fps_ingest().subscribe(stats.add_sample)
+    return stats
+
+
 @st.cache_data
 def get_available_profiles():
     """Get list of available CS2 configuration profiles."""
@@ -56,15 +67,13 @@ def switch_profile(profile_name):
         return False, f"Profile '{profile_name}' not found."
     
     try:
-        # Create backup of current config
-        if CS2_CONFIG_PATH.exists():
-            backup_path = CS2_CONFIG_PATH.with_suffix(f".backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}.cfg")
-            shutil.copy2(CS2_CONFIG_PATH, backup_path)
-        
-        # Copy new profile
-        shutil.copy2(src, CS2_CONFIG_PATH)
+        # Back up the current config whenever it actually gets rewritten
+        backup_path = CS2_CONFIG_PATH.with_suffix(f".backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}.cfg")
+        result = apply_profile(src, CS2_CONFIG_PATH, backup=backup_path)
         
-        return True, f"✅ Successfully switched to {profile_name}"
+        if not result.written:
+            return True, f"✅ {profile_name} is already active"
+        return True, f"✅ Successfully switched to {profile_name} ({result.delta.summary()})"
     except Exception as e:
         return False, f"❌ Error switching profile: {str(e)}"
 
@@ -74,7 +83,7 @@ def get_system_metrics():
     try:
         metrics = {
             'timestamp': datetime.now(),
-            'fps': random.randint(180, 320),  # Replace with actual CS2 FPS reading
+            'fps': get_fps_ingest().current_fps() or 0,  # 0 until CS2 logs FPS (-condebug)
             'cpu_usage': psutil.cpu_percent(interval=0.1),
             'memory_usage': psutil.virtual_memory().percent,
             'cpu_temp': 0,
@@ -138,6 +147,60 @@ def create_performance_chart(data, title, color, unit=""):
     return fig
 
 
+def render_session_history():
+    """Browse and compare telemetry sessions recorded by hardware_monitor."""
+    st.subheader("📼 Session History")
+    sessions = list_sessions()
+    if not sessions:
+        st.info("No recorded sessions yet. Run `python -m cs2tune.hardware_monitor` to record one.")
+        return
+    
+    session = st.selectbox("Session:", sessions)
+    history = TelemetryHistory(session)
+    start, end = history.time_range
+    if start is None:
+        st.info("This session has no samples yet.")
+        return
+    
+    minutes = max((end - start) / 60, 0.1)
+    range_min = st.slider("Time range (minutes from session start)", 0.0, minutes, (0.0, minutes))
+    # Only the selected range is read from the memory-mapped segments
+    data = history.slice(start + range_min[0] * 60, start + range_min[1] * 60,
+                         ["timestamp", "fps", "gpu_temp"])
+    elapsed = (data["timestamp"] - start) / 60
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=elapsed, y=data["fps"], mode='lines', name='FPS',
+                             line=dict(color="#00ff88", width=2)))
+    fig.add_trace(go.Scatter(x=elapsed, y=data["gpu_temp"], mode='lines', name='GPU Temp (°C)',
+                             line=dict(color="#ff6b6b", width=2), yaxis="y2"))
+    fig.update_layout(
+        xaxis_title="Minutes",
+        yaxis=dict(title="FPS"),
+        yaxis2=dict(title="°C", overlaying="y", side="right"),
+        height=350,
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    compare = st.multiselect("Compare sessions:", sessions, default=sessions[:2])
+    rows = []
+    for name in compare:
+        summary = TelemetryHistory(name).summary()
+        if summary["rows"]:
+            rows.append({
+                "Session": name,
+                "Duration (min)": round(summary["duration_s"] / 60, 1),
+                "Avg FPS": round(summary["fps"]["mean"], 1),
+                "Min FPS": round(summary["fps"]["min"], 1),
+                "Avg 1% Low": round(summary["fps_p1_low"]["mean"], 1),
+                "Avg GPU Temp": round(summary["gpu_temp"]["mean"], 1),
+                "Max GPU Temp": round(summary["gpu_temp"]["max"], 1),
+            })
+    if rows:
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+
 def main():
     """Main dashboard application."""
     # Page configuration
@@ -247,7 +310,7 @@ def main():
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    delta_fps = metrics['fps'] - (list(fps_data)[-2] if len(fps_data) > 1 else metrics['fps'])
+                    delta_fps = metrics['fps'] - (fps_data[-2] if len(fps_data) > 1 else metrics['fps'])
                     st.metric(
                         label="🎯 FPS",
                         value=f"{metrics['fps']}",
@@ -255,7 +318,7 @@ def main():
                     )
                 
                 with col2:
-                    delta_gpu_temp = metrics['gpu_temp'] - (list(gpu_temp_data)[-2] if len(gpu_temp_data) > 1 else metrics['gpu_temp'])
+                    delta_gpu_temp = metrics['gpu_temp'] - (gpu_temp_data[-2] if len(gpu_temp_data) > 1 else metrics['gpu_temp'])
                     temp_color = "normal" if metrics['gpu_temp'] < 75 else "off" if metrics['gpu_temp'] > 85 else "inverse"
                     st.metric(
                         label="🌡️ GPU Temp",
@@ -307,22 +370,21 @@ def main():
                         st.metric("⏱️ Frame Time", f"{frame_time:.2f}ms")
                     
                     with adv_col3:
-                        if len(fps_data) > 10:
-                            avg_fps = sum(list(fps_data)[-10:]) / 10
-                            min_fps = min(list(fps_data)[-10:])
-                            st.metric("📊 Avg FPS (10s)", f"{avg_fps:.1f}")
-                            st.metric("📉 Min FPS (10s)", f"{min_fps}")
+                        stats_10s = get_frame_stats().summary("10s")
+                        if stats_10s.samples:
+                            st.metric("📊 Avg FPS (10s)", f"{stats_10s.avg_fps:.1f}")
+                            st.metric("📉 1% Low (10s)", f"{stats_10s.p1_low_fps:.1f}")
+                            st.metric("📉 0.1% Low (10s)", f"{stats_10s.p01_low_fps:.1f}")
                 
                 # Performance Analysis
-                if len(fps_data) > 30:
+                stats_30s = get_frame_stats().summary("30s")
+                if stats_30s.samples > 30:
                     st.subheader("🔍 Performance Analysis")
                     
                     analysis_col1, analysis_col2 = st.columns(2)
                     
                     with analysis_col1:
-                        recent_fps = list(fps_data)[-30:]
-                        avg_fps = sum(recent_fps) / len(recent_fps)
-                        fps_stability = (max(recent_fps) - min(recent_fps)) / avg_fps * 100
+                        avg_fps = stats_30s.avg_fps
                         
                         if avg_fps >= 240:
                             st.success("🎯 Excellent performance!")
@@ -331,7 +393,9 @@ def main():
                         else:
                             st.warning("⚠️ Consider Max FPS profile")
                         
-                        st.write(f"**FPS Stability:** {100-fps_stability:.1f}%")
+                        st.write(f"**FPS Stability:** {stats_30s.stability:.1f}%")
+                        st.write(f"**1% / 0.1% Lows:** {stats_30s.p1_low_fps:.0f} / {stats_30s.p01_low_fps:.0f} FPS")
+                        st.write(f"**Stutters (30s):** {stats_30s.stutters}")
                     
                     with analysis_col2:
                         recent_temps = list(gpu_temp_data)[-30:]
@@ -372,6 +436,8 @@ def main():
                     st.write(f"**Driver Version:** {gpu.driver}")
             except:
                 st.write("**GPU:** Information unavailable")
+        
+        render_session_history()
 
 
 if __name__ == "__main__":
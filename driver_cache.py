@@ -0,0 +1,187 @@
+"""
+Content-addressed extraction cache for driver archives.
+
+Every extracted folder carries a `.manifest.json` recording the archive's
+SHA-256 plus the CRC-32 and size of each member from the ZIP central
+directory. Re-running an extraction compares the archive against that
+manifest and only rewrites members whose CRC or size changed (and deletes
+members the new archive dropped), so an unchanged fleet re-run costs one
+stat() per archive and a replaced archive costs only its changed files.
+
+The `.installed` marker now stores the SHA-256 of the archive that was
+installed, so a replaced ZIP with the same name is reinstalled instead of
+being skipped.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = ".manifest.json"
+MARKER_NAME = ".installed"
+HASH_CHUNK = 1024 * 1024
+COPY_BUFFER = 1024 * 1024
+
+
+@dataclass
+class SyncResult:
+    """What sync_archive did to bring one folder up to date."""
+    archive: str
+    sha256: str
+    extracted: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.extracted or self.removed)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_crc32(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def load_manifest(extract_path: Path) -> Optional[dict]:
+    try:
+        with open(Path(extract_path) / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(extract_path: Path, manifest: dict):
+    path = Path(extract_path) / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def archive_digest(zip_path: Path, manifest: Optional[dict] = None) -> str:
+    """SHA-256 of the archive, reusing the manifest's hash when size and mtime match."""
+    st = Path(zip_path).stat()
+    if manifest and manifest.get("size") == st.st_size and manifest.get("mtime_ns") == st.st_mtime_ns:
+        return manifest["sha256"]
+    return file_sha256(zip_path)
+
+
+def is_current(zip_path: Path, extract_path: Path) -> bool:
+    """True when extract_path already holds exactly this archive's contents."""
+    manifest = load_manifest(extract_path)
+    if manifest is None or not Path(zip_path).is_file():
+        return False
+    return archive_digest(zip_path, manifest) == manifest.get("sha256")
+
+
+def _member_target(extract_path: Path, name: str) -> Path:
+    """Destination for an archive member, refusing paths that escape extract_path."""
+    root = Path(extract_path).resolve()
+    target = (root / name).resolve()
+    if root not in target.parents and target != root:
+        raise ValueError(f"Unsafe path in archive: {name}")
+    return target
+
+
+def _member_matches(target: Path, entry: Optional[dict], info: zipfile.ZipInfo) -> bool:
+    """Whether the file on disk already holds this member's contents."""
+    if not target.is_file() or target.stat().st_size != info.file_size:
+        return False
+    if entry is not None:
+        return entry.get("crc") == info.CRC and entry.get("size") == info.file_size
+    # No manifest entry (first run over an old extraction): check the file itself
+    return file_crc32(target) == info.CRC
+
+
+def sync_archive(zip_path: Path, extract_path: Path) -> SyncResult:
+    """Bring extract_path in line with zip_path, rewriting only changed members.
+
+    Raises zipfile.BadZipFile for corrupt archives and ValueError for members
+    that would escape extract_path. The manifest is written last, so an
+    interrupted sync is simply finished by the next run.
+    """
+    zip_path, extract_path = Path(zip_path), Path(extract_path)
+    manifest = load_manifest(extract_path)
+    sha256 = archive_digest(zip_path, manifest)
+    result = SyncResult(archive=zip_path.name, sha256=sha256)
+    if manifest and manifest.get("sha256") == sha256:
+        return result
+
+    old_members: Dict[str, dict] = (manifest or {}).get("members", {})
+    members: Dict[str, dict] = {}
+    extract_path.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            target = _member_target(extract_path, info.filename)
+            if info.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            members[info.filename] = {"crc": info.CRC, "size": info.file_size}
+            if _member_matches(target, old_members.get(info.filename), info):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            part = target.with_name(target.name + ".part")
+            with archive.open(info) as src, open(part, "wb") as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFFER)
+            os.replace(part, target)
+            result.extracted.append(info.filename)
+
+    for name in old_members.keys() - members.keys():
+        target = _member_target(extract_path, name)
+        if target.is_file():
+            target.unlink()
+        result.removed.append(name)
+
+    st = zip_path.stat()
+    _write_manifest(extract_path, {
+        "archive": zip_path.name,
+        "sha256": sha256,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "members": members,
+    })
+    logging.info("Synced %s: %d member(s) extracted, %d removed",
+                 zip_path.name, len(result.extracted), len(result.removed))
+    return result
+
+
+def installed_digest(extract_path: Path) -> Optional[str]:
+    """SHA-256 recorded in the .installed marker, "" for a legacy marker, None if absent."""
+    try:
+        content = (Path(extract_path) / MARKER_NAME).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return content if len(content) == 64 else ""
+
+
+def is_installed(zip_path: Path, extract_path: Path) -> bool:
+    """Whether this exact archive was installed from extract_path."""
+    recorded = installed_digest(extract_path)
+    if recorded is None:
+        return False
+    if recorded == "":
+        # Marker from before hashes were recorded; trust it as the old code did
+        logging.info("Legacy install marker for %s; use --force to reinstall", Path(zip_path).name)
+        return True
+    return recorded == archive_digest(zip_path, load_manifest(extract_path))
+
+
+def mark_installed(extract_path: Path, sha256: str):
+    (Path(extract_path) / MARKER_NAME).write_text(sha256 + "\n", encoding="utf-8")
@@ -2,6 +2,8 @@ import logging
 import zipfile
 from pathlib import Path
 
+from driver_cache import sync_archive
+
 DRIVER_FOLDER = Path(__file__).parent / "drivers"
 LOG_FILE = Path(__file__).parent / "driver_management.log"
 
@@ -23,27 +25,25 @@ def list_driver_zips():
     return list(DRIVER_FOLDER.glob("*.zip"))
 
 
-def is_already_extracted(marker_file):
-    """Check if a driver ZIP file is already extracted."""
-    return marker_file.exists()
-
-
 def extract_driver_zip(zip_path):
-    """Extract a driver ZIP file to a subdirectory."""
+    """Extract a driver ZIP file to a subdirectory, rewriting only changed members."""
+    zip_path = Path(zip_path)
     extract_path = DRIVER_FOLDER / f"{zip_path.stem}_extracted"
-    marker_file = extract_path / ".installed"
-
-    if is_already_extracted(marker_file):
-        logging.info("Skipping already extracted: %s", zip_path.name)
-        return
 
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_path)
-        marker_file.touch()
-        logging.info("Extracted: %s to %s", zip_path.name, extract_path)
+        result = sync_archive(zip_path, extract_path)
     except zipfile.BadZipFile:
         logging.error("Failed to extract (corrupted): %s", zip_path.name)
+        return
+    except (OSError, ValueError) as e:
+        logging.error("Failed to extract %s: %s", zip_path.name, e)
+        return
+
+    if result.changed:
+        logging.info("Extracted: %s to %s (%d changed, %d removed)", zip_path.name,
+                     extract_path, len(result.extracted), len(result.removed))
+    else:
+        logging.info("Skipping already extracted: %s", zip_path.name)
 
 
 def extract_all_drivers():
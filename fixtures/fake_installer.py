@@ -0,0 +1,31 @@
+"""Stand-in for a vendor setup.exe in installer tests.
+
+    fake_installer.py [--exit-code N] [--lines N] [--sleep S] [--hang] [--busy S]
+
+--hang sleeps silently without using CPU (a setup waiting on a hidden
+dialog); --busy spins the CPU silently (a slow but healthy setup).
+"""
+
+import argparse
+import sys
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--exit-code", type=int, default=0)
+parser.add_argument("--lines", type=int, default=3)
+parser.add_argument("--sleep", type=float, default=0.0)
+parser.add_argument("--hang", action="store_true")
+parser.add_argument("--busy", type=float, default=0.0)
+args, silent = parser.parse_known_args()
+
+print(f"fake installer starting, switches: {' '.join(silent)}", flush=True)
+for i in range(args.lines):
+    print(f"installing component {i}", flush=True)
+print("warning: fake warning", file=sys.stderr, flush=True)
+time.sleep(args.sleep)
+end = time.monotonic() + args.busy
+while time.monotonic() < end:
+    pass
+while args.hang:
+    time.sleep(1)
+sys.exit(args.exit_code)
@@ -1,19 +1,31 @@
 import tkinter as tk
 from tkinter import scrolledtext
-import subprocess
+
+from cs2tune.process_runner import TkStreamer, start
+
+current = None
+
 
 def run_install():
+    global current
     output_text.delete(1.0, tk.END)
-    proc = subprocess.Popen(
-        ["pro-drivers", "--list"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-    )
-    for line in proc.stdout:
-        output_text.insert(tk.END, line)
+    btn_run.config(state=tk.DISABLED)
+    btn_cancel.config(state=tk.NORMAL)
+    current = start(["pro-drivers", "--list"])
+    TkStreamer(output_text, current, on_done=finished)
+
+
+def finished(returncode):
+    btn_run.config(state=tk.NORMAL)
+    btn_cancel.config(state=tk.DISABLED)
+    if returncode is not None:
+        output_text.insert(tk.END, f"\n[exit status {returncode}]\n")
         output_text.see(tk.END)
-    proc.wait()
+
+
+def cancel_install():
+    if current is not None:
+        current.cancel()
 
 root = tk.Tk()
 root.title("MSI Driver Installer GUI")
@@ -21,6 +33,9 @@ root.title("MSI Driver Installer GUI")
 btn_run = tk.Button(root, text="List Drivers", command=run_install)
 btn_run.pack(pady=10)
 
+btn_cancel = tk.Button(root, text="Cancel", command=cancel_install, state=tk.DISABLED)
+btn_cancel.pack()
+
 output_text = scrolledtext.ScrolledText(root, width=80, height=20)
 output_text.pack()
 
@@ -0,0 +1,189 @@
+"""
+Write-ahead install journal for pro_drivers_app.
+
+Every phase of a driver install is appended to a JSON-lines file and fsynced
+before the step it describes goes ahead:
+
+    {"event": "session", "session": 2, "ts": ...}
+    {"event": "extracted", "pkg": "06_...zip", "sha256": "...", "installers": ["setup.exe"]}
+    {"event": "installer_started", "pkg": "06_...zip", "index": 0, "path": "setup.exe"}
+    {"event": "installer_finished", "pkg": "06_...zip", "index": 0, "status": "installed"}
+    {"event": "status", "pkg": "06_...zip", "status": "installed", "duration": 412.3}
+    {"event": "reboot_pending", "pkg": "06_...zip"}
+    {"event": "run_finished"}
+
+Replaying the file after a reboot gives the state of the run so far, so the
+next invocation goes straight to the next pending installer without stat'ing
+markers or walking extracted trees, and the final table covers every boot of
+the run. Each process start is a new "session". Finishing a run compacts
+the file down to the measured durations used for time estimates.
+
+Statuses from an earlier session only stand while they still describe the
+archive on disk; the caller drops stale ones with forget(), and `fresh=True`
+discards the unfinished run altogether.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass
+class PackageState:
+    """Everything the journal knows about one package in the current run."""
+    status: Optional[str] = None
+    duration: Optional[float] = None
+    session: Optional[int] = None
+    sha256: Optional[str] = None
+    installers: Optional[List[str]] = None
+    finished: Dict[int, str] = field(default_factory=dict)
+    reboot_pending: bool = False
+
+
+class InstallJournal:
+    """Append-only, fsynced record of an install run; `path=None` keeps it in memory.
+
+    `fresh=True` starts a new run even if the file holds an unfinished one,
+    keeping only its measured durations.
+    """
+
+    def __init__(self, path: Optional[Path] = None, fresh: bool = False):
+        self.path = Path(path) if path else None
+        self.packages: Dict[str, PackageState] = {}
+        self.durations: Dict[str, float] = {}
+        self.session = 0
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path and self.path.is_file():
+            self._replay()
+            if fresh:
+                self._compact()
+                self.packages = {}
+                self.session = 0
+        self.session += 1
+        if self.path:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._append({"event": "session", "session": self.session})
+
+    def _replay(self):
+        good_end = 0
+        with open(self.path, "rb") as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if entry is None or not line.endswith(b"\n"):
+                    # A torn final write from a crash or power loss: drop it so
+                    # new entries do not get appended onto the broken line
+                    logging.warning(f"Truncating unreadable journal line {number} in {self.path}")
+                    break
+                self._apply(entry)
+                good_end += len(line)
+        if good_end != self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(good_end)
+
+    def _apply(self, entry: dict):
+        event = entry.get("event")
+        if event == "session":
+            self.session = entry["session"]
+            for state in self.packages.values():
+                state.reboot_pending = False
+            return
+        if event == "durations":
+            self.durations.update(entry["durations"])
+            return
+        if event == "run_finished":
+            self.packages = {}
+            self.session = 0
+            return
+        if event == "forgotten":
+            self.packages.pop(entry["pkg"], None)
+            return
+        state = self.packages.setdefault(entry["pkg"], PackageState())
+        if event == "extracted":
+            state.sha256 = entry.get("sha256")
+            state.installers = entry["installers"]
+            state.finished = {}
+        elif event == "installer_finished":
+            state.finished[entry["index"]] = entry["status"]
+        elif event == "status":
+            state.status = entry["status"]
+            state.duration = entry.get("duration")
+            state.session = entry.get("session")
+            if state.status == "installed" and state.duration is not None:
+                self.durations[entry["pkg"]] = state.duration
+        elif event == "reboot_pending":
+            state.reboot_pending = True
+
+    def _append(self, entry: dict):
+        entry = dict(entry, ts=round(time.time(), 3))
+        with self._lock:
+            self._apply(entry)
+            if self._file is not None:
+                self._file.write(json.dumps(entry) + "\n")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    @property
+    def results(self) -> Dict[str, str]:
+        return {name: s.status for name, s in self.packages.items() if s.status is not None}
+
+    def state(self, name: str) -> PackageState:
+        return self.packages.get(name, PackageState())
+
+    def extracted(self, name: str, sha256: Optional[str], installers: List[str]):
+        self._append({"event": "extracted", "pkg": name, "sha256": sha256, "installers": installers})
+
+    def installer_started(self, name: str, index: int, path: str):
+        self._append({"event": "installer_started", "pkg": name, "index": index, "path": path})
+
+    def installer_finished(self, name: str, index: int, status: str, **details):
+        self._append(dict(details, event="installer_finished", pkg=name, index=index, status=status))
+
+    def record(self, name: str, status: str, duration: Optional[float] = None):
+        """Final status of one package in this run."""
+        entry = {"event": "status", "pkg": name, "status": status, "session": self.session}
+        if duration is not None:
+            entry["duration"] = round(duration, 1)
+        self._append(entry)
+
+    def reboot_pending(self, name: str):
+        self._append({"event": "reboot_pending", "pkg": name})
+
+    def forget(self, name: str):
+        """Drop everything recorded for a package, so this run installs it again."""
+        self._append({"event": "forgotten", "pkg": name})
+
+    def _compact(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"event": "durations", "durations": self.durations}) + "\n")
+            f.write(json.dumps({"event": "run_finished", "ts": round(time.time(), 3)}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def finish(self):
+        """Close the run, compacting the file to the duration history.
+
+        The in-memory state is kept so the caller can still report on the run.
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._compact()
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
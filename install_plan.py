@@ -0,0 +1,234 @@
+"""
+Dependency-aware install scheduling for pro_drivers_app.
+
+The driver set is described as a DAG: each package lists the packages that
+must be installed first. The scheduler runs every package whose
+dependencies are satisfied on a small worker pool, with two extra rules:
+
+* packages that need a reboot afterwards are barriers - they only start when
+  nothing else is running or ready and run alone, so the reboot that follows
+  never interrupts another installer;
+* a failed package blocks everything that depends on it.
+
+Progress goes to an install_journal.InstallJournal, so a run interrupted by a
+reboot resumes where it stopped and the final table covers the whole run.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from install_journal import InstallJournal
+
+# Statuses that let dependents go ahead. "missing" never blocked the serial
+# installer either, so it keeps not blocking here; a package whose archive
+# holds no installer is a failure, since its dependents would install on
+# top of a driver that is not there.
+SATISFIED = {"installed", "reboot_required", "skipped", "missing"}
+DEFAULT_ESTIMATE = 60.0   # seconds per package without a recorded duration
+REBOOT_SECONDS = 150.0
+
+
+@dataclass
+class PlanNode:
+    name: str
+    deps: Set[str] = field(default_factory=set)
+    reboot: bool = False
+    estimate: float = DEFAULT_ESTIMATE
+
+
+class InstallPlan:
+    """Validated dependency graph over the packages in install order."""
+
+    def __init__(self, order: Iterable[str], depends_on: Dict[str, Iterable[str]],
+                 reboot_after: Iterable[str] = (), estimates: Optional[Dict[str, float]] = None):
+        self.order = list(order)
+        reboot_after = set(reboot_after)
+        estimates = estimates or {}
+        self.nodes = {
+            name: PlanNode(name, set(depends_on.get(name, ())), name in reboot_after,
+                           estimates.get(name, DEFAULT_ESTIMATE))
+            for name in self.order
+        }
+        for node in self.nodes.values():
+            unknown = node.deps - self.nodes.keys()
+            if unknown:
+                raise ValueError(f"{node.name} depends on unknown package(s): {sorted(unknown)}")
+        self.topological()  # raises on cycles
+
+    def rank(self, name: str) -> int:
+        return self.order.index(name)
+
+    def dependents(self, name: str) -> Set[str]:
+        """Every package that transitively depends on `name`."""
+        found: Set[str] = set()
+        frontier = [name]
+        while frontier:
+            current = frontier.pop()
+            for node in self.nodes.values():
+                if current in node.deps and node.name not in found:
+                    found.add(node.name)
+                    frontier.append(node.name)
+        return found
+
+    def topological(self) -> List[str]:
+        """Packages in dependency order, ties broken by install order."""
+        remaining = {name: set(node.deps) for name, node in self.nodes.items()}
+        result = []
+        while remaining:
+            ready = sorted((n for n, deps in remaining.items() if not deps), key=self.rank)
+            if not ready:
+                raise ValueError(f"Dependency cycle among: {sorted(remaining)}")
+            for name in ready:
+                result.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return result
+
+    def cost(self, name: str) -> float:
+        node = self.nodes[name]
+        return node.estimate + (REBOOT_SECONDS if node.reboot else 0.0)
+
+    def critical_path(self, pending: Optional[Set[str]] = None) -> Tuple[List[str], float]:
+        """Longest chain of pending packages by estimated time (incl. reboots)."""
+        pending = set(self.nodes) if pending is None else pending
+        best: Dict[str, Tuple[float, Optional[str]]] = {}
+        for name in self.topological():
+            if name not in pending:
+                continue
+            prev = max(((best[d][0], d) for d in self.nodes[name].deps if d in best), default=(0.0, None))
+            best[name] = (prev[0] + self.cost(name), prev[1])
+        if not best:
+            return [], 0.0
+        name = max(best, key=lambda n: best[n][0])
+        total = best[name][0]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = best[name][1]
+        return path[::-1], total
+
+    def ready(self, statuses: Dict[str, str], running: Set[str]) -> List[str]:
+        """Packages that may start now, in install order, applying the barrier rule."""
+        if any(self.nodes[n].reboot for n in running):
+            return []
+        candidates = [
+            name for name in self.order
+            if name not in statuses and name not in running
+            and all(statuses.get(d) in SATISFIED for d in self.nodes[name].deps)
+        ]
+        plain = [n for n in candidates if not self.nodes[n].reboot]
+        if plain:
+            return plain
+        if running or not candidates:
+            return []
+        return candidates[:1]
+
+    def simulate(self, workers: int, statuses: Optional[Dict[str, str]] = None) -> float:
+        """Estimated wall time for the pending packages with `workers` in parallel."""
+        statuses = dict(statuses or {})
+        running: Dict[str, float] = {}
+        clock = 0.0
+        while True:
+            for name in self.ready(statuses, set(running))[:max(1, workers) - len(running)]:
+                running[name] = clock + self.cost(name)
+            if not running:
+                return clock
+            name = min(running, key=running.get)
+            clock = running.pop(name)
+            statuses[name] = "installed"
+
+
+class InstallScheduler:
+    """Runs an InstallPlan with `workers` concurrent installers.
+
+    `run_one(name)` installs one package and returns its status.
+    `on_reboot(name)` is called on the scheduling thread after a reboot
+    barrier installs, or after any package reports reboot_required once the
+    installers still running have finished; it may reboot (and exit), and
+    returning True stops scheduling so the reboot can happen later.
+    Returns statuses in install order; packages not reached are absent.
+    """
+
+    def __init__(self, plan: InstallPlan, run_one: Callable[[str], str], workers: int = 2,
+                 journal: Optional[InstallJournal] = None,
+                 on_reboot: Optional[Callable[[str], bool]] = None):
+        self.plan = plan
+        self.run_one = run_one
+        self.workers = max(1, workers)
+        self.journal = journal or InstallJournal()
+        self.on_reboot = on_reboot
+
+    def _timed(self, name: str):
+        started = time.monotonic()
+        return self.run_one(name), time.monotonic() - started
+
+    def _block_dependents(self, name: str, statuses: Dict[str, str]):
+        for dependent in self.plan.dependents(name):
+            if dependent not in statuses:
+                logging.warning(f"Blocked: {dependent} (depends on failed {name})")
+                statuses[dependent] = "blocked"
+                self.journal.record(dependent, "blocked")
+
+    def run(self) -> Dict[str, str]:
+        statuses = {n: s for n, s in self.journal.results.items()
+                    if n in self.plan.nodes and s in SATISFIED}
+        if statuses:
+            logging.info(f"Resuming install plan: {len(statuses)} package(s) already done")
+        stopped = False
+        reboot_for = None
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="install") as pool:
+            running = {}
+            while True:
+                if reboot_for is not None and not running:
+                    stopped = bool(self.on_reboot(reboot_for))
+                    reboot_for = None
+                if not stopped and reboot_for is None:
+                    for name in self.plan.ready(statuses, set(running.values()))[:self.workers - len(running)]:
+                        running[pool.submit(self._timed, name)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        status, duration = future.result()
+                    except Exception as e:
+                        logging.error(f"Install of {name} raised: {e}")
+                        status, duration = "failed", None
+                    statuses[name] = status
+                    self.journal.record(name, status, duration)
+                    if status not in SATISFIED:
+                        self._block_dependents(name, statuses)
+                    elif self.on_reboot and (
+                            status == "reboot_required"
+                            or (self.plan.nodes[name].reboot and status == "installed")):
+                        # Let running installers finish, start nothing new, then reboot
+                        reboot_for = reboot_for or name
+        if all(statuses.get(name) in SATISFIED for name in self.plan.order):
+            self.journal.finish()
+        return {name: statuses[name] for name in self.plan.order if name in statuses}
+
+
+def format_plan(plan: InstallPlan, workers: int, statuses: Optional[Dict[str, str]] = None) -> str:
+    """Dry-run description: dependency order, critical path and estimated time."""
+    statuses = statuses or {}
+    pending = {n for n in plan.nodes if statuses.get(n) not in SATISFIED}
+    path, path_seconds = plan.critical_path(pending)
+    total = plan.simulate(workers, {n: s for n, s in statuses.items() if s in SATISFIED})
+    serial = sum(plan.cost(n) for n in pending)
+    lines = ["Install plan (dependencies → package):"]
+    for name in plan.topological():
+        node = plan.nodes[name]
+        deps = ", ".join(sorted(node.deps, key=plan.rank)) or "-"
+        flags = " [reboot]" if node.reboot else ""
+        done = " (done)" if name not in pending else ""
+        lines.append(f"  {deps} → {name}{flags}{done}  ~{node.estimate / 60:.1f} min")
+    lines.append("Critical path: " + (" → ".join(path) or "-"))
+    lines.append(f"Critical path time: ~{path_seconds / 60:.1f} min")
+    lines.append(f"Estimated time with {workers} worker(s): ~{total / 60:.1f} min "
+                 f"(serial: ~{serial / 60:.1f} min)")
+    return "\n".join(lines)
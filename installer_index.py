@@ -0,0 +1,139 @@
+"""
+Installer discovery for extracted driver packages.
+
+Candidates come from the archive's member list (the ZIP central directory,
+already recorded in the driver_cache manifest), so picking an entry point
+never walks the extracted tree. Each candidate is scored by a small rule
+set - vendor entry-point names, shallow depth, known helper binaries to
+avoid - and only the best one is run, instead of every .exe/.bat in the
+package. When nothing looks like an entry point, the best candidate that is
+not a known helper is run, so an oddly named installer still gets installed.
+"""
+
+import re
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Sequence
+
+INSTALLER_SUFFIXES = {".exe", ".bat"}
+
+
+@dataclass(frozen=True)
+class VendorRules:
+    """How to find and silently run one vendor's installers."""
+    name: str
+    entry_points: Sequence[str] = ()        # preferred file names, best first
+    silent_args: Sequence[str] = ()
+    avoid: Sequence[str] = ()               # extra regexes for helper binaries
+
+
+# Matched against the archive name, first hit wins
+VENDORS = [
+    (re.compile(r"nvidia", re.I), VendorRules(
+        "nvidia", ("setup.exe",), ("-s", "-noreboot", "-noeula"),
+        (r"^(display\.|physx|hdaudio|nvapp|nvcontainer|gfexperience)",))),
+    (re.compile(r"intel", re.I), VendorRules(
+        "intel", ("setupchipset.exe", "setupme.exe", "installer.exe", "setup.exe", "install.exe"),
+        ("-s", "-norestart"))),
+    (re.compile(r"realtek|nahimic", re.I), VendorRules(
+        "realtek", ("setup.exe", "install.exe"), ("-s",))),
+    (re.compile(r"msi|scm|camera|hid", re.I), VendorRules(
+        "msi", ("setup.exe", "install.exe", "install.bat"),
+        ("/VERYSILENT", "/SUPPRESSMSGBOXES", "/NORESTART"))),
+]
+DEFAULT_VENDOR = VendorRules("generic", ("setup.exe", "install.exe", "installer.exe", "install.bat"))
+
+# Binaries that ship inside driver packages but are never the entry point
+HELPERS = re.compile(
+    r"(uninst|unins\d+|vc_?redist|vcredist|dotnet|ndp\d|dxsetup|directx|7z|"
+    r"crashreport|dpinst\d*|devcon|pnputil)", re.I)
+# Names that are rarely the entry point, but may be the only installer there is
+UNLIKELY = re.compile(r"(report|helper|update|service|svc|elevate|launcher|tool)", re.I)
+
+# Explicit entry points for packages the rules get wrong: archive -> member
+ENTRY_POINT_OVERRIDES: Dict[str, str] = {}
+
+
+@dataclass
+class Candidate:
+    path: str
+    score: int
+    reasons: List[str] = field(default_factory=list)
+    helper: bool = False  # never run, not even as a fallback
+
+
+def vendor_for(zip_file: str) -> VendorRules:
+    for pattern, rules in VENDORS:
+        if pattern.search(zip_file):
+            return rules
+    return DEFAULT_VENDOR
+
+
+def score(path: str, rules: VendorRules) -> Candidate:
+    """Rank one member; higher is a more likely entry point."""
+    member = PurePosixPath(path)
+    name = member.name.lower()
+    depth = len(member.parts) - 1
+    candidate = Candidate(path, 0)
+
+    def add(points, reason):
+        candidate.score += points
+        candidate.reasons.append(f"{points:+d} {reason}")
+
+    if name in rules.entry_points:
+        add(100 - 10 * rules.entry_points.index(name), f"{rules.name} entry point")
+    elif name in DEFAULT_VENDOR.entry_points:
+        add(50, "generic entry point")
+    if member.suffix.lower() == ".exe":
+        add(10, "executable")
+    add(-15 * depth, f"depth {depth}")
+    stem = member.stem.lower()
+    if name not in rules.entry_points and HELPERS.search(stem):
+        add(-80, "helper binary")
+        candidate.helper = True
+    elif name not in rules.entry_points and UNLIKELY.search(stem):
+        add(-80, "unlikely entry point")
+    if any(re.search(pattern, part, re.I) for pattern in rules.avoid for part in member.parts[:-1]):
+        add(-80, f"{rules.name} component folder")
+        candidate.helper = True
+    return candidate
+
+
+def rank(zip_file: str, members: Iterable[str]) -> List[Candidate]:
+    """Every installer-like member, best first."""
+    rules = vendor_for(zip_file)
+    candidates = [
+        score(m, rules) for m in members
+        if not m.endswith("/") and PurePosixPath(m).suffix.lower() in INSTALLER_SUFFIXES
+    ]
+    return sorted(candidates, key=lambda c: (-c.score, len(c.path), c.path))
+
+
+def select(zip_file: str, members: Iterable[str]) -> List[str]:
+    """Member path(s) to run for this package: the override, else the top-ranked one.
+
+    If no candidate scores above 0, the best-ranked one that is not a helper
+    binary is used; only a package of nothing but helpers has no installer.
+    """
+    members = list(members)
+    override = ENTRY_POINT_OVERRIDES.get(zip_file)
+    if override:
+        return [override] if override in members else []
+    ranked = rank(zip_file, members)
+    if ranked and ranked[0].score > 0:
+        return [ranked[0].path]
+    fallback = [c for c in ranked if not c.helper]
+    return [fallback[0].path] if fallback else []
+
+
+def archive_members(zip_path: Path, manifest: Optional[dict] = None) -> List[str]:
+    """Member names from the driver_cache manifest, or straight from the central directory."""
+    if manifest and "members" in manifest:
+        return list(manifest["members"])
+    with zipfile.ZipFile(zip_path) as archive:
+        return archive.namelist()
+
+
+def silent_args(zip_file: str) -> List[str]:
+    return list(vendor_for(zip_file).silent_args)
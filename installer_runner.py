@@ -0,0 +1,179 @@
+"""
+Unattended installer execution for pro_drivers_app.
+
+Each package runs under an ExecutionProfile: silent switches, which exit
+codes mean success or "reboot required" (3010/1641 from Windows Installer
+based setups), a wall-clock timeout and a hang watchdog. stdout/stderr are
+drained by reader threads into a per-installer log file while the main
+thread watches the process, so a setup stuck on a hidden dialog is killed
+instead of blocking the whole run.
+
+The watchdog treats an installer as hung when it has produced no output and
+neither its process tree nor the Windows Installer service has used CPU time
+for `hang_timeout` seconds. The service counts because MSI based setups
+(and `msiexec /i` itself) hand the actual install to msiexec.exe processes
+that are not their children. CPU time needs psutil; without it only the
+wall-clock timeout applies, since silent installers legitimately print
+nothing.
+"""
+
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    import psutil
+except ImportError:  # the installer may run before Python packages are set up
+    psutil = None
+
+POLL_INTERVAL = 0.5
+# Processes that do an installer's work outside its own process tree
+INSTALLER_SERVICES = {"msiexec.exe", "msiexec"}
+
+
+@dataclass(frozen=True)
+class ExecutionProfile:
+    """How to run and judge one package's installer."""
+    silent_args: Tuple[str, ...] = ()
+    success_codes: FrozenSet[int] = frozenset({0})
+    reboot_codes: FrozenSet[int] = frozenset({3010, 1641})
+    timeout: float = 1800.0
+    hang_timeout: float = 600.0
+
+
+@dataclass
+class InstallerResult:
+    command: List[str]
+    status: str                 # installed | reboot_required | failed | timeout | hung
+    returncode: Optional[int] = None
+    duration: float = 0.0
+    log_path: Optional[Path] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("installed", "reboot_required")
+
+
+def log_name(zip_file: str, index: int, installer: Path) -> str:
+    stem = re.sub(r"[^\w.-]+", "_", f"{Path(zip_file).stem}_{index}_{installer.name}")
+    return f"{stem}.log"
+
+
+def _pump(stream, log, label, lock, activity):
+    for line in iter(stream.readline, b""):
+        with lock:
+            log.write(f"[{label}] ".encode() + line)
+            log.flush()
+        activity[0] = time.monotonic()
+    stream.close()
+
+
+def _service_processes(exclude) -> list:
+    """Running INSTALLER_SERVICES processes whose PIDs are not in `exclude`."""
+    found = []
+    for proc in psutil.process_iter(["name"]):
+        if proc.pid not in exclude and (proc.info.get("name") or "").lower() in INSTALLER_SERVICES:
+            found.append(proc)
+    return found
+
+
+def _tree_cpu_time(process) -> Optional[float]:
+    """CPU seconds of the installer's process tree plus the Windows Installer service."""
+    if psutil is None:
+        return None
+    try:
+        parent = psutil.Process(process.pid)
+        total = sum(parent.cpu_times()[:2])
+        children = parent.children(recursive=True)
+    except psutil.Error:
+        return None
+    pids = {parent.pid} | {child.pid for child in children}
+    for proc in children + _service_processes(pids):
+        try:
+            total += sum(proc.cpu_times()[:2])
+        except psutil.Error:
+            pass
+    return total
+
+
+def _kill_tree(process):
+    if psutil is not None:
+        try:
+            parent = psutil.Process(process.pid)
+            for child in parent.children(recursive=True):
+                child.kill()
+        except psutil.Error:
+            pass
+    process.kill()
+
+
+def run_installer(command: Sequence[str], profile: ExecutionProfile = ExecutionProfile(),
+                  log_path: Optional[Path] = None, cwd: Optional[Path] = None) -> InstallerResult:
+    """Run one installer command under `profile`, logging its output to `log_path`."""
+    command = [str(part) for part in command]
+    result = InstallerResult(command=command, status="failed", log_path=log_path)
+    if log_path is not None:
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+    log = open(log_path, "wb") if log_path is not None else open(os.devnull, "wb")
+    started = time.monotonic()
+    try:
+        log.write(f"$ {subprocess.list2cmdline(command)}\n".encode())
+        try:
+            process = subprocess.Popen(command, cwd=cwd, stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            result.error = str(e)
+            return result
+        lock = threading.Lock()
+        activity = [started]
+        readers = [
+            threading.Thread(target=_pump, args=(process.stdout, log, "out", lock, activity), daemon=True),
+            threading.Thread(target=_pump, args=(process.stderr, log, "err", lock, activity), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        last_cpu = _tree_cpu_time(process)
+        while process.poll() is None:
+            time.sleep(POLL_INTERVAL)
+            now = time.monotonic()
+            cpu = _tree_cpu_time(process)
+            if cpu is not None and last_cpu is not None and cpu > last_cpu:
+                activity[0] = now
+            last_cpu = cpu
+            if now - started > profile.timeout:
+                result.status = "timeout"
+            elif cpu is not None and now - activity[0] > profile.hang_timeout:
+                result.status = "hung"
+            else:
+                continue
+            result.error = f"{result.status} after {now - started:.0f}s"
+            logging.error(f"Installer {result.status}, killing: {command[0]}")
+            _kill_tree(process)
+            process.wait()
+            break
+        for reader in readers:
+            reader.join(timeout=5)
+
+        result.returncode = process.returncode
+        if result.status not in ("timeout", "hung"):
+            if process.returncode in profile.success_codes:
+                result.status = "installed"
+            elif process.returncode in profile.reboot_codes:
+                result.status = "reboot_required"
+            else:
+                result.status = "failed"
+                result.error = f"exit code {process.returncode}"
+        return result
+    finally:
+        result.duration = time.monotonic() - started
+        with_code = f" (exit {result.returncode})" if result.returncode is not None else ""
+        log.write(f"\n# {result.status}{with_code} in {result.duration:.1f}s\n".encode())
+        log.close()
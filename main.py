@@ -9,6 +9,7 @@ from pipelines import (
 )
 from paths import LOG_FILE
 from drivers import list_driver_zips, extract_driver_zip
+from perftest_history import compare_perftest, REGRESSION_THRESHOLD_PCT
 
 
 def setup_logging():
@@ -38,6 +39,23 @@ def parse_arguments():
     parser.add_argument(
         "--run-perftest", action="store_true", help="Run performance tests"
     )
+    parser.add_argument(
+        "--compare-perftest", action="store_true",
+        help="Compare the latest stored perftest run against the previous "
+             "driver/profile/hardware combination"
+    )
+    parser.add_argument(
+        "--baseline-run", type=int, metavar="RUN_ID",
+        help="Stored perftest run to compare against (default: automatic)"
+    )
+    parser.add_argument(
+        "--candidate-run", type=int, metavar="RUN_ID",
+        help="Stored perftest run to compare (default: latest)"
+    )
+    parser.add_argument(
+        "--regression-threshold", type=float, default=REGRESSION_THRESHOLD_PCT,
+        metavar="PCT", help="Frame-time increase (%%) flagged as a regression"
+    )
     parser.add_argument(
         "--launch-dashboard",
         action="store_true",
@@ -64,6 +82,8 @@ def execute_arguments(args):
         verify_drivers()
     if args.run_perftest:
         run_performance_test()
+    if args.compare_perftest:
+        compare_perftest(args.baseline_run, args.candidate_run, args.regression_threshold)
     if args.launch_dashboard:
         launch_dashboard()
     if args.run_docker:
@@ -2,15 +2,52 @@ import { io } from "socket.io-client";
 import { Chart, LineController, LineElement, PointElement, LinearScale, Title, CategoryScale } from 'chart.js';
 Chart.register(LineController, LineElement, PointElement, LinearScale, Title, CategoryScale);
 
-const socket = io("http://localhost:8000");
+// Binary frame schema, mirrors cs2tune/telemetry_codec.py
+const SCHEMA_VERSION = 2;
+const SCHEMA_FIELDS = ["fps", "temp", "load", "vram", "p1_low"];
+const HEADER_SIZE = 16;
+const FIELD_SIZE = 12;
+
+function decodeFrame(buffer) {
+  const view = new DataView(buffer);
+  const version = view.getUint8(0);
+  if (version !== SCHEMA_VERSION) {
+    throw new Error(`Unsupported telemetry schema version ${version}`);
+  }
+  const mask = view.getUint8(1);
+  const frame = {
+    samples: view.getUint16(2, true),
+    seq: view.getUint32(4, true),
+    timestamp: view.getFloat64(8, true),
+    min: {},
+    max: {}
+  };
+  let offset = HEADER_SIZE;
+  SCHEMA_FIELDS.forEach((field, bit) => {
+    if (!(mask & (1 << bit))) return;
+    frame[field] = view.getFloat32(offset, true);
+    frame.min[field] = view.getFloat32(offset + 4, true);
+    frame.max[field] = view.getFloat32(offset + 8, true);
+    offset += FIELD_SIZE;
+  });
+  return frame;
+}
+
+// Subscribe at the overlay's own rate; the server decimates per client.
+// Append ?json to the overlay URL to get readable JSON frames for debugging.
+const encoding = new URLSearchParams(window.location.search).has("json") ? "json" : "binary";
+const socket = io("http://localhost:8000", {
+  auth: { rate: 30, fields: SCHEMA_FIELDS, encoding }
+});
 
 // FPS chart
+const HISTORY = 30;
 const ctx = document.getElementById("fpsChart").getContext("2d");
 const fpsData = {
-  labels: Array(30).fill(""),
+  labels: Array(HISTORY).fill(""),
   datasets: [{
     label: "FPS",
-    data: Array(30).fill(0),
+    data: Array(HISTORY).fill(0),
     borderColor: "#00ff88",
     tension: 0.3
   }]
@@ -34,16 +71,59 @@ const chart = new Chart(ctx, {
 const tempEl = document.getElementById("temp");
 const gpuEl = document.getElementById("gpu");
 const vramEl = document.getElementById("vram");
+const lowsEl = document.getElementById("lows");
+
+// Incoming frames land in a typed-array ring; the canvas and text are
+// redrawn at most once per animation frame, however fast frames arrive.
+const fpsRing = new Float32Array(HISTORY);
+let ringHead = 0;
+let fpsDirty = false;
+let latest = null;
+let shown = { temp: "", load: "", vram: "", lows: "" };
+let paintScheduled = false;
+
+function paint() {
+  paintScheduled = false;
+
+  if (fpsDirty) {
+    const series = fpsData.datasets[0].data;
+    for (let i = 0; i < HISTORY; i++) {
+      series[i] = fpsRing[(ringHead + i) % HISTORY];
+    }
+    chart.update("none");
+    fpsDirty = false;
+  }
+
+  // Only touch the DOM when the rendered text actually changed
+  if (latest) {
+    const text = {
+      temp: latest.temp === undefined ? shown.temp : `GPU Temp: ${latest.temp.toFixed(1)} °C`,
+      load: latest.load === undefined ? shown.load : `GPU Load: ${Math.round(latest.load)}%`,
+      vram: latest.vram === undefined ? shown.vram : `VRAM Used: ${latest.vram.toFixed(2)} GB`,
+      lows: latest.p1_low === undefined ? shown.lows : `1% Low: ${Math.round(latest.p1_low)} FPS`
+    };
+    if (text.temp !== shown.temp) tempEl.textContent = text.temp;
+    if (text.load !== shown.load) gpuEl.textContent = text.load;
+    if (text.vram !== shown.vram) vramEl.textContent = text.vram;
+    if (text.lows !== shown.lows) lowsEl.textContent = text.lows;
+    shown = text;
+    latest = null;
+  }
+}
 
 // Update from server
-socket.on("telemetry", (data) => {
-  // FPS chart
-  fpsData.datasets[0].data.push(data.fps);
-  fpsData.datasets[0].data.shift();
-  chart.update();
-
-  // Stats
-  tempEl.textContent = `GPU Temp: ${data.temp} °C`;
-  gpuEl.textContent = `GPU Load: ${data.load}%`;
-  vramEl.textContent = `VRAM Used: ${data.vram} GB`;
+socket.on("telemetry", (message) => {
+  const data = message instanceof ArrayBuffer ? decodeFrame(message) : message;
+
+  if (data.fps !== undefined) {
+    fpsRing[ringHead] = data.fps;
+    ringHead = (ringHead + 1) % HISTORY;
+    fpsDirty = true;
+  }
+  latest = data;
+
+  if (!paintScheduled) {
+    paintScheduled = true;
+    requestAnimationFrame(paint);
+  }
 });
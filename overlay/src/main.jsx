@@ -5,7 +5,9 @@ const tempEl = document.getElementById("gpu_temp");
 const loadEl = document.getElementById("gpu_load");
 const vramEl = document.getElementById("vram");
 
-const socket = io("http://localhost:8502");
+const socket = io("http://localhost:8502", {
+  auth: { rate: 30, fields: ["fps", "gpu_temp", "gpu_load", "vram_used"] }
+});
 
 socket.on("telemetry", (data) => {
   fpsEl.textContent = data.fps;
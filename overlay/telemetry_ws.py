@@ -1,23 +1,40 @@
 import asyncio
 import socketio
 from telemetry_pipeline import get_live_telemetry
+from cs2tune.telemetry_fanout import TelemetryFanout, parse_subscription
+
+OVERLAY_FIELDS = ("fps", "gpu_temp", "gpu_load", "vram_used")
+DEFAULT_RATE = 30  # Hz for overlays that connect without subscribing
 
 sio = socketio.AsyncServer(cors_allowed_origins='*')
 app = socketio.ASGIApp(sio)
+fanout = TelemetryFanout(OVERLAY_FIELDS, default_rate=DEFAULT_RATE)
 
 @sio.event
-async def connect(sid, environ):
+async def connect(sid, environ, auth=None):
+    rate, fields, _ = parse_subscription(auth)
+    fanout.subscribe(sid, rate, fields)
     print(f"Client connected: {sid}")
 
+@sio.event
+async def subscribe(sid, options):
+    rate, fields, _ = parse_subscription(options)
+    sub = fanout.subscribe(sid, rate, fields)
+    return {"rate": sub.rate, "fields": list(sub.fields)}
+
 @sio.event
 async def disconnect(sid):
+    fanout.unsubscribe(sid)
     print(f"Client disconnected: {sid}")
 
 async def telemetry_loop():
     while True:
-        data = get_live_telemetry()  # {'fps': 122, 'gpu_temp': 72, ...}
-        await sio.emit('telemetry', data)
-        await asyncio.sleep(1 / 30)
+        # Sample once at the fastest subscriber's rate, decimate per client
+        if fanout.subscribers:
+            fanout.push(get_live_telemetry())  # {'fps': 122, 'gpu_temp': 72, ...}
+            for sid, _, data in fanout.due():
+                await sio.emit('telemetry', data, to=sid)
+        await asyncio.sleep(1 / fanout.sample_rate)
 
 if __name__ == '__main__':
     import uvicorn
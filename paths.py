@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Define all paths used in the project
@@ -8,3 +9,14 @@ VERIFY_SCRIPT = Path(SCRIPT_DIR / "msi_drivers" / "verify_drivers.ps1")
 PERFTEST_CFG = Path(SCRIPT_DIR / "perftest.cfg")
 DASHBOARD_SCRIPT = Path(SCRIPT_DIR / "dashboard.py")
 DOCKER_COMPOSE_FILE = Path(SCRIPT_DIR / "docker-compose.yml")
+
+# CS2 install locations (override with environment variables)
+CS2_GAME_DIR = Path(os.environ.get(
+    "CS2_GAME_DIR",
+    Path.home() / "steamapps/common/Counter-Strike Global Offensive/game/csgo"
+))
+CS2_CFG_DIR = Path(os.environ.get("CSGO_CFG_DIR", CS2_GAME_DIR / "cfg"))
+CS2_CONSOLE_LOG = Path(os.environ.get("CS2_CONSOLE_LOG", CS2_GAME_DIR / "console.log"))
+PERFTEST_RESULTS_DIR = Path(os.environ.get("CS2_PERFTEST_DIR", CS2_GAME_DIR))
+PERFTEST_REPORT = Path(SCRIPT_DIR / "perftest_report.json")
+PERFTEST_DB = Path(SCRIPT_DIR / "perftest_history.db")
@@ -0,0 +1,201 @@
+"""
+Parse the output of a CS2 perftest run into a report.
+
+perftest.cfg runs each scenario with stats_print_gpu writing a
+perftest_<scenario>.csv, while cl_printfps logs the FPS to console.log.
+build_report() combines both and calls each scenario CPU- or GPU-bound.
+"""
+
+import csv
+import json
+import logging
+import re
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+
+from cs2tune.fps_ingest import parse_fps_line
+
+# stats_print_gpu output files written by perftest.cfg, in run order
+SCENARIOS = [
+    ("usersettings", "User settings measurement"),
+    ("halfresolution", "Half resolution"),
+    ("s1_settings", "Reduced Settings (similar to Source1)"),
+    ("uionly", "UI only"),
+    ("gameonly", "Game only"),
+]
+BASELINE = "usersettings"
+CSV_PATTERN = "perftest_{}.csv"
+OUTPUT_START = "perftest output starts here."
+OUTPUT_END = "perftest output ends here."
+
+# GPU time within this fraction of the frame time means the GPU is the limit
+GPU_BOUND_RATIO = 0.9
+# Halving the resolution must gain at least this much FPS to call a run GPU-bound
+RESOLUTION_SCALING_THRESHOLD = 0.15
+
+TOTAL_ROW_NAMES = {"total", "gpu total", "frame", "gpu frame"}
+NUMBER = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+@dataclass
+class ScenarioResult:
+    """Results for one perftest scenario."""
+    name: str
+    label: str
+    fps: float = None
+    frame_ms: float = None
+    gpu_ms: float = None
+    passes: dict = field(default_factory=dict)
+    frame_times: list = field(default_factory=list)
+    bound: str = "unknown"
+    fps_delta_pct: float = None
+    gpu_ms_delta: float = None
+
+
+def _pick_time_column(header):
+    """Index of the GPU time column: prefer an average, then anything in ms."""
+    lowered = [h.strip().lower() for h in header]
+    for wanted in ("avg", "mean", "ms", "time"):
+        for i, name in enumerate(lowered):
+            if i > 0 and wanted in name:
+                return i
+    return None
+
+
+def parse_gpu_csv(path):
+    """Parse a stats_print_gpu CSV into {pass name: GPU ms}.
+
+    The first column is the pass name; the time column is picked from the
+    header (average/mean/ms). Files without a recognisable header fall back
+    to the first numeric column.
+    """
+    passes = {}
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        rows = [row for row in csv.reader(f) if any(cell.strip() for cell in row)]
+    if not rows:
+        return passes
+    time_col = None
+    if not any(NUMBER.match(cell.strip()) for cell in rows[0][1:]):
+        time_col = _pick_time_column(rows[0])
+        rows = rows[1:]
+    for row in rows:
+        name = row[0].strip()
+        cells = [c.strip() for c in row[1:]]
+        if time_col is not None and time_col - 1 < len(cells) and NUMBER.match(cells[time_col - 1]):
+            value = cells[time_col - 1]
+        else:
+            value = next((c for c in cells if NUMBER.match(c)), None)
+        if name and value is not None:
+            passes[name] = float(value)
+    return passes
+
+
+def parse_console_samples(lines):
+    """Map scenario name -> every FPS reading logged in its block.
+
+    Only the last "perftest output starts here." block is used, so a
+    console.log holding several runs reports the most recent one.
+    """
+    labels = {label.lower(): name for name, label in SCENARIOS}
+    start = max((i for i, line in enumerate(lines) if OUTPUT_START in line), default=-1)
+    results = {}
+    current = None
+    for line in lines[start + 1:]:
+        text = line.strip()
+        if OUTPUT_END in text:
+            break
+        if text.lower() in labels:
+            current = labels[text.lower()]
+            continue
+        if current:
+            sample = parse_fps_line(text)
+            if sample is not None:
+                results.setdefault(current, []).append(sample.fps)
+    return results
+
+
+def parse_console_fps(lines):
+    """Map scenario name -> the cl_printfps FPS of the most recent perftest run."""
+    return {name: values[0] for name, values in parse_console_samples(lines).items()}
+
+
+def classify(result):
+    """CPU- vs GPU-bound from how much of the frame the GPU was busy."""
+    if result.frame_ms is None or result.gpu_ms is None:
+        return "unknown"
+    return "GPU" if result.gpu_ms >= result.frame_ms * GPU_BOUND_RATIO else "CPU"
+
+
+def build_report(results_dir, console_log=None):
+    """Collect every scenario's CSV and console FPS into a structured report."""
+    results_dir = Path(results_dir)
+    samples_by_scenario = {}
+    if console_log and Path(console_log).is_file():
+        with open(console_log, encoding="utf-8", errors="replace") as f:
+            samples_by_scenario = parse_console_samples(f.read().splitlines())
+
+    scenarios = []
+    for name, label in SCENARIOS:
+        result = ScenarioResult(name=name, label=label)
+        csv_path = results_dir / CSV_PATTERN.format(name)
+        if csv_path.is_file():
+            result.passes = parse_gpu_csv(csv_path)
+            totals = [v for k, v in result.passes.items() if k.lower() in TOTAL_ROW_NAMES]
+            result.gpu_ms = totals[0] if totals else round(sum(result.passes.values()), 4)
+        else:
+            logging.warning("Perftest results not found: %s", csv_path)
+        samples = samples_by_scenario.get(name, [])
+        result.fps = samples[0] if samples else None
+        result.frame_times = [round(1000.0 / fps, 4) for fps in samples]
+        if result.fps:
+            result.frame_ms = round(1000.0 / result.fps, 4)
+        result.bound = classify(result)
+        scenarios.append(result)
+
+    baseline = next(s for s in scenarios if s.name == BASELINE)
+    for result in scenarios:
+        if result is baseline:
+            continue
+        if result.fps and baseline.fps:
+            result.fps_delta_pct = round((result.fps - baseline.fps) / baseline.fps * 100, 2)
+        if result.gpu_ms is not None and baseline.gpu_ms is not None:
+            result.gpu_ms_delta = round(result.gpu_ms - baseline.gpu_ms, 4)
+
+    verdict = baseline.bound
+    half = next(s for s in scenarios if s.name == "halfresolution")
+    if half.fps_delta_pct is not None:
+        # Resolution scaling is the more reliable signal when both runs have FPS
+        gpu_bound = half.fps_delta_pct >= RESOLUTION_SCALING_THRESHOLD * 100
+        verdict = "GPU" if gpu_bound else "CPU"
+
+    return {
+        "results_dir": str(results_dir),
+        "verdict": verdict,
+        "scenarios": [asdict(s) for s in scenarios],
+    }
+
+
+def format_report(report):
+    """Render a report as a Markdown table."""
+    lines = [
+        "| Scenario | FPS | Frame ms | GPU ms | Bound | FPS Δ% | GPU ms Δ |",
+        "|----------|-----|----------|--------|-------|--------|----------|",
+    ]
+
+    def fmt(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    for s in report["scenarios"]:
+        lines.append(
+            f"| {s['label']} | {fmt(s['fps'], '.1f')} | {fmt(s['frame_ms'], '.2f')} | "
+            f"{fmt(s['gpu_ms'], '.2f')} | {s['bound']} | {fmt(s['fps_delta_pct'], '+.1f')} | "
+            f"{fmt(s['gpu_ms_delta'], '+.2f')} |"
+        )
+    lines.append(f"\nOverall: {report['verdict']}-bound")
+    return "\n".join(lines)
+
+
+def write_report(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    logging.info("Perftest report written to %s", path)
@@ -0,0 +1,309 @@
+"""
+Perftest result history and run-to-run comparison.
+
+Every report from perftest.build_report is stored in a local SQLite database
+together with the context it was measured in: the installed driver set (the
+`.installed` markers under drivers/), the active CS2Tune profile and the
+hardware identity. Runs sharing that context form a group; comparing the
+newest group against the previous one uses a Mann-Whitney U test on the
+per-scenario frame times, so a change is only flagged when it is both larger
+than the threshold and unlikely to be run-to-run noise.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import platform
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional, Sequence
+
+from driver_cache import MARKER_NAME, installed_digest
+from drivers import DRIVER_FOLDER
+from paths import CS2_CFG_DIR, PERFTEST_DB
+from perftest import SCENARIOS
+
+# Flag a scenario when median frame time moves by more than this (percent)...
+REGRESSION_THRESHOLD_PCT = 3.0
+# ...and the difference is significant at this level
+SIGNIFICANCE = 0.05
+# A perftest run logs one cl_printfps reading per scenario. Below 4 samples
+# per side the Mann-Whitney p-value can't reach SIGNIFICANCE (3 vs 3 bottoms
+# out around 0.08), so fewer would always read as "no change".
+MIN_SAMPLES = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    context TEXT NOT NULL,
+    driver_set TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    hardware TEXT NOT NULL,
+    verdict TEXT,
+    report TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_context ON runs (context, created);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    scenario TEXT NOT NULL,
+    frame_ms REAL NOT NULL,
+    gpu_ms REAL
+);
+CREATE INDEX IF NOT EXISTS samples_run ON samples (run_id, scenario);
+"""
+
+
+def installed_driver_set(driver_folder: Path = DRIVER_FOLDER) -> str:
+    """Comma-separated installed driver packages, with the installed archive's hash prefix."""
+    driver_folder = Path(driver_folder)
+    if not driver_folder.is_dir():
+        return ""
+    packages = []
+    for marker in sorted(driver_folder.glob(f"*/{MARKER_NAME}")):
+        digest = installed_digest(marker.parent)
+        packages.append(f"{marker.parent.name}@{digest[:8]}" if digest else marker.parent.name)
+    return ",".join(packages)
+
+
+def active_profile(metrics_file: Path = CS2_CFG_DIR / "cs2tune_metrics.json") -> str:
+    """Profile last applied by the monitor, as recorded in its metrics file."""
+    try:
+        with open(metrics_file, encoding="utf-8") as f:
+            return json.load(f).get("profile") or "unknown"
+    except (OSError, ValueError):
+        return "unknown"
+
+
+def hardware_identity() -> str:
+    """Host, CPU and GPU name; the GPU comes from the shared sampler when available."""
+    gpu = "unknown"
+    try:
+        from cs2tune.gpu_sampler import get_sampler
+        reading = get_sampler().latest()
+        if reading is not None and reading.name:
+            gpu = reading.name
+    except Exception as e:
+        logging.debug("GPU name unavailable: %s", e)
+    return f"{platform.node()}|{platform.processor() or platform.machine()}|{gpu}"
+
+
+def context_key(driver_set: str, profile: str, hardware: str) -> str:
+    """Short stable id for a (driver set, profile, hardware) combination."""
+    return hashlib.sha1(f"{driver_set}\n{profile}\n{hardware}".encode()).hexdigest()[:12]
+
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]):
+    """Two-sided Mann-Whitney U test using the tie-corrected normal approximation.
+
+    Returns (U statistic for `a`, p-value). With too few samples to say
+    anything the p-value is 1.0.
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tied = j - i + 1
+        tie_term += tied ** 3 - tied
+        i = j + 1
+    rank_sum_a = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if variance <= 0:
+        return u, 1.0
+    # Continuity correction towards the mean
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    p = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return u, min(p, 1.0)
+
+
+class PerftestHistory:
+    """SQLite store of perftest reports keyed by driver set, profile and hardware."""
+
+    def __init__(self, db_path: Path = PERFTEST_DB):
+        self.db_path = Path(db_path)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def store(self, report: dict, driver_set: Optional[str] = None,
+              profile: Optional[str] = None, hardware: Optional[str] = None) -> int:
+        """Save a report and its per-scenario frame times; returns the run id."""
+        driver_set = installed_driver_set() if driver_set is None else driver_set
+        profile = active_profile() if profile is None else profile
+        hardware = hardware_identity() if hardware is None else hardware
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (created, context, driver_set, profile, hardware, verdict, report) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), context_key(driver_set, profile, hardware), driver_set,
+                 profile, hardware, report.get("verdict"), json.dumps(report)),
+            )
+            run_id = cursor.lastrowid
+            rows = []
+            for scenario in report["scenarios"]:
+                frame_times = scenario.get("frame_times") or (
+                    [scenario["frame_ms"]] if scenario.get("frame_ms") else [])
+                rows.extend((run_id, scenario["name"], ms, scenario.get("gpu_ms"))
+                            for ms in frame_times)
+            conn.executemany(
+                "INSERT INTO samples (run_id, scenario, frame_ms, gpu_ms) VALUES (?, ?, ?, ?)", rows)
+        logging.info("Stored perftest run %d (drivers: %s, profile: %s)",
+                     run_id, driver_set or "none", profile)
+        return run_id
+
+    def runs(self, limit: int = 50) -> List[sqlite3.Row]:
+        """Most recent runs first."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT id, created, context, driver_set, profile, hardware, verdict "
+                "FROM runs ORDER BY created DESC, id DESC LIMIT ?", (limit,)).fetchall()
+
+    def run(self, run_id: int) -> Optional[sqlite3.Row]:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT id, created, context, driver_set, profile, hardware, verdict "
+                "FROM runs WHERE id = ?", (run_id,)).fetchone()
+
+    def frame_times(self, context: str) -> Dict[str, List[float]]:
+        """Scenario -> frame times pooled over every run with this context."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT s.scenario, s.frame_ms FROM samples s JOIN runs r ON r.id = s.run_id "
+                "WHERE r.context = ?", (context,)).fetchall()
+        pooled: Dict[str, List[float]] = {}
+        for row in rows:
+            pooled.setdefault(row["scenario"], []).append(row["frame_ms"])
+        return pooled
+
+    def pick_pair(self, baseline_id: Optional[int] = None, candidate_id: Optional[int] = None):
+        """(baseline, candidate) runs: by default the newest run against the most
+        recent run measured in a different context, or else the run before it."""
+        runs = self.runs(limit=1000)
+        if not runs:
+            return None, None
+        candidate = self.run(candidate_id) if candidate_id else runs[0]
+        if baseline_id:
+            return self.run(baseline_id), candidate
+        if candidate is None:
+            return None, None
+        older = [r for r in runs if r["id"] != candidate["id"] and r["created"] <= candidate["created"]]
+        baseline = next((r for r in older if r["context"] != candidate["context"]), None)
+        return baseline or (older[0] if older else None), candidate
+
+    def compare(self, baseline, candidate, threshold_pct: float = REGRESSION_THRESHOLD_PCT,
+                alpha: float = SIGNIFICANCE) -> List[dict]:
+        """Per-scenario comparison of two runs' context groups.
+
+        Runs in the same context are pooled, so repeating a perftest before and
+        after a change gives the test enough samples to reach significance.
+        When both runs share a context only the two runs themselves are compared.
+        Scenarios with fewer than MIN_SAMPLES on either side are reported as
+        "insufficient samples" with no p-value rather than as "no change".
+        """
+        if baseline["context"] == candidate["context"]:
+            before, after = self._run_frame_times(baseline["id"]), self._run_frame_times(candidate["id"])
+        else:
+            before, after = self.frame_times(baseline["context"]), self.frame_times(candidate["context"])
+        results = []
+        for name, label in SCENARIOS:
+            a, b = before.get(name, []), after.get(name, [])
+            if not a or not b:
+                continue
+            base_ms, cand_ms = median(a), median(b)
+            change = (cand_ms - base_ms) / base_ms * 100 if base_ms else 0.0
+            u, p = (None, None) if min(len(a), len(b)) < MIN_SAMPLES else mann_whitney_u(b, a)
+            if p is None:
+                status = f"insufficient samples (need ≥{MIN_SAMPLES} per side)"
+            elif p < alpha and change > threshold_pct:
+                status = "REGRESSION"
+            elif p < alpha and change < -threshold_pct:
+                status = "improved"
+            else:
+                status = "no change"
+            results.append({
+                "scenario": name, "label": label,
+                "baseline_ms": base_ms, "candidate_ms": cand_ms,
+                "change_pct": round(change, 2), "u": u, "p": None if p is None else round(p, 4),
+                "samples": (len(a), len(b)), "status": status,
+            })
+        return results
+
+    def _run_frame_times(self, run_id: int) -> Dict[str, List[float]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT scenario, frame_ms FROM samples WHERE run_id = ?", (run_id,)).fetchall()
+        times: Dict[str, List[float]] = {}
+        for row in rows:
+            times.setdefault(row["scenario"], []).append(row["frame_ms"])
+        return times
+
+
+def _describe(run) -> str:
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["created"]))
+    return f"#{run['id']} {when} profile={run['profile']} drivers={run['driver_set'] or 'none'}"
+
+
+def format_comparison(baseline, candidate, results: List[dict]) -> str:
+    """Render a comparison as a Markdown table."""
+    lines = [
+        f"Baseline:  {_describe(baseline)}",
+        f"Candidate: {_describe(candidate)}",
+        "",
+        "| Scenario | Baseline ms | Candidate ms | Δ% | p | n | Status |",
+        "|----------|-------------|--------------|----|---|---|--------|",
+    ]
+    for r in results:
+        p = "-" if r["p"] is None else f"{r['p']:.3f}"
+        lines.append(
+            f"| {r['label']} | {r['baseline_ms']:.2f} | {r['candidate_ms']:.2f} | "
+            f"{r['change_pct']:+.1f} | {p} | {r['samples'][0]}/{r['samples'][1]} | {r['status']} |"
+        )
+    regressions = [r["label"] for r in results if r["status"] == "REGRESSION"]
+    lines.append("")
+    lines.append(f"Regressions: {', '.join(regressions)}" if regressions else "No significant regressions")
+    if any(r["p"] is None for r in results):
+        lines.append(f"Some scenarios have fewer than {MIN_SAMPLES} samples per side; "
+                     f"repeat the perftest (--run-perftest) in each configuration to compare them.")
+    return "\n".join(lines)
+
+
+def compare_perftest(baseline_id: Optional[int] = None, candidate_id: Optional[int] = None,
+                     threshold_pct: float = REGRESSION_THRESHOLD_PCT,
+                     db_path: Path = PERFTEST_DB) -> Optional[List[dict]]:
+    """Compare two stored runs, print the table and return the per-scenario results."""
+    history = PerftestHistory(db_path)
+    baseline, candidate = history.pick_pair(baseline_id, candidate_id)
+    if baseline is None or candidate is None:
+        logging.error("Need at least two stored perftest runs to compare (see --run-perftest).")
+        return None
+    results = history.compare(baseline, candidate, threshold_pct)
+    print(format_comparison(baseline, candidate, results))
+    insufficient = [r["label"] for r in results if r["p"] is None]
+    if insufficient:
+        logging.warning("Not enough perftest samples to test %s (need %d per side)",
+                        ", ".join(insufficient), MIN_SAMPLES)
+    for r in results:
+        if r["status"] == "REGRESSION":
+            logging.warning("Perftest regression in %s: %+.1f%% frame time (p=%.3f)",
+                            r["label"], r["change_pct"], r["p"])
+    return results
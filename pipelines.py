@@ -1,22 +1,35 @@
 import logging
-import subprocess
+import shutil
+import sqlite3
 from paths import (
     DRIVER_SCRIPT,
     VERIFY_SCRIPT,
     PERFTEST_CFG,
     DASHBOARD_SCRIPT,
-    DOCKER_COMPOSE_FILE
+    DOCKER_COMPOSE_FILE,
+    CS2_CFG_DIR,
+    CS2_CONSOLE_LOG,
+    PERFTEST_RESULTS_DIR,
+    PERFTEST_REPORT
 )
+from perftest import build_report, format_report, write_report
+from perftest_history import PerftestHistory
+from cs2tune.process_runner import run
 
 
 def run_command(command, description):
-    """Run a shell command with logging."""
+    """Run a command (argument list), streaming its output to the log."""
     logging.info("Running: %s", description)
     try:
-        subprocess.run(command, check=True, shell=True)
-        logging.info("Success: %s", description)
-    except subprocess.CalledProcessError as e:
+        returncode = run(command, write=lambda line: logging.info("  %s", line))
+    except OSError as e:
         logging.error("Failed: %s with error: %s", description, e)
+        return False
+    if returncode != 0:
+        logging.error("Failed: %s with exit status %s", description, returncode)
+        return False
+    logging.info("Success: %s", description)
+    return True
 
 
 def file_exists(file_path, description):
@@ -31,8 +44,7 @@ def install_drivers():
     """Run the driver installation script."""
     if file_exists(DRIVER_SCRIPT, "Driver installation script"):
         run_command(
-            "powershell.exe -ExecutionPolicy Bypass -File "
-            f"\"{DRIVER_SCRIPT}\"",
+            ["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", str(DRIVER_SCRIPT)],
             "Installing drivers"
         )
 
@@ -41,26 +53,51 @@ def verify_drivers():
     """Run the driver verification script."""
     if file_exists(VERIFY_SCRIPT, "Driver verification script"):
         run_command(
-            "powershell.exe -ExecutionPolicy Bypass -File "
-            f"\"{VERIFY_SCRIPT}\"",
+            ["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", str(VERIFY_SCRIPT)],
             "Verifying drivers"
         )
 
 
+def install_perftest_cfg():
+    """Copy perftest.cfg into the CS2 cfg folder so 'exec_async perftest' finds it."""
+    if not CS2_CFG_DIR.is_dir():
+        logging.warning("CS2 cfg folder not found: %s", CS2_CFG_DIR)
+        return False
+    target = CS2_CFG_DIR / PERFTEST_CFG.name
+    if not target.is_file() or target.read_bytes() != PERFTEST_CFG.read_bytes():
+        shutil.copyfile(PERFTEST_CFG, target)
+        logging.info("Installed %s", target)
+    return True
+
+
 def run_performance_test():
-    """Run the performance test configuration."""
-    if file_exists(PERFTEST_CFG, "Performance test configuration file"):
-        logging.info("Running performance test using perftest.cfg")
-        # Add logic to execute the performance test if applicable
+    """Parse the perftest.cfg GPU-timing CSVs and console FPS into a report."""
+    if not file_exists(PERFTEST_CFG, "Performance test configuration file"):
+        return None
+    install_perftest_cfg()
+    logging.info("Collecting perftest results from %s", PERFTEST_RESULTS_DIR)
+    report = build_report(PERFTEST_RESULTS_DIR, CS2_CONSOLE_LOG)
+    if not any(s["gpu_ms"] is not None or s["fps"] for s in report["scenarios"]):
+        logging.error(
+            "No perftest results found. Launch CS2 with -condebug, load a map "
+            "or demo, run 'exec_async perftest' in the console, then retry."
+        )
+        return None
+    print(format_report(report))
+    write_report(report, PERFTEST_REPORT)
+    try:
+        PerftestHistory().store(report)
+    except sqlite3.Error as e:
+        logging.error("Could not store perftest run in history: %s", e)
+    return report
 
 
 def launch_dashboard():
     """Launch the Streamlit dashboard."""
     if file_exists(DASHBOARD_SCRIPT, "Dashboard script"):
         run_command(
-            "streamlit run "
-            f"\"{DASHBOARD_SCRIPT}\" --server.port 8501 "
-            "--server.enableCORS false",
+            ["streamlit", "run", str(DASHBOARD_SCRIPT), "--server.port", "8501",
+             "--server.enableCORS", "false"],
             "Launching dashboard"
         )
 
@@ -68,6 +105,6 @@ def launch_dashboard():
 def run_docker():
     """Build and run Docker containers."""
     if file_exists(DOCKER_COMPOSE_FILE, "docker-compose.yml"):
-        run_command("docker-compose up --build", "Running Docker containers")
+        run_command(["docker-compose", "up", "--build"], "Running Docker containers")
     else:
         logging.error("docker-compose.yml not found.")
@@ -3,11 +3,20 @@ import sys
 import platform
 import argparse
 import subprocess
+import threading
 from pathlib import Path
 import csv
 import logging
 import shutil
-from typing import Dict, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence
+
+import driver_cache
+import installer_index
+from installer_runner import ExecutionProfile, log_name, run_installer
+from install_journal import InstallJournal
+from install_plan import SATISFIED, InstallPlan, InstallScheduler, format_plan
 
 SCRIPT_DIR = Path(__file__).parent.resolve()
 DRIVER_FOLDER = SCRIPT_DIR / "drivers"
@@ -32,6 +41,46 @@ INSTALL_ORDER = [
     "17_MSI_Dragon_Edge.zip"
 ]
 REBOOT_AFTER = {"01_Intel_Chipset.zip", "02_Intel_ME_SW.zip", "06_NVIDIA_VGA_DCH_STUDIO.zip"}
+# What each package needs installed first; anything not listed only needs the chipset
+DEPENDS_ON = {
+    "02_Intel_ME_SW.zip": ["01_Intel_Chipset.zip"],
+    "03_Intel_Serial_IO_Drivers.zip": ["01_Intel_Chipset.zip"],
+    "04_Intel_DTT.zip": ["02_Intel_ME_SW.zip"],
+    "05_Intel_VGA.zip": ["02_Intel_ME_SW.zip"],
+    "06_NVIDIA_VGA_DCH_STUDIO.zip": ["05_Intel_VGA.zip"],
+    "07_Realtek_Audio.zip": ["01_Intel_Chipset.zip"],
+    "08_Nahimic.zip": ["07_Realtek_Audio.zip"],
+    "09_Intel_Wireless.zip": ["01_Intel_Chipset.zip"],
+    "10_Intel_Bluetooth.zip": ["09_Intel_Wireless.zip"],
+    "11_Camera.zip": ["01_Intel_Chipset.zip"],
+    "12_HID_Event_Filter_Driver.zip": ["03_Intel_Serial_IO_Drivers.zip"],
+    "13_SCM.zip": ["01_Intel_Chipset.zip"],
+    "14_MSI_TrueColor.zip": ["05_Intel_VGA.zip"],
+    "15_MSI_Center_Pro.zip": ["13_SCM.zip"],
+    "16_MSI_Microphone_Optimizer.zip": ["07_Realtek_Audio.zip"],
+    "17_MSI_Dragon_Edge.zip": ["15_MSI_Center_Pro.zip"],
+}
+# Rough install times in seconds, used until a real run has been measured
+INSTALL_ESTIMATES = {
+    "01_Intel_Chipset.zip": 90,
+    "02_Intel_ME_SW.zip": 120,
+    "05_Intel_VGA.zip": 240,
+    "06_NVIDIA_VGA_DCH_STUDIO.zip": 420,
+    "07_Realtek_Audio.zip": 120,
+    "15_MSI_Center_Pro.zip": 180,
+}
+# Concurrent installers; Windows Installer serialises MSI packages itself
+INSTALL_WORKERS = 2
+JOURNAL_FILE = SCRIPT_DIR / "install_journal.jsonl"
+INSTALLER_LOG_DIR = SCRIPT_DIR / "install_logs"
+# Per-package changes to the default ExecutionProfile (see installer_runner)
+EXECUTION_OVERRIDES = {
+    "05_Intel_VGA.zip": {"timeout": 2400},
+    "06_NVIDIA_VGA_DCH_STUDIO.zip": {"timeout": 3600, "hang_timeout": 900},
+    "15_MSI_Center_Pro.zip": {"timeout": 2400},
+}
+# Archives extracted ahead of the installer that is currently running
+EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
 
 def setup_logging(verbose: bool = False):
     """Configure logging to file and console."""
@@ -56,8 +105,6 @@ def is_admin() -> bool:
 def check_external_tools():
     """Warn if required external tools are missing."""
     if platform.system() != "Windows":
-        if not shutil.which("unzip"):
-            logging.warning("Missing 'unzip' tool. Please install it for extraction.")
         # Only warn about wine if we actually need it
         wine_needed = any(
             any(f.endswith(ext) for ext in [".exe", ".bat"]) for f in os.listdir(DRIVER_FOLDER)
@@ -66,98 +113,268 @@ def check_external_tools():
             logging.warning("Missing 'wine'. Windows installers may not run on Linux.")
 
 def extract_zip(zip_path: Path, extract_path: Path, dry_run: bool = False) -> bool:
-    """Extract ZIP archive to target folder."""
+    """Extract ZIP archive to target folder.
+
+    Uses the driver_cache manifest, so only members whose CRC or size changed
+    since the last extraction are rewritten.
+    """
     if dry_run:
         logging.info(f"[DRY RUN] Would extract: {zip_path}")
         return True
     try:
-        if platform.system() == "Windows":
-            cmd = ["powershell", "-Command", f"Expand-Archive -Path '{zip_path}' -DestinationPath '{extract_path}' -Force"]
-            subprocess.run(cmd, check=True)
+        result = driver_cache.sync_archive(zip_path, extract_path)
+        if result.changed:
+            logging.info(f"Extracted: {zip_path.name} ({len(result.extracted)} changed, {len(result.removed)} removed)")
         else:
-            extract_path.mkdir(parents=True, exist_ok=True)
-            subprocess.run(["unzip", "-o", str(zip_path), "-d", str(extract_path)], check=True)
-        logging.info(f"Extracted: {zip_path.name}")
+            logging.info(f"Already extracted: {zip_path.name}")
         return True
     except Exception as e:
         logging.error(f"Extraction failed for {zip_path.name}: {e}")
         return False
 
-def run_installers(extract_path: Path, dry_run: bool = False, force_wine: bool = False) -> str:
-    """Run all .exe and .bat installers found in extract_path."""
-    found_installers: List[Path] = []
-    failed = False
-    for root, _, files in os.walk(extract_path):
-        for file in files:
-            full_path = Path(root) / file
-            if file.endswith(".exe") or file.endswith(".bat"):
-                found_installers.append(full_path)
+
+def needs_extraction(zip_file: str, force: bool = False) -> bool:
+    """Whether extract_and_install would have to extract anything for this archive."""
+    zip_path = DRIVER_FOLDER / zip_file
+    extract_path = DRIVER_FOLDER / Path(zip_file).stem
+    if not force and driver_cache.is_installed(zip_path, extract_path):
+        return False
+    return not driver_cache.is_current(zip_path, extract_path)
+
+
+class ExtractionPipeline:
+    """Extracts upcoming archives on a thread pool while installers run in order.
+
+    zipfile's decompression and the file copies release the GIL, so threads
+    overlap extraction with the running installer without a process pool.
+    At most `lookahead` archives are queued ahead of the one being installed.
+    """
+
+    def __init__(self, zip_files: List[str], workers: int = EXTRACT_WORKERS,
+                 lookahead: Optional[int] = None, dry_run: bool = False):
+        self.queue = list(zip_files)
+        self.lookahead = lookahead or workers
+        self.dry_run = dry_run
+        self.futures: Dict[str, Future] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="extract")
+
+    def _fill(self, current: int):
+        while self._next < len(self.queue) and self._next <= current + self.lookahead:
+            zip_file = self.queue[self._next]
+            self.futures[zip_file] = self._pool.submit(
+                extract_zip, DRIVER_FOLDER / zip_file, DRIVER_FOLDER / Path(zip_file).stem, self.dry_run)
+            self._next += 1
+
+    def start(self):
+        with self._lock:
+            self._fill(0)
+        return self
+
+    def result(self, zip_file: str) -> bool:
+        """Wait for `zip_file` to finish extracting and queue the next archives.
+
+        Safe to call from several installer threads at once.
+        """
+        with self._lock:
+            if zip_file not in self.futures:
+                self._fill(self.queue.index(zip_file) if zip_file in self.queue else self._next)
+            future = self.futures.pop(zip_file, None)
+        if future is None:
+            return extract_zip(DRIVER_FOLDER / zip_file, DRIVER_FOLDER / Path(zip_file).stem, self.dry_run)
+        ok = future.result()
+        with self._lock:
+            self._fill(self.queue.index(zip_file) + 1)
+        return ok
+
+    def shutdown(self):
+        """Drop queued work; extractions already running are allowed to finish."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def find_installers(extract_path: Path, zip_file: Optional[str] = None) -> List[Path]:
+    """Entry point(s) for a package, chosen by installer_index.
+
+    Uses the archive's member list when available and only walks the
+    extracted tree for folders without an archive or manifest.
+    """
+    zip_file = zip_file or f"{extract_path.name}.zip"
+    zip_path = DRIVER_FOLDER / zip_file
+    manifest = driver_cache.load_manifest(extract_path)
+    if manifest is not None or zip_path.is_file():
+        members = installer_index.archive_members(zip_path, manifest)
+    else:
+        members = [(Path(root) / file).relative_to(extract_path).as_posix()
+                   for root, _, files in os.walk(extract_path) for file in files]
+    return [extract_path / p for p in installer_index.select(zip_file, members)]
+
+
+def execution_profile(zip_file: str) -> ExecutionProfile:
+    """Vendor silent switches plus any per-package overrides."""
+    profile = ExecutionProfile(silent_args=tuple(installer_index.silent_args(zip_file)))
+    return replace(profile, **EXECUTION_OVERRIDES.get(zip_file, {}))
+
+
+def installer_command(installer: Path, args: Sequence[str], force_wine: bool = False) -> Optional[List[str]]:
+    """Command line for one installer, or None when it cannot run on this OS."""
+    if platform.system() == "Windows":
+        prefix = []
+    elif force_wine:
+        prefix = ["wine"]
+    else:
+        return None
+    if installer.suffix == ".bat":
+        return prefix + ["cmd", "/c", str(installer), *args]
+    return prefix + [str(installer), *args]
+
+
+def run_installers(extract_path: Path, dry_run: bool = False, force_wine: bool = False,
+                   installers: Optional[List[Path]] = None, journal: Optional[InstallJournal] = None,
+                   zip_file: Optional[str] = None) -> str:
+    """Run the package's installer(s) under its execution profile.
+
+    `installers` defaults to find_installers(). Output goes to one log per
+    installer in INSTALLER_LOG_DIR. With a `journal`, each installer's start
+    and finish is recorded first and installers that already finished in an
+    earlier boot are not run again. Returns the package status: installed,
+    reboot_required, failed, timeout, hung or no_installer.
+    """
+    zip_file = zip_file or f"{extract_path.name}.zip"
+    found_installers = find_installers(extract_path, zip_file) if installers is None else installers
+    profile = execution_profile(zip_file)
     if not found_installers:
-        logging.warning(f"No installer found in: {extract_path}")
+        logging.error(f"No installer found in: {extract_path}")
         return "no_installer"
-    for installer in found_installers:
-        logging.info(f"Running installer: {installer}")
+    finished = journal.state(zip_file).finished if journal else {}
+    statuses = []
+    for index, installer in enumerate(found_installers):
+        if finished.get(index) in ("installed", "reboot_required"):
+            logging.info(f"Already ran installer: {installer}")
+            statuses.append(finished[index])
+            continue
+        command = installer_command(installer, profile.silent_args, force_wine)
+        if command is None:
+            logging.warning(f"Skipping Windows installer {installer} on Linux (no Wine).")
+            continue
+        logging.info(f"Running installer: {' '.join(command)}")
         if dry_run:
             continue
-        try:
-            if platform.system() == "Windows":
-                if installer.suffix == ".bat":
-                    subprocess.run(["cmd", "/c", str(installer)], check=True)
-                else:
-                    subprocess.run(str(installer), check=True, shell=True)
-            elif force_wine:
-                if installer.suffix == ".bat":
-                    subprocess.run(["wine", "cmd", "/c", str(installer)], check=True)
-                else:
-                    subprocess.run(["wine", str(installer)], check=True)
-            else:
-                logging.warning(f"Skipping Windows installer {installer} on Linux (no Wine).")
-        except Exception as e:
-            logging.error(f"Installer failed: {installer}: {e}")
-            failed = True
-    return "failed" if failed else "installed"
+        if journal:
+            journal.installer_started(zip_file, index, str(installer.relative_to(extract_path)))
+        result = run_installer(command, profile, INSTALLER_LOG_DIR / log_name(zip_file, index, installer),
+                               cwd=installer.parent)
+        if result.ok:
+            logging.info(f"Installer {result.status} in {result.duration:.0f}s: {installer.name}")
+        else:
+            logging.error(f"Installer {result.status}: {installer}: {result.error} (log: {result.log_path})")
+        if journal:
+            journal.installer_finished(zip_file, index, result.status, returncode=result.returncode,
+                                       duration=round(result.duration, 1), log=str(result.log_path))
+        statuses.append(result.status)
+    for status in ("timeout", "hung", "failed", "reboot_required"):
+        if status in statuses:
+            return status
+    return "installed"
 
-def extract_and_install(zip_file: str, verbose: bool = False, dry_run: bool = False, auto_reboot: bool = False, force: bool = False, force_wine: bool = False) -> str:
-    """Extract ZIP and run all installers, mark as installed, handle reboot."""
+def extract_and_install(zip_file: str, verbose: bool = False, dry_run: bool = False, auto_reboot: bool = False, force: bool = False, force_wine: bool = False, pipeline: Optional[ExtractionPipeline] = None, handle_reboot: bool = True, journal: Optional[InstallJournal] = None) -> str:
+    """Extract ZIP and run all installers, mark as installed, handle reboot.
+
+    With a `pipeline`, the extraction was started ahead of time and this only
+    waits for it to finish. The install scheduler passes handle_reboot=False
+    and reboots itself once no other installer is running. With a `journal`
+    holding this archive's installer list from an earlier boot, extraction
+    and the tree walk are skipped.
+    """
     folder_name = Path(zip_file).stem
     extract_path = DRIVER_FOLDER / folder_name
-    marker_file = extract_path / ".installed"
-    if marker_file.exists() and not force:
+    zip_path = DRIVER_FOLDER / zip_file
+    if not force and driver_cache.is_installed(zip_path, extract_path):
         logging.info(f"Skipping {zip_file}: already installed.")
         return "skipped"
     # Progress indicator
     print(f"\n[Progress] Processing {zip_file} ...")
-    if not extract_path.exists() or force:
-        ok = extract_zip(DRIVER_FOLDER / zip_file, extract_path, dry_run)
-        if not ok:
-            return "failed"
+    state = journal.state(zip_file) if journal else None
+    manifest = driver_cache.load_manifest(extract_path)
+    if (state is not None and state.installers is not None and manifest
+            and state.sha256 == manifest.get("sha256") and driver_cache.is_current(zip_path, extract_path)):
+        logging.info(f"Resuming {zip_file} from journal")
+        installers = [extract_path / p for p in state.installers]
     else:
-        logging.info(f"Already extracted: {zip_file}")
-    result = run_installers(extract_path, dry_run, force_wine)
-    if result == "installed" and not dry_run:
+        if pipeline is not None and zip_file in pipeline.queue:
+            ok = pipeline.result(zip_file)
+            if not ok:
+                return "failed"
+        elif not extract_zip(zip_path, extract_path, dry_run):
+            return "failed"
+        installers = find_installers(extract_path, zip_file)
+        if journal is not None:
+            manifest = driver_cache.load_manifest(extract_path)
+            journal.extracted(zip_file, manifest and manifest.get("sha256"),
+                              [str(p.relative_to(extract_path)) for p in installers])
+    result = run_installers(extract_path, dry_run, force_wine, installers, journal, zip_file)
+    if result in ("installed", "reboot_required") and not dry_run:
         try:
-            marker_file.write_text("installed\n", encoding="utf-8")
+            manifest = driver_cache.load_manifest(extract_path)
+            driver_cache.mark_installed(extract_path, driver_cache.archive_digest(zip_path, manifest))
         except Exception as e:
             logging.error(f"Failed to write marker file for {zip_file}: {e}")
-    if zip_file in REBOOT_AFTER and result == "installed":
-        if auto_reboot:
-            logging.info("Auto-rebooting system...")
-            if platform.system() == "Windows":
-                subprocess.run(["shutdown", "/r", "/t", "0"])
-            else:
-                subprocess.run(["reboot"])
-            sys.exit(0)
-        else:
-            resp = input(f"Reboot recommended after installing {zip_file}. Reboot now? (Y/N): ")
-            if resp.strip().upper() == "Y":
-                logging.info("Rebooting system...")
-                if platform.system() == "Windows":
-                    subprocess.run(["shutdown", "/r", "/t", "0"])
-                else:
-                    subprocess.run(["reboot"])
-                sys.exit(0)
+    if handle_reboot and (result == "reboot_required" or (zip_file in REBOOT_AFTER and result == "installed")):
+        reboot_if_needed(zip_file, auto_reboot)
     return result
 
+
+def reboot_if_needed(zip_file: str, auto_reboot: bool = False) -> bool:
+    """Reboot (exiting) after a REBOOT_AFTER package; returns False if the user declined."""
+    if auto_reboot:
+        logging.info("Auto-rebooting system...")
+        if platform.system() == "Windows":
+            subprocess.run(["shutdown", "/r", "/t", "0"])
+        else:
+            subprocess.run(["reboot"])
+        sys.exit(0)
+    resp = input(f"Reboot recommended after installing {zip_file}. Reboot now? (Y/N): ")
+    if resp.strip().upper() == "Y":
+        logging.info("Rebooting system...")
+        if platform.system() == "Windows":
+            subprocess.run(["shutdown", "/r", "/t", "0"])
+        else:
+            subprocess.run(["reboot"])
+        sys.exit(0)
+    return False
+
+
+def build_install_plan(journal: Optional[InstallJournal] = None) -> InstallPlan:
+    """INSTALL_ORDER as a dependency graph, with measured durations where known."""
+    estimates = dict(INSTALL_ESTIMATES)
+    if journal is not None:
+        estimates.update(journal.durations)
+    depends_on = {z: DEPENDS_ON.get(z, [INSTALL_ORDER[0]] if z != INSTALL_ORDER[0] else [])
+                  for z in INSTALL_ORDER}
+    return InstallPlan(INSTALL_ORDER, depends_on, REBOOT_AFTER, estimates)
+
+
+def result_still_valid(zip_file: str, status: str, journal: InstallJournal) -> bool:
+    """Whether a status from an earlier session still describes the archive on disk."""
+    zip_path = DRIVER_FOLDER / zip_file
+    extract_path = DRIVER_FOLDER / Path(zip_file).stem
+    if status == "missing" or not zip_path.is_file():
+        return False
+    if status in ("installed", "skipped", "reboot_required"):
+        return driver_cache.is_installed(zip_path, extract_path)
+    recorded = journal.state(zip_file).sha256
+    return recorded is not None and recorded == driver_cache.archive_digest(
+        zip_path, driver_cache.load_manifest(extract_path))
+
+
+def drop_stale_results(journal: InstallJournal):
+    """Forget resumable statuses whose archive was added, replaced or removed since."""
+    for zip_file, status in list(journal.results.items()):
+        if status in SATISFIED and not result_still_valid(zip_file, status, journal):
+            logging.info(f"Journal status {status} for {zip_file} is out of date; installing it again")
+            journal.forget(zip_file)
+
+
 def print_summary():
     print("""
 📦 MSI CreatorPro X18 HX Driver Categories:
@@ -185,26 +402,38 @@ def print_driver_links():
 🎯 Use Studio drivers unless you need latest Game Ready features.
 """)
 
-def export_results_csv(results: Dict[str, str], filename: str = "driver_install_results.csv"):
+
+def _result_rows(results: Dict[str, str], journal: Optional[InstallJournal] = None):
+    """(zip, status, duration, session) per package; session is the boot it finished in."""
+    for zip_file, status in results.items():
+        state = journal.state(zip_file) if journal else None
+        duration = "" if state is None or state.duration is None else f"{state.duration:.0f}"
+        session = "" if state is None or state.session is None else str(state.session)
+        yield zip_file, status, duration, session
+
+
+def export_results_csv(results: Dict[str, str], filename: str = "driver_install_results.csv",
+                       journal: Optional[InstallJournal] = None):
     """Export install results to CSV."""
     with open(filename, "w", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow(["Driver ZIP", "Status"])
-        for zip_file, status in results.items():
-            writer.writerow([zip_file, status])
+        writer.writerow(["Driver ZIP", "Status", "Duration (s)", "Session"])
+        for row in _result_rows(results, journal):
+            writer.writerow(row)
     print(f"Exported install results to {filename}")
 
-def export_results_md(results: Dict[str, str], filename: str = "driver_install_results.md"):
+def export_results_md(results: Dict[str, str], filename: str = "driver_install_results.md",
+                      journal: Optional[InstallJournal] = None):
     """Export install results to Markdown table."""
     with open(filename, "w") as f:
-        f.write("| Driver ZIP | Status |\n|------------|--------|\n")
-        for zip_file, status in results.items():
-            f.write(f"| {zip_file} | {status} |\n")
+        f.write("| Driver ZIP | Status | Duration (s) | Session |\n|------------|--------|--------------|---------|\n")
+        for zip_file, status, duration, session in _result_rows(results, journal):
+            f.write(f"| {zip_file} | {status} | {duration} | {session} |\n")
     print(f"Exported install results to {filename}")
 
 def main():
     parser = argparse.ArgumentParser(description="MSI CreatorPro X18 HX Driver Installer")
-    parser.add_argument("--dry-run", action="store_true", help="Print planned actions only")
+    parser.add_argument("--dry-run", action="store_true", help="Print the install plan, critical path and estimated time; change nothing")
     parser.add_argument("--summary", action="store_true", help="Print driver categories and install tips")
     parser.add_argument("--links", action="store_true", help="Show official download links")
     parser.add_argument("--auto-reboot", action="store_true", help="Automatically reboot after critical driver installs")
@@ -213,8 +442,10 @@ def main():
     parser.add_argument("--list", action="store_true", help="List detected driver ZIPs and install order")
     parser.add_argument("--export-csv", action="store_true", help="Export install results to CSV")
     parser.add_argument("--export-md", action="store_true", help="Export install results to Markdown")
-    parser.add_argument("--force", action="store_true", help="Force reinstall even if .installed marker exists")
+    parser.add_argument("--force", action="store_true", help="Reinstall even if this archive version is already installed")
     parser.add_argument("--wine", action="store_true", help="Use Wine for installer execution on Linux")
+    parser.add_argument("--install-workers", type=int, default=INSTALL_WORKERS, help="Independent installers to run at once")
+    parser.add_argument("--extract-workers", type=int, default=EXTRACT_WORKERS, help="Archives to extract ahead of the running installer (0 = extract inline)")
     args = parser.parse_args()
 
     setup_logging(args.verbose)
@@ -242,27 +473,58 @@ def main():
 
     auto_reboot = args.auto_reboot or args.silent
 
-    results = {}
-    missing_drivers = []
-    for zip_file in INSTALL_ORDER:
-        zip_path = DRIVER_FOLDER / zip_file
-        if zip_path.exists():
-            status = extract_and_install(
-                zip_file,
-                verbose=args.verbose,
-                dry_run=args.dry_run,
-                auto_reboot=auto_reboot,
-                force=args.force,
-                force_wine=args.wine
-            )
-            results[zip_file] = status
-        else:
+    # --force reinstalls everything, so an unfinished earlier run is not resumed
+    journal = InstallJournal(None if args.dry_run else JOURNAL_FILE, fresh=args.force)
+    if journal.session > 1:
+        logging.info(f"Resuming install run (boot {journal.session}) from {JOURNAL_FILE}")
+        drop_stale_results(journal)
+    plan = build_install_plan(journal)
+    if args.dry_run:
+        print(format_plan(plan, args.install_workers, journal.results))
+
+    missing_drivers = [z for z in INSTALL_ORDER if not (DRIVER_FOLDER / z).exists()]
+    pipeline = None
+    if args.extract_workers > 0:
+        to_extract = [z for z in INSTALL_ORDER
+                      if z not in missing_drivers and journal.results.get(z) not in ("installed", "skipped")
+                      and needs_extraction(z, args.force)]
+        pipeline = ExtractionPipeline(to_extract, args.extract_workers, dry_run=args.dry_run).start()
+
+    def install_one(zip_file: str) -> str:
+        if zip_file in missing_drivers:
             logging.warning(f"Missing: {zip_file}")
-            results[zip_file] = "missing"
-            missing_drivers.append(zip_file)
+            return "missing"
+        return extract_and_install(
+            zip_file,
+            verbose=args.verbose,
+            dry_run=args.dry_run,
+            auto_reboot=auto_reboot,
+            force=args.force,
+            force_wine=args.wine,
+            pipeline=pipeline,
+            handle_reboot=False,
+            journal=journal
+        )
+
+    def on_reboot(zip_file: str) -> bool:
+        if not args.dry_run:
+            journal.reboot_pending(zip_file)
+            reboot_if_needed(zip_file, auto_reboot)
+        return False
+
+    scheduler = InstallScheduler(plan, install_one, args.install_workers, journal, on_reboot)
+    try:
+        done = scheduler.run()
+    finally:
+        if pipeline is not None:
+            pipeline.shutdown()
+        journal.close()
+    results = {zip_file: done.get(zip_file, "pending") for zip_file in INSTALL_ORDER}
 
     print("========== Driver Automation Summary ==========")
     print(f"Log file: {LOG_FILE}")
+    if journal.session > 1:
+        print(f"Run spanned {journal.session} boots (journal: {JOURNAL_FILE})")
     print("| Driver ZIP | Status |")
     print("|------------|--------|")
     for zip_file, status in results.items():
@@ -274,12 +536,12 @@ def main():
     print("===============================================")
 
     if args.export_csv:
-        export_results_csv(results)
+        export_results_csv(results, journal=journal)
     if args.export_md:
-        export_results_md(results)
+        export_results_md(results, journal=journal)
 
-    # Exit code: 0 if all installed/skipped, 1 if any failed/missing
-    if any(s in ("failed", "missing", "no_installer") for s in results.values()):
+    # Exit code: 0 if all installed/skipped (reboot or not), 1 otherwise
+    if any(s not in ("installed", "skipped", "reboot_required") for s in results.values()):
         sys.exit(1)
     sys.exit(0)
 
@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+
+from cs2tune import cfg_parser
+from cs2tune.cfg_parser import load, parse_cfg, parse_vcfg
+
+ROOT = Path(__file__).parent
+
+
+def test_tokenizer_handles_comments_quotes_and_separators():
+    cfg = parse_cfg(
+        '// header\n'
+        'fps_max 0                           // Unlimited FPS\n'
+        'mat_setvideomode 3440 1440 1\n'
+        'bot_quota_mode\t\t\t\tcompetitive\n'
+        'say "a // b; c"; cl_showfps "1"\n'
+        'bind "F1" "exec max_fps"\n',
+        "test.cfg",
+    )
+    assert cfg.get("fps_max") == "0"
+    assert cfg.convars["fps_max"].comment == "Unlimited FPS"
+    assert cfg.get("mat_setvideomode") == "3440 1440 1"
+    assert cfg.get("BOT_QUOTA_MODE") == "competitive"
+    assert cfg.convars["cl_showfps"].location.line == 5
+    assert [c.name for c in cfg.commands] == ["say", "bind"]
+    assert cfg.commands[0].args == ("a // b; c",)
+    assert cfg.includes == []
+
+
+def test_exec_chain_overrides_and_cache(tmp_path):
+    (tmp_path / "base.cfg").write_text("fps_max 300\nr_shadows 1\nexec\t\t\tcommon\nr_shadows 0\n")
+    (tmp_path / "common.cfg").write_text("fps_max 400\nrate 786432\nexec base\n")
+    cfg_parser.clear_cache()
+    cfg = load(tmp_path / "base.cfg")
+    assert cfg.values() == {"fps_max": "400", "r_shadows": "0", "rate": "786432"}
+    assert str(cfg.convars["fps_max"].location) == f"{tmp_path / 'common.cfg'}:1"
+    assert load(tmp_path / "base.cfg") is cfg
+
+    (tmp_path / "common.cfg").write_text("fps_max 500\n")
+    os.utime(tmp_path / "common.cfg", ns=(0, 1))
+    assert load(tmp_path / "base.cfg").get("fps_max") == "500"
+
+
+def test_exec_order_within_one_line(tmp_path):
+    (tmp_path / "foo.cfg").write_text("fps_max 400\nrate 786432\n")
+    (tmp_path / "a.cfg").write_text("exec foo; fps_max 1\n")
+    (tmp_path / "b.cfg").write_text("rate 1; fps_max 1; exec foo\n")
+    cfg_parser.clear_cache()
+    assert load(tmp_path / "a.cfg").values() == {"fps_max": "1", "rate": "786432"}
+    assert load(tmp_path / "b.cfg").values() == {"rate": "786432", "fps_max": "400"}
+
+
+def test_repo_configs_parse():
+    training = load(ROOT / "gamemode_new_user_training.cfg")
+    assert "gamemode_competitive.cfg" in training.includes
+    assert training.get("bot_quota_mode") is not None
+    profiles = cfg_parser.load_dir(ROOT / "cs2tune" / "profiles")
+    assert profiles["balanced.cfg"].get("fps_max") == "300"
+
+    entries, convars = parse_vcfg('"config"\n{\n\t"convars"\n\t{\n\t\t"fps_max"\t"240" // x\n\t}\n'
+                                  '\t"bindings" { "ESCAPE" "cancelselect" }\n}\n')
+    assert entries["config/bindings/ESCAPE"][0] == "cancelselect"
+    assert convars.get("fps_max") == "240"
+    assert convars.convars["fps_max"].location.line == 5
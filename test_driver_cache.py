@@ -0,0 +1,52 @@
+import os
+import zipfile
+
+from driver_cache import is_current, is_installed, mark_installed, sync_archive
+
+
+def write_zip(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+def test_sync_only_rewrites_changed_members(tmp_path):
+    zip_path = tmp_path / "06_NVIDIA.zip"
+    out = tmp_path / "06_NVIDIA"
+    write_zip(zip_path, {"setup.exe": b"v1", "data/big.bin": b"x" * 4096, "old.txt": b"gone"})
+    first = sync_archive(zip_path, out)
+    assert sorted(first.extracted) == ["data/big.bin", "old.txt", "setup.exe"]
+    assert is_current(zip_path, out)
+    assert not sync_archive(zip_path, out).changed
+
+    write_zip(zip_path, {"setup.exe": b"v2", "data/big.bin": b"x" * 4096})
+    os.utime(zip_path, ns=(0, 1))  # make sure the size/mtime fast path misses
+    second = sync_archive(zip_path, out)
+    assert second.extracted == ["setup.exe"]
+    assert second.removed == ["old.txt"]
+    assert (out / "setup.exe").read_bytes() == b"v2"
+    assert not (out / "old.txt").exists()
+
+
+def test_replaced_archive_is_not_treated_as_installed(tmp_path):
+    zip_path = tmp_path / "01_Intel_Chipset.zip"
+    out = tmp_path / "01_Intel_Chipset"
+    write_zip(zip_path, {"setup.exe": b"v1"})
+    mark_installed(out, sync_archive(zip_path, out).sha256)
+    assert is_installed(zip_path, out)
+
+    write_zip(zip_path, {"setup.exe": b"v1-hotfix"})
+    assert not is_installed(zip_path, out)
+
+    (out / ".installed").write_text("installed\n")  # marker from before hashes were recorded
+    assert is_installed(zip_path, out)
+
+
+def test_existing_extraction_is_adopted_without_rewriting(tmp_path):
+    zip_path = tmp_path / "07_Realtek_Audio.zip"
+    out = tmp_path / "07_Realtek_Audio"
+    write_zip(zip_path, {"setup.exe": b"audio", "readme.txt": b"hello"})
+    out.mkdir()
+    (out / "setup.exe").write_bytes(b"audio")
+    result = sync_archive(zip_path, out)
+    assert result.extracted == ["readme.txt"]
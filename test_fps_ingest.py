@@ -0,0 +1,49 @@
+import os
+from pathlib import Path
+from cs2tune.fps_ingest import ConsoleLogTailer, FpsIngest, parse_fps_line
+
+FIXTURE_LOG = Path(__file__).parent / "fixtures" / "cs2_console.log"
+
+
+def test_parse_fps_line_ignores_convars():
+    assert parse_fps_line("fps_max 999") is None
+    assert parse_fps_line("cl_showfps 2") is None
+    sample = parse_fps_line("FPS: 244.0  frametime: 4.10 ms", timestamp=1.0)
+    assert (sample.fps, sample.frame_time_ms) == (244.0, 4.10)
+    assert parse_fps_line("  250 fps").frame_time_ms == 4.0
+
+
+def test_replay_recorded_console_log():
+    ingest = FpsIngest(FIXTURE_LOG, from_end=False)
+    received = []
+    ingest.subscribe(received.append)
+    samples = ingest.poll()
+    assert [s.fps for s in samples] == [287.4, 301.9, 244.0, 312.0, 156.2]
+    assert received == samples
+    assert ingest.current_fps() == 156.2
+    assert ingest.poll() == []
+
+
+def test_tailer_resumes_from_offset_and_holds_partial_lines(tmp_path):
+    log = tmp_path / "console.log"
+    log.write_text("fps: 100\nfps: 1")
+    tailer = ConsoleLogTailer(log)
+    assert tailer.read_lines() == ["fps: 100"]
+    with open(log, "a") as f:
+        f.write("10\n")
+    assert tailer.read_lines() == ["fps: 110"]
+
+
+def test_tailer_handles_truncation_and_rotation(tmp_path):
+    log = tmp_path / "console.log"
+    log.write_text("fps: 100\nfps: 120\n")
+    tailer = ConsoleLogTailer(log)
+    tailer.read_lines()
+
+    log.write_text("fps: 90\n")  # truncated and rewritten by a new game session
+    assert tailer.read_lines() == ["fps: 90"]
+
+    rotated = tmp_path / "console.log.new"
+    rotated.write_text("fps: 80\nfps: 85\nfps: 95\n")
+    os.replace(rotated, log)
+    assert tailer.read_lines() == ["fps: 80", "fps: 85", "fps: 95"]
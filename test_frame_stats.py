@@ -0,0 +1,35 @@
+from cs2tune.frame_stats import FrameStats, QuantileSketch
+
+
+def test_sketch_quantiles_within_accuracy_and_merge():
+    a, b = QuantileSketch(), QuantileSketch()
+    for i in range(1, 501):
+        a.add(float(i))
+        b.add(float(i + 500))
+    merged = QuantileSketch().merge(a).merge(b)
+    assert merged.count == 1000
+    assert abs(merged.quantile(0.99) - 990) / 990 <= 0.011
+    assert abs(merged.quantile(0.5) - 500) / 500 <= 0.011
+
+
+def test_lows_and_stutters_over_window():
+    stats = FrameStats(windows={"10s": 10.0})
+    t = 0.0
+    for i in range(1000):
+        stats.add(25.0 if i % 100 == 99 else 4.0, timestamp=t)  # 1% of frames hitch
+        t += 0.004
+    summary = stats.summary("10s", now=t)
+    assert summary.samples == 1000
+    assert summary.stutters == 10
+    assert abs(summary.p01_low_fps - 40.0) < 1.0
+    assert summary.min_fps < 41 < summary.avg_fps < 250
+
+
+def test_window_evicts_old_samples():
+    stats = FrameStats(windows={"1s": 1.0})
+    stats.add_fps(100, timestamp=0.0)
+    stats.add_fps(200, timestamp=5.0)
+    summary = stats.summary("1s", now=5.0)
+    assert summary.samples == 1
+    assert abs(summary.avg_fps - 200) < 1e-6
+    assert stats.summary("1s", now=10.0).samples == 0
@@ -0,0 +1,44 @@
+import time
+from unittest.mock import patch
+from cs2tune.gpu_sampler import GPUSampler, FakeBackend, NvidiaSmiStreamBackend
+
+
+def test_sampler_serves_cached_reading_to_every_caller():
+    backend = FakeBackend(readings=[(65, 40, 2048, 16384)])
+    sampler = GPUSampler(backend=backend, interval=60).start()
+    try:
+        readings = [sampler.latest() for _ in range(10)]
+        assert backend.reads == 1
+        assert all(r is readings[0] for r in readings)
+        assert readings[0].temperature == 65.0
+        assert readings[0].memory_used == 2048.0
+    finally:
+        sampler.stop()
+    assert backend.closed
+
+
+def test_sampler_polls_backend_in_background():
+    backend = FakeBackend(readings=[(60, 10), (61, 20), (62, 30)])
+    sampler = GPUSampler(backend=backend, interval=0.01).start()
+    try:
+        deadline = time.time() + 2
+        while backend.reads < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert sampler.latest().temperature == 62.0
+    finally:
+        sampler.stop()
+
+
+@patch("cs2tune.gpu_sampler.open_backend", return_value=None)
+def test_sampler_without_gpu_returns_none_and_does_not_retry(mock_open):
+    sampler = GPUSampler()
+    assert sampler.latest() is None
+    assert sampler.latest() is None
+    assert mock_open.call_count == 1
+
+
+def test_parse_nvidia_smi_stream_line():
+    reading = NvidiaSmiStreamBackend.parse_line("71, 93, 5120, 16376, NVIDIA RTX 5000 Ada\n")
+    assert (reading.temperature, reading.utilization) == (71.0, 93.0)
+    assert reading.memory_total == 16376.0
+    assert reading.name == "NVIDIA RTX 5000 Ada"
@@ -0,0 +1,52 @@
+from install_journal import InstallJournal
+
+
+def test_journal_resumes_across_sessions(tmp_path):
+    path = tmp_path / "install_journal.jsonl"
+    journal = InstallJournal(path)
+    journal.extracted("06_NVIDIA.zip", "ab" * 32, ["setup.exe", "Display.Driver/helper.exe"])
+    journal.installer_started("06_NVIDIA.zip", 0, "setup.exe")
+    journal.installer_finished("06_NVIDIA.zip", 0, "installed")
+    journal.record("01_Intel_Chipset.zip", "installed", 91.25)
+    journal.reboot_pending("01_Intel_Chipset.zip")
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"event": "installer_sta')  # torn write at power loss
+
+    resumed = InstallJournal(path)
+    assert resumed.session == 2
+    assert resumed.results == {"01_Intel_Chipset.zip": "installed"}
+    state = resumed.state("06_NVIDIA.zip")
+    assert state.installers == ["setup.exe", "Display.Driver/helper.exe"]
+    assert state.finished == {0: "installed"}
+    assert resumed.state("01_Intel_Chipset.zip").session == 1
+    assert not resumed.state("01_Intel_Chipset.zip").reboot_pending
+    resumed.record("06_NVIDIA.zip", "installed", 400.0)
+    resumed.close()
+    assert InstallJournal(path).results["06_NVIDIA.zip"] == "installed"
+    resumed = InstallJournal(path)
+    resumed.finish()
+    resumed.close()
+
+    fresh = InstallJournal(path)
+    assert fresh.session == 1
+    assert fresh.results == {}
+    assert fresh.durations == {"01_Intel_Chipset.zip": 91.2, "06_NVIDIA.zip": 400.0}
+    fresh.close()
+
+
+def test_fresh_journal_drops_unfinished_run_and_forget(tmp_path):
+    path = tmp_path / "install_journal.jsonl"
+    journal = InstallJournal(path)
+    journal.record("01_Intel_Chipset.zip", "installed", 90.0)
+    journal.record("02_Intel_ME_SW.zip", "failed")
+    journal.forget("02_Intel_ME_SW.zip")
+    journal.close()
+    assert InstallJournal(path).results == {"01_Intel_Chipset.zip": "installed"}
+
+    fresh = InstallJournal(path, fresh=True)
+    assert fresh.session == 1
+    assert fresh.results == {}
+    assert fresh.durations == {"01_Intel_Chipset.zip": 90.0}
+    fresh.close()
+    assert InstallJournal(path).results == {}
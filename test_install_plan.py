@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from install_journal import InstallJournal
+from install_plan import InstallPlan, InstallScheduler, format_plan
+
+ORDER = ["chipset", "me", "igpu", "nvidia", "audio", "nahimic", "camera"]
+DEPENDS_ON = {
+    "me": ["chipset"],
+    "igpu": ["me"],
+    "nvidia": ["igpu"],
+    "audio": ["chipset"],
+    "nahimic": ["audio"],
+    "camera": ["chipset"],
+}
+REBOOT = {"chipset", "me"}
+
+
+def make_plan(**estimates):
+    return InstallPlan(ORDER, DEPENDS_ON, REBOOT, estimates)
+
+
+def test_plan_rejects_cycles_and_unknown_deps():
+    with pytest.raises(ValueError):
+        InstallPlan(["a", "b"], {"a": ["b"], "b": ["a"]})
+    with pytest.raises(ValueError):
+        InstallPlan(["a"], {"a": ["zz"]})
+
+
+def test_critical_path_and_estimate():
+    plan = make_plan(nvidia=400)
+    path, _ = plan.critical_path()
+    assert path == ["chipset", "me", "igpu", "nvidia"]
+    assert plan.simulate(workers=3) < plan.simulate(workers=1)
+    assert "Critical path: chipset → me → igpu → nvidia" in format_plan(plan, 2)
+
+
+def test_scheduler_overlaps_peripherals_and_isolates_reboots(tmp_path):
+    lock = threading.Lock()
+    running, overlaps, order = set(), [], []
+
+    def install(name):
+        with lock:
+            if running:
+                overlaps.append((name, set(running)))
+            running.add(name)
+            order.append(name)
+        time.sleep(0.02)
+        with lock:
+            running.discard(name)
+        return "failed" if name == "audio" else "installed"
+
+    reboots = []
+    journal = InstallJournal(tmp_path / "journal.jsonl")
+    results = InstallScheduler(make_plan(), install, workers=3, journal=journal,
+                               on_reboot=reboots.append).run()
+
+    assert reboots == ["chipset", "me"]
+    assert all(name not in REBOOT and not running & REBOOT for name, running in overlaps)
+    assert overlaps  # camera overlapped another peripheral install
+    assert order.index("camera") < order.index("me")  # barriers wait for ready work
+    assert results["nahimic"] == "blocked"
+    assert results["nvidia"] == "installed"
+    assert list(results) == ORDER
+
+    # A rerun retries the failed package and its dependents only
+    rerun = []
+    InstallScheduler(make_plan(), lambda n: rerun.append(n) or "installed",
+                     journal=InstallJournal(tmp_path / "journal.jsonl")).run()
+    assert sorted(rerun) == ["audio", "nahimic"]
+
+
+def test_package_without_installer_blocks_its_dependents():
+    statuses = {"missing": "missing"}
+    results = InstallScheduler(
+        InstallPlan(["empty", "missing", "child", "other"], {"child": ["empty"], "other": ["missing"]}),
+        lambda n: "no_installer" if n == "empty" else statuses.get(n, "installed")).run()
+    assert results == {"empty": "no_installer", "missing": "missing", "child": "blocked", "other": "installed"}
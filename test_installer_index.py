@@ -0,0 +1,40 @@
+from installer_index import rank, select, silent_args
+
+NVIDIA_MEMBERS = [
+    "setup.exe",
+    "setup.cfg",
+    "Display.Driver/nvidia-smi.exe",
+    "Display.Driver/NvContainerSetup.exe",
+    "PhysX/PhysX_9.23.1019_SystemSoftware.exe",
+    "NVI2/NVNetworkService.exe",
+    "NVI2/uninstall.exe",
+    "ShadowPlay/setup.exe",
+]
+
+
+def test_nvidia_picks_root_setup_over_helpers():
+    assert select("06_NVIDIA_VGA_DCH_STUDIO.zip", NVIDIA_MEMBERS) == ["setup.exe"]
+    ranked = rank("06_NVIDIA_VGA_DCH_STUDIO.zip", NVIDIA_MEMBERS)
+    assert ranked[-1].score < 0
+    assert silent_args("06_NVIDIA_VGA_DCH_STUDIO.zip") == ["-s", "-noreboot", "-noeula"]
+
+
+def test_intel_prefers_vendor_entry_point_and_skips_redistributables():
+    members = [
+        "Chipset/vcredist_x64.exe",
+        "Chipset/Readme.txt",
+        "SetupChipset.exe",
+        "Tools/Install.exe",
+    ]
+    assert select("01_Intel_Chipset.zip", members) == ["SetupChipset.exe"]
+
+
+def test_no_installer_when_only_helpers():
+    assert select("11_Camera.zip", ["bin/uninstall.exe", "readme.txt"]) == []
+
+
+def test_oddly_named_only_installer_is_still_selected():
+    assert select("11_Camera.zip", ["drivers/Foo_Tool_v2.exe", "drivers/readme.txt"]) == ["drivers/Foo_Tool_v2.exe"]
+    # A real helper next to it is never preferred, whatever its depth
+    members = ["uninstall.exe", "bin/x64/CamDrv_2231.exe", "bin/vcredist_x64.exe"]
+    assert select("99_Unknown.zip", members) == ["bin/x64/CamDrv_2231.exe"]
@@ -0,0 +1,73 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import installer_runner
+from installer_runner import ExecutionProfile, run_installer
+
+FAKE = Path(__file__).parent / "fixtures" / "fake_installer.py"
+
+
+def fake(*args):
+    return [sys.executable, str(FAKE), *args]
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(installer_runner, "POLL_INTERVAL", 0.05)
+
+
+def test_success_logs_output_and_switches(tmp_path):
+    log = tmp_path / "logs" / "setup.log"
+    result = run_installer(fake("-s", "-noreboot"), ExecutionProfile(), log)
+    assert result.status == "installed" and result.returncode == 0
+    text = log.read_text()
+    assert "[out] fake installer starting, switches: -s -noreboot" in text
+    assert "[err] warning: fake warning" in text
+    assert "# installed (exit 0)" in text
+
+
+def test_exit_codes_map_to_reboot_and_failure(tmp_path):
+    if sys.platform == "win32":
+        assert run_installer(fake("--exit-code", "3010")).status == "reboot_required"
+    # POSIX truncates exit statuses to 8 bits, so use a code that survives
+    profile = ExecutionProfile(reboot_codes=frozenset({194}))
+    assert run_installer(fake("--exit-code", "194"), profile).status == "reboot_required"
+    failed = run_installer(fake("--exit-code", "1603"))
+    assert failed.status == "failed" and not failed.ok
+    custom = ExecutionProfile(success_codes=frozenset({0, 14}))
+    assert run_installer(fake("--exit-code", "14"), custom).status == "installed"
+
+
+def test_timeout_kills_installer():
+    result = run_installer(fake("--sleep", "30"), ExecutionProfile(timeout=0.5))
+    assert result.status == "timeout"
+    assert result.duration < 10
+
+
+@pytest.mark.skipif(installer_runner.psutil is None, reason="hang watchdog needs psutil")
+def test_watchdog_kills_silent_idle_installer_but_not_busy_one():
+    profile = ExecutionProfile(hang_timeout=0.6)
+    assert run_installer(fake("--lines", "0", "--hang"), profile).status == "hung"
+    assert run_installer(fake("--lines", "0", "--busy", "1.2"), profile).status == "installed"
+
+
+@pytest.mark.skipif(installer_runner.psutil is None, reason="hang watchdog needs psutil")
+def test_watchdog_counts_installer_service_activity(monkeypatch):
+    # msiexec /i and MSI based setups wait silently while the Windows
+    # Installer service, which is not their child, does the work
+    profile = ExecutionProfile(hang_timeout=0.6)
+    idle = fake("--lines", "0", "--sleep", "1.5")
+    assert run_installer(idle, profile).status == "hung"
+
+    service = subprocess.Popen(fake("--lines", "0", "--busy", "5"), stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    try:
+        monkeypatch.setattr(installer_runner, "_service_processes",
+                            lambda exclude: [installer_runner.psutil.Process(service.pid)])
+        assert run_installer(idle, profile).status == "installed"
+    finally:
+        service.kill()
+        service.wait()
@@ -0,0 +1,41 @@
+from cs2tune.netcon import NetconClient, StandInConsole
+from cs2tune.profile_apply import apply_profile
+
+
+def test_batch_is_applied_and_acknowledged():
+    with StandInConsole() as console, NetconClient(port=console.port) as client:
+        result = client.send_batch(["fps_max 300", 'r_shadows "0"'])
+        assert result.ok and result.sent == 2
+        assert result.ack_ms is not None and result.ack_ms >= result.write_ms
+        assert console.convars == {"fps_max": "300", "r_shadows": "0"}
+        assert console.commands[-1].startswith("echo cs2tune_ack_")
+        assert client.send_batch(["fps_max 400"]).ack_ms is not None
+        assert len(client.latencies) == 2
+
+
+def test_profile_delta_goes_live(tmp_path):
+    autoexec = tmp_path / "autoexec.cfg"
+    (tmp_path / "a.cfg").write_text("fps_max 300\nr_shadows 0\n")
+    (tmp_path / "b.cfg").write_text("fps_max 300\nr_shadows 1\n")
+    apply_profile(tmp_path / "a.cfg", autoexec)
+    delta = apply_profile(tmp_path / "b.cfg", autoexec).delta
+    with StandInConsole() as console, NetconClient(port=console.port) as client:
+        assert client.send_batch(delta.commands()).ok
+        assert console.commands[:-1] == ["r_shadows 1"]
+
+
+def test_reconnects_and_reports_unreachable_console():
+    console = StandInConsole().start()
+    client = NetconClient(port=console.port, timeout=0.5)
+    assert client.send_batch(["fps_max 1"]).ok
+    port = console.port
+    console.stop()
+    restarted = StandInConsole(port=port).start()
+    try:
+        assert client.send_batch(["fps_max 2"]).ok
+        assert restarted.convars == {"fps_max": "2"}
+    finally:
+        restarted.stop()
+    failed = client.send_batch(["fps_max 3"])
+    assert not failed.ok and failed.error
+    client.close()
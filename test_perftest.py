@@ -0,0 +1,103 @@
+from pathlib import Path
+from perftest import build_report, parse_gpu_csv, parse_console_fps, format_report
+
+FIXTURES = Path(__file__).parent / "fixtures" / "perftest"
+
+
+def test_parse_gpu_csv_uses_average_column():
+    passes = parse_gpu_csv(FIXTURES / "perftest_usersettings.csv")
+    assert passes["Opaque"] == 1.95
+    assert len(passes) == 6
+
+
+def test_parse_console_fps_uses_last_perftest_block():
+    lines = (FIXTURES / "console.log").read_text().splitlines()
+    fps = parse_console_fps(lines)
+    assert fps["usersettings"] == 248.3
+    assert fps["gameonly"] == 262.5
+    assert len(fps) == 5
+
+
+def test_build_report_classifies_and_computes_deltas():
+    report = build_report(FIXTURES, FIXTURES / "console.log")
+    scenarios = {s["name"]: s for s in report["scenarios"]}
+    baseline = scenarios["usersettings"]
+    assert baseline["gpu_ms"] == 4.01
+    assert baseline["bound"] == "GPU"  # 4.01 ms of GPU work in a 4.03 ms frame
+    assert scenarios["uionly"]["bound"] == "CPU"
+    half = scenarios["halfresolution"]
+    assert half["fps_delta_pct"] == round((331.0 - 248.3) / 248.3 * 100, 2)
+    assert half["gpu_ms_delta"] < 0
+    assert report["verdict"] == "GPU"
+    assert "Half resolution" in format_report(report)
+
+
+def test_build_report_without_results(tmp_path):
+    report = build_report(tmp_path)
+    assert all(s["gpu_ms"] is None and s["fps"] is None for s in report["scenarios"])
+    assert report["verdict"] == "unknown"
+
+
+def test_mann_whitney_u():
+    from perftest_history import mann_whitney_u
+    u, p = mann_whitney_u([1.0, 2.0, 3.0, 4.0, 5.0], [6.0, 7.0, 8.0, 9.0, 10.0])
+    assert u == 0.0
+    assert 0.01 < p < 0.02  # scipy (normal approximation): 0.0122
+    assert mann_whitney_u([4.0, 4.0], [4.0, 4.0])[1] == 1.0
+
+
+def test_history_flags_regression_between_contexts(tmp_path):
+    from perftest_history import PerftestHistory
+    history = PerftestHistory(tmp_path / "history.db")
+    report = build_report(FIXTURES, FIXTURES / "console.log")
+    for jitter in (0.0, 0.01, -0.01, 0.02):
+        for s in report["scenarios"]:
+            s["frame_times"] = [4.0 + jitter + i * 0.001 for i in range(5)]
+        history.store(report, driver_set="nvidia_551", profile="max_fps", hardware="rig")
+    for jitter in (0.0, 0.01, -0.01, 0.02):
+        for s in report["scenarios"]:
+            s["frame_times"] = [4.4 + jitter + i * 0.001 for i in range(5)]
+        history.store(report, driver_set="nvidia_560", profile="max_fps", hardware="rig")
+    baseline, candidate = history.pick_pair()
+    assert baseline["driver_set"] == "nvidia_551"
+    assert candidate["driver_set"] == "nvidia_560"
+    results = history.compare(baseline, candidate)
+    assert len(results) == 5
+    assert all(r["status"] == "REGRESSION" and r["samples"] == (20, 20) for r in results)
+
+
+def _console_log(path, scale):
+    """The fixture console.log with every perftest FPS reading scaled by `scale`."""
+    import re
+    text = (FIXTURES / "console.log").read_text()
+    start = text.index("perftest output starts here.")
+    body = re.sub(r"fps:\s+([\d.]+)", lambda m: f"fps:  {float(m.group(1)) * scale:.1f}", text[start:])
+    path.write_text(text[:start] + body)
+    return path
+
+
+def test_history_needs_repeated_runs_of_real_reports(tmp_path):
+    from perftest_history import MIN_SAMPLES, PerftestHistory, format_comparison
+    history = PerftestHistory(tmp_path / "history.db")
+
+    def store(driver_set, scale):
+        log = _console_log(tmp_path / "console.log", scale)
+        history.store(build_report(FIXTURES, log), driver_set=driver_set, profile="max_fps", hardware="rig")
+
+    # One real run per side: one cl_printfps sample per scenario
+    store("nvidia_551", 1.0)
+    store("nvidia_560", 0.85)
+    baseline, candidate = history.pick_pair()
+    results = history.compare(baseline, candidate)
+    assert results and all(r["samples"] == (1, 1) and r["p"] is None for r in results)
+    assert all(r["status"].startswith("insufficient samples") for r in results)
+    assert "fewer than 4 samples" in format_comparison(baseline, candidate, results)
+
+    # Repeating the perftest in each configuration pools enough samples
+    for i in range(1, MIN_SAMPLES):
+        store("nvidia_551", 1.0 + i * 0.002)
+        store("nvidia_560", 0.85 + i * 0.002)
+    baseline, candidate = history.pick_pair()
+    results = history.compare(baseline, candidate)
+    assert all(r["samples"] == (MIN_SAMPLES, MIN_SAMPLES) for r in results)
+    assert all(r["status"] == "REGRESSION" and r["p"] < 0.05 for r in results)
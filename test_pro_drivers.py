@@ -39,3 +39,78 @@ def test_main_runs_and_exits(mon_run, mock_admin, capsys):
     sys.argv = sys_argv_backup
     captured = capsys.readouterr()
     assert "Detected driver ZIPs" in captured.out
+
+
+def test_extraction_pipeline_extracts_ahead_in_order(tmp_path):
+    import zipfile
+    from pro_drivers_app import ExtractionPipeline
+    names = [f"{i:02d}_Driver.zip" for i in range(1, 5)]
+    for name in names:
+        with zipfile.ZipFile(tmp_path / name, "w") as archive:
+            archive.writestr("setup/setup.exe", b"MZ" + name.encode())
+            if name.startswith("04"):
+                archive.writestr("../escape.txt", b"nope")
+    with patch("pro_drivers_app.DRIVER_FOLDER", tmp_path):
+        pipeline = ExtractionPipeline(names, workers=2).start()
+        try:
+            results = [pipeline.result(name) for name in names]
+        finally:
+            pipeline.shutdown()
+    assert results == [True, True, True, False]
+    assert (tmp_path / "01_Driver" / "setup" / "setup.exe").read_bytes() == b"MZ01_Driver.zip"
+    assert not (tmp_path / "04_Driver" / ".manifest.json").exists()
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_resume_reinstalls_replaced_and_added_archives(tmp_path):
+    import zipfile
+    from install_journal import InstallJournal
+    from install_plan import InstallPlan, InstallScheduler
+    from installer_runner import InstallerResult
+    from pro_drivers_app import drop_stale_results
+
+    def write_zip(name, payload):
+        with zipfile.ZipFile(tmp_path / name, "w") as archive:
+            archive.writestr("setup.exe", payload)
+
+    ran = []
+
+    def fake_run_installer(command, profile, log_path, cwd=None):
+        name = Path(cwd).name
+        ran.append(name)
+        status = "failed" if name == "B" and ran.count("B") == 1 else "installed"
+        return InstallerResult(command=list(command), status=status, log_path=log_path)
+
+    def run(journal):
+        def install_one(zip_file):
+            if not (tmp_path / zip_file).exists():
+                return "missing"
+            return extract_and_install(zip_file, journal=journal, handle_reboot=False)
+        plan = InstallPlan(["A.zip", "B.zip", "C.zip", "D.zip"], {})
+        return InstallScheduler(plan, install_one, workers=1, journal=journal).run()
+
+    for name in ("A.zip", "B.zip", "D.zip"):
+        write_zip(name, b"MZ v1")
+    journal_path = tmp_path / "journal.jsonl"
+    with patch("pro_drivers_app.DRIVER_FOLDER", tmp_path), \
+            patch("pro_drivers_app.INSTALLER_LOG_DIR", tmp_path / "logs"), \
+            patch("pro_drivers_app.platform.system", return_value="Windows"), \
+            patch("pro_drivers_app.run_installer", side_effect=fake_run_installer):
+        journal = InstallJournal(journal_path)
+        first = run(journal)
+        journal.close()
+        assert first == {"A.zip": "installed", "B.zip": "failed", "C.zip": "missing", "D.zip": "installed"}
+        assert ran == ["A", "B", "D"]
+
+        # A is replaced by a new build and the missing C is added
+        write_zip("A.zip", b"MZ v2, a newer build")
+        write_zip("C.zip", b"MZ v1")
+        journal = InstallJournal(journal_path)
+        assert journal.results == first
+        drop_stale_results(journal)
+        assert journal.results == {"B.zip": "failed", "D.zip": "installed"}
+        second = run(journal)
+        journal.close()
+
+    assert second == {name: "installed" for name in ("A.zip", "B.zip", "C.zip", "D.zip")}
+    assert ran == ["A", "B", "D", "A", "B", "C"]
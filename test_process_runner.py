@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from cs2tune.process_runner import run, start
+
+FAKE = Path(__file__).parent / "fixtures" / "fake_installer.py"
+
+
+def test_streams_lines_and_exit_status():
+    lines = []
+    code = run([sys.executable, str(FAKE), "--lines", "3", "--exit-code", "4"], write=lines.append)
+    assert code == 4
+    assert lines[1:4] == ["installing component 0", "installing component 1", "installing component 2"]
+    assert "warning: fake warning" in lines
+
+
+def test_scrollback_is_bounded():
+    handle = start([sys.executable, str(FAKE), "--lines", "50"], scrollback=10)
+    assert handle.wait(timeout=30) == 0
+    assert len(handle.lines) == 10
+    assert handle.lines[-1] == "warning: fake warning"
+    assert len(handle.drain()) == 10 and handle.dropped > 0
+
+
+def test_cancel_terminates_process():
+    handle = start([sys.executable, str(FAKE), "--hang"])
+    handle.cancel(grace=1)
+    assert handle.wait(timeout=30) != 0
+    assert handle.cancelled
+
+
+def test_missing_command_raises_from_wait():
+    handle = start(["definitely-not-a-real-command-cs2tune"])
+    with pytest.raises(OSError):
+        handle.wait(timeout=30)
+    assert handle.returncode is None
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+from cs2tune import process_watcher
+from cs2tune.process_watcher import ProcessWatcher
+
+
+def test_detects_start_and_stop_of_the_watched_process(monkeypatch):
+    monkeypatch.setattr(process_watcher, "WAIT_SLICE", 0.2)
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    target = {"pid": None}
+    events = []
+    watcher = ProcessWatcher(rescan_interval=0.1, match=lambda info: info["pid"] == target["pid"])
+    watcher.subscribe(lambda event, pid: events.append((event, pid, watcher.scans)))
+    try:
+        assert not watcher.start().running
+        target["pid"] = child.pid
+        assert watcher.wait_until_running(timeout=5)
+        assert watcher.pid == child.pid
+
+        child.kill()
+        child.wait()
+        assert watcher.wait_until_stopped(timeout=5)
+        assert not watcher.running and watcher.pid is None
+        assert [(event, pid) for event, pid, _ in events] == [("started", child.pid), ("stopped", child.pid)]
+        # While the process was alive only its PID was watched, with no rescans
+        assert events[0][2] == events[1][2]
+    finally:
+        watcher.stop()
+        if child.poll() is None:
+            child.kill()
+            child.wait()
+
+
+def test_restart_forgets_a_process_that_exited_while_stopped(monkeypatch):
+    monkeypatch.setattr(process_watcher, "WAIT_SLICE", 0.2)
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    watcher = ProcessWatcher(rescan_interval=0.1, match=lambda info: info["pid"] == child.pid)
+    try:
+        assert watcher.start().running
+        watcher.stop()
+        child.kill()
+        child.wait()
+
+        watcher.start()
+        assert not watcher.running and watcher.pid is None
+        assert watcher.wait_until_stopped(timeout=0)
+    finally:
+        watcher.stop()
+        if child.poll() is None:
+            child.kill()
+            child.wait()
@@ -0,0 +1,37 @@
+import os
+
+from cs2tune.profile_apply import SECTION_END, SECTION_START, apply_profile, replace_section
+
+
+def test_apply_writes_only_the_delta(tmp_path):
+    autoexec = tmp_path / "autoexec.cfg"
+    autoexec.write_text("// mine\nsensitivity 1.2\nfps_max 200\n")
+    low = tmp_path / "low.cfg"
+    low.write_text("fps_max 300\nr_shadows 0\n")
+    high = tmp_path / "high.cfg"
+    high.write_text("fps_max 300\nr_shadows 1\ncl_hud_color \"4\"\n")
+
+    first = apply_profile(low, autoexec, backup=tmp_path / "autoexec.cfg.backup")
+    assert first.written
+    assert first.delta.changed == {"fps_max": ("200", "300")}
+    assert first.delta.batch() == "fps_max 300; r_shadows 0"
+    assert (tmp_path / "autoexec.cfg.backup").read_text().startswith("// mine")
+    text = autoexec.read_text()
+    assert text.startswith("// mine\nsensitivity 1.2\n")
+    assert SECTION_START in text and SECTION_END in text
+
+    mtime = autoexec.stat().st_mtime_ns
+    again = apply_profile(low, autoexec)
+    assert not again.written and again.delta.empty
+    assert autoexec.stat().st_mtime_ns == mtime
+
+    switched = apply_profile(high, autoexec)
+    assert switched.delta.commands() == ["r_shadows 1", "cl_hud_color 4"]
+    assert autoexec.read_text().count(SECTION_START) == 1
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_unterminated_section_is_replaced_not_skipped():
+    text = f"bind x y\n{SECTION_START}\nfps_max 1\n"
+    result = replace_section(text, "fps_max 2\n")
+    assert result == f"bind x y\n{SECTION_START}\nfps_max 2\n{SECTION_END}\n"
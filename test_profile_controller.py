@@ -0,0 +1,38 @@
+import math
+
+from cs2tune.profile_controller import (
+    GPU_SAVER, ControllerConfig, ProfileController, ThresholdPolicy, compare,
+)
+from cs2tune.telemetry_snapshot import TelemetrySnapshot
+
+
+def trace(temps, fps=250.0, usage=80.0, step=1.0):
+    return [TelemetrySnapshot(timestamp=i * step, fps=fps, gpu_temp=t, gpu_usage=usage, cpu_temp=60.0)
+            for i, t in enumerate(temps)]
+
+
+def test_noise_around_threshold_does_not_flap():
+    temps = [84.0 + 3.0 * math.sin(i * 1.3) + (2.0 if i % 7 == 0 else 0.0) for i in range(600)]
+    scores = compare(trace(temps), {"threshold": ThresholdPolicy, "controller": ProfileController})
+    assert scores["threshold"].switches >= 10
+    assert scores["controller"].switches <= 2
+
+
+def test_rising_trend_switches_before_the_limit():
+    temps = [70.0 + 0.25 * i for i in range(120)]  # +15°C per minute
+    controller = ProfileController(ControllerConfig(horizon=20.0))
+    switched_at = None
+    for snapshot in trace(temps):
+        if controller.update(snapshot) == GPU_SAVER:
+            switched_at = snapshot
+            break
+    assert switched_at is not None and switched_at.gpu_temp < 85.0
+    assert controller.state.predicted_temp >= 85.0
+
+
+def test_replay_scores_time_over_limit():
+    temps = [70.0 + 0.25 * i for i in range(120)] + [100.0] * 300
+    scores = compare(trace(temps), {"threshold": ThresholdPolicy, "controller": ProfileController})
+    assert scores["controller"].over_limit_s < scores["threshold"].over_limit_s
+    assert scores["controller"].profile_time[GPU_SAVER] > 0
+    assert "switches" in scores["controller"].format("controller")
@@ -0,0 +1,85 @@
+import pytest
+
+from cs2tune.profile_controller import default_definitions
+from cs2tune.profile_rules import (
+    RuleError, RuleSet, compile_condition, load_rules, metrics_from_snapshot,
+)
+from cs2tune.telemetry_snapshot import TelemetrySnapshot
+
+
+def test_conditions_compile_to_predicates():
+    assert compile_condition("gpu_temp", "< 80")({"gpu_temp": 79.9})
+    assert not compile_condition("gpu_temp", "< 80")({"gpu_temp": 80})
+    in_band = compile_condition("cpu", "> 60 and <= 80")
+    assert in_band({"cpu_temp": 70}) and not in_band({"cpu_temp": 85})
+    assert compile_condition("vram", "> 6GB")({"vram_used": 7.5})
+    assert not compile_condition("fps", "> 0")({"fps": None})
+    assert not compile_condition("fps", "> 0")({})
+    with pytest.raises(RuleError):
+        compile_condition("fps", "about 200")
+
+
+def test_priority_hold_and_derived_metrics():
+    rules = RuleSet.from_definitions(dict(default_definitions(), stutter={
+        "priority": 75, "conditions": {"frame_time_p1": "> 10ms"},
+    }), default="max_fps")
+    assert rules.names == ["gpu_saver", "stutter", "balanced", "max_fps"]
+
+    snapshot = TelemetrySnapshot(timestamp=0, fps=250, gpu_temp=70, gpu_usage=80,
+                                 cpu_temp=60, fps_p1_low=80)
+    values = metrics_from_snapshot(snapshot, gpu_temp_forecast=70)
+    assert values["frame_time_p1_ms"] == 12.5
+    assert rules.select(values) == "stutter"
+    assert rules.matching(values) == ["stutter", "max_fps"]
+
+    warm = dict(values, gpu_temp_forecast=82, frame_time_p1_ms=None)
+    assert rules.select(warm) == "max_fps"
+    assert rules.select(warm, current="gpu_saver") == "gpu_saver"
+    assert rules.select(dict(warm, gpu_usage=96)) == "gpu_saver"
+
+
+def test_profile_directives_override_builtins(tmp_path):
+    (tmp_path / "max_fps.cfg").write_text("fps_max 999\n")
+    (tmp_path / "gpu_saver.cfg").write_text("fps_max 240\n")
+    (tmp_path / "quiet.cfg").write_text(
+        "// Quiet profile\n// @priority 200\n// @when cpu_temp > 90\n// @when cpu_temp < 120\n"
+        "// @description keep the CPU fans down\nfps_max 144\n// @when ignored after the header\n")
+    rules = load_rules(tmp_path, default_definitions(), default="max_fps")
+    assert rules.names == ["quiet", "gpu_saver", "max_fps"]   # no balanced.cfg
+    assert rules["quiet"].conditions == {"cpu_temp": "> 90 and < 120"}
+    assert rules["quiet"].description == "keep the CPU fans down"
+    assert rules.select({"cpu_temp": 95, "gpu_temp_forecast": 90}) == "quiet"
+
+    (tmp_path / "bad.cfg").write_text("// @when cpu_temp\n")
+    with pytest.raises(RuleError):
+        load_rules(tmp_path)
+
+
+def test_profile_conditions_replace_builtin_hold_and_match(tmp_path):
+    (tmp_path / "max_fps.cfg").write_text("fps_max 999\n")
+    (tmp_path / "gpu_saver.cfg").write_text("// @when gpu_temp_forecast >= 75\nfps_max 240\n")
+    rules = load_rules(tmp_path, default_definitions(), default="max_fps")
+    saver = rules["gpu_saver"]
+    assert saver.conditions == {"gpu_temp_forecast": ">= 75"}
+    assert saver.hold == {} and saver.match == "all"
+    assert saver.priority == 100  # not overridden, so the built-in priority stays
+
+    # No flapping: entry and hold agree at 77 °C
+    warm = {"gpu_temp_forecast": 77, "gpu_usage": 50}
+    assert rules.select(warm) == "gpu_saver"
+    assert rules.select(warm, current="gpu_saver") == "gpu_saver"
+
+
+def test_p1_low_without_frame_samples_is_missing():
+    rules = RuleSet.from_definitions({
+        "stutter": {"priority": 10, "conditions": {"p1_low": "< 100"}},
+        "max_fps": {},
+    }, default="max_fps")
+    before = metrics_from_snapshot(TelemetrySnapshot(timestamp=0, fps=250, gpu_temp=70, gpu_usage=80, cpu_temp=60))
+    assert before["fps_p1_low"] is None and before["frame_time_p1_ms"] is None
+    assert rules.select(before) == "max_fps"
+
+    after = metrics_from_snapshot(TelemetrySnapshot(timestamp=1, fps=250, gpu_temp=70, gpu_usage=80,
+                                                    cpu_temp=60, fps_p1_low=60))
+    assert after["fps_p1_low"] == 60
+    assert rules.select(after) == "stutter"
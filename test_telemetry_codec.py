@@ -0,0 +1,49 @@
+import struct
+
+import pytest
+
+from cs2tune.telemetry_codec import (FIELD, HEADER, SCHEMA_FIELDS, SCHEMA_VERSION, FrameDecodeError,
+                                     decode_frame, encode_frame)
+
+
+def test_round_trip_with_every_field():
+    payload = {"samples": 3, "min": {}, "max": {}}
+    for i, field in enumerate(SCHEMA_FIELDS):
+        payload[field] = 100.5 + i
+        payload["min"][field] = 90.25 + i
+        payload["max"][field] = 110.75 + i
+    data = encode_frame(payload, seq=7, timestamp=1234.5)
+    assert len(data) == HEADER.size + FIELD.size * len(SCHEMA_FIELDS)
+    assert data[1] == (1 << len(SCHEMA_FIELDS)) - 1
+
+    decoded = decode_frame(data)
+    assert decoded == {**payload, "seq": 7, "timestamp": 1234.5}
+
+
+def test_partial_mask_skips_missing_fields():
+    payload = {"fps": 240.0, "vram": 6.5, "min": {"fps": 200.0}, "max": {"fps": 300.0}, "samples": 2}
+    data = encode_frame(payload, seq=1, timestamp=0.0)
+    assert data[1] == (1 << SCHEMA_FIELDS.index("fps")) | (1 << SCHEMA_FIELDS.index("vram"))
+    assert len(data) == HEADER.size + 2 * FIELD.size
+
+    decoded = decode_frame(data)
+    assert set(decoded) - {"min", "max", "samples", "seq", "timestamp"} == {"fps", "vram"}
+    assert (decoded["fps"], decoded["min"]["fps"], decoded["max"]["fps"]) == (240.0, 200.0, 300.0)
+    # Without min/max the mean stands in for both
+    assert (decoded["vram"], decoded["min"]["vram"], decoded["max"]["vram"]) == (6.5, 6.5, 6.5)
+
+
+def test_sequence_and_sample_count_are_clamped_to_header_width():
+    decoded = decode_frame(encode_frame({"fps": 1.0, "samples": 70000}, seq=2 ** 32 + 5, timestamp=0.0))
+    assert decoded["samples"] == 0xFFFF
+    assert decoded["seq"] == 5
+
+
+def test_unknown_version_and_truncated_frames_are_rejected():
+    data = encode_frame({"fps": 144.0, "temp": 70.0}, seq=1, timestamp=0.0)
+    with pytest.raises(FrameDecodeError, match="version"):
+        decode_frame(struct.pack("<B", SCHEMA_VERSION + 1) + data[1:])
+    with pytest.raises(FrameDecodeError, match="too short"):
+        decode_frame(data[:HEADER.size - 1])
+    with pytest.raises(FrameDecodeError, match="truncated"):
+        decode_frame(data[:-1])
@@ -0,0 +1,71 @@
+from cs2tune.telemetry_fanout import (
+    MAX_RATE, MIN_RATE, Subscription, TelemetryFanout, parse_subscription,
+)
+
+FIELDS = ("fps", "temp", "load")
+
+
+def test_parse_subscription_rejects_malformed_payloads():
+    assert parse_subscription({"rate": "10", "fields": "fps, temp"}) == (10.0, ["fps", "temp"], "json")
+    assert parse_subscription({"rate": "fast"}) == (None, None, "json")
+    assert parse_subscription({"rate": float("inf")})[0] is None
+    assert parse_subscription({"fields": ["fps", 3, None]})[1] == ["fps"]
+    assert parse_subscription({"fields": 7})[1] is None
+    assert parse_subscription("not a dict") == (None, None, "json")
+
+    fanout = TelemetryFanout(FIELDS)
+    sub = fanout.subscribe("a", *parse_subscription({"fields": "fps"}))
+    assert sub.fields == ("fps",)  # not ("f", "p", "s") -> all fields
+
+
+def test_subscription_decimates_to_min_max_mean():
+    sub = Subscription(("fps", "temp"), rate=2.0)
+    for fps, temp in ((100, 70), (200, 72), (300, None)):
+        sub.add({"fps": fps, "temp": temp, "load": 99})
+    payload = sub.flush(now=0.0)
+    assert payload["fps"] == 200.0
+    assert payload["temp"] == 71.0  # mean over the samples that had a temperature
+    assert payload["min"] == {"fps": 100, "temp": 70}
+    assert payload["max"] == {"fps": 300, "temp": 72}
+    assert payload["samples"] == 3 and payload["seq"] == 1
+    assert "load" not in payload
+
+    # Accumulators reset after a flush
+    sub.add({"fps": 50, "temp": 60})
+    payload = sub.flush(now=0.5)
+    assert payload["fps"] == 50.0 and payload["samples"] == 1 and payload["seq"] == 2
+
+
+def test_fanout_rate_limits_each_subscriber():
+    fanout = TelemetryFanout(FIELDS, default_rate=2.0)
+    fanout.subscribe("fast", rate=10.0)
+    fanout.subscribe("slow")
+    fanout.subscribe("clamped", rate=1000.0)
+    assert fanout.subscribers["clamped"].rate == MAX_RATE
+    assert TelemetryFanout(FIELDS).subscribe("x", rate=0.0).rate == MIN_RATE
+    assert fanout.sample_rate == MAX_RATE
+
+    sent = {"fast": 0, "slow": 0}
+    for tick in range(106):  # just over 1 s at 100 Hz
+        now = tick * 0.01
+        fanout.push({"fps": 200.0 + tick, "temp": 70.0, "load": 50.0})
+        for sid, _, payload in fanout.due(now):
+            if sid in sent:
+                sent[sid] += 1
+    assert sent["fast"] == 11  # t=0, 0.1, ..., 1.0
+    assert sent["slow"] == 3   # t=0, 0.5, 1.0
+
+    fanout.unsubscribe("clamped")
+    fanout.unsubscribe("fast")
+    assert fanout.sample_rate == 2.0
+
+
+def test_fanout_does_not_burst_after_a_stall():
+    sub = Subscription(("fps",), rate=10.0)
+    sub.add({"fps": 1})
+    assert sub.flush(0.0) is not None
+    sub.add({"fps": 2})
+    assert sub.flush(5.0) is not None   # long stall
+    sub.add({"fps": 3})
+    assert sub.flush(5.01) is None      # next frame is one interval later, not immediately
+    assert sub.flush(5.1) is not None
@@ -0,0 +1,52 @@
+import numpy as np
+
+from cs2tune.telemetry_recorder import SegmentReader, TelemetryHistory, TelemetryRecorder, list_sessions
+
+
+def _record(tmp_path, rows, segment_rows=4):
+    recorder = TelemetryRecorder(tmp_path, session="s1", segment_rows=segment_rows)
+    for i in range(rows):
+        recorder.append({"timestamp": 100.0 + i, "fps": 200.0 + i, "gpu_temp": 60.0 + i})
+    recorder.close()
+    return recorder
+
+
+def test_round_trip_across_segment_rotation(tmp_path):
+    recorder = _record(tmp_path, 10)
+    segments = sorted(recorder.directory.glob("segment_*.tlm"))
+    assert [SegmentReader(p).count for p in segments] == [4, 4, 2]
+
+    history = TelemetryHistory("s1", tmp_path)
+    assert list_sessions(tmp_path) == ["s1"]
+    assert history.time_range == (100.0, 109.0)
+    data = history.slice()
+    assert list(data["timestamp"]) == [100.0 + i for i in range(10)]
+    assert list(data["fps"]) == [200.0 + i for i in range(10)]
+    assert not data["cpu_temp"].any()  # missing columns are recorded as 0
+
+
+def test_slice_boundaries_are_inclusive_across_segments(tmp_path):
+    _record(tmp_path, 10)
+    history = TelemetryHistory("s1", tmp_path)
+
+    # 103..104 straddles the first rotation, 103.5..107 the second
+    assert list(history.slice(103.0, 104.0)["timestamp"]) == [103.0, 104.0]
+    assert list(history.slice(103.5, 108.0, columns=["gpu_temp"])["gpu_temp"]) == [64.0, 65.0, 66.0, 67.0, 68.0]
+    assert list(history.slice(end=100.0)["timestamp"]) == [100.0]
+    assert list(history.slice(start=109.0)["timestamp"]) == [109.0]
+    assert len(history.slice(110.0, 120.0)["timestamp"]) == 0
+    assert len(history.slice(104.2, 104.8)["timestamp"]) == 0
+
+
+def test_reopened_session_continues_segment_numbering(tmp_path):
+    _record(tmp_path, 5)
+    recorder = TelemetryRecorder(tmp_path, session="s1", segment_rows=4)
+    recorder.append({"timestamp": 200.0})
+    recorder.close()
+
+    history = TelemetryHistory("s1", tmp_path)
+    assert len(history.segments) == 3
+    assert history.time_range == (100.0, 200.0)
+    summary = history.summary()
+    assert summary["rows"] == 6
+    assert np.isclose(summary["fps"]["max"], 204.0)
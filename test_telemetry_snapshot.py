@@ -0,0 +1,63 @@
+from cs2tune.frame_stats import FrameStats
+from cs2tune.profile_controller import GPU_SAVER, ProfileController
+from cs2tune.telemetry_recorder import TelemetryHistory, TelemetryRecorder
+from cs2tune.telemetry_snapshot import SnapshotCollector
+
+
+class Sensors:
+    """Readings that change on every call, so a second read would show up."""
+
+    def __init__(self):
+        self.calls = {"gpu": 0, "cpu": 0, "fps": 0}
+        self.fps_usage = []
+
+    def gpu(self):
+        self.calls["gpu"] += 1
+        n = self.calls["gpu"]
+        return 85.5 + n, 96.5 + n, 5.5 + n
+
+    def cpu(self):
+        self.calls["cpu"] += 1
+        return 64.5 + self.calls["cpu"]
+
+    def fps(self, gpu_usage):
+        self.calls["fps"] += 1
+        self.fps_usage.append(gpu_usage)
+        return 239.0 + self.calls["fps"]
+
+
+def test_one_collect_feeds_every_consumer_the_same_values(tmp_path):
+    sensors = Sensors()
+    stats = FrameStats()
+    for _ in range(100):
+        stats.add_fps(200.0)
+    collector = SnapshotCollector(sensors.gpu, sensors.cpu, sensors.fps, stats)
+
+    snapshot = collector.collect()
+    assert sensors.calls == {"gpu": 1, "cpu": 1, "fps": 1}
+    assert sensors.fps_usage == [snapshot.gpu_usage]  # the FPS estimate reuses this tick's GPU read
+    assert collector.last is snapshot
+    assert (snapshot.gpu_temp, snapshot.gpu_usage, snapshot.vram_used) == (86.5, 97.5, 6.5)
+    assert (snapshot.cpu_temp, snapshot.fps) == (65.5, 240.0)
+    assert abs(snapshot.fps_p1_low - 200.0) < 3.0
+
+    overlay = snapshot.as_overlay("balanced")
+    recorder = TelemetryRecorder(tmp_path, session="tick")
+    recorder.record(snapshot)
+    recorder.close()
+    controller = ProfileController()
+    profile = controller.update(snapshot)
+
+    # Consuming the snapshot never goes back to the sensors
+    assert sensors.calls == {"gpu": 1, "cpu": 1, "fps": 1}
+
+    assert (overlay["fps"], overlay["gpu_temp"], overlay["gpu_usage"], overlay["cpu_temp"]) == (240, 86.5, 97.5, 65.5)
+
+    row = TelemetryHistory("tick", tmp_path).slice()
+    assert len(row["timestamp"]) == 1
+    for name, value in snapshot.as_dict().items():
+        assert abs(float(row[name][0]) - value) < 1e-3, name
+
+    state = controller.state
+    assert (state.gpu_temp, state.gpu_usage, state.fps) == (86.5, 97.5, 240.0)
+    assert profile == GPU_SAVER
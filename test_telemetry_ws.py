@@ -0,0 +1,78 @@
+import asyncio
+import logging
+
+import pytest
+
+pytest.importorskip("socketio")
+pytest.importorskip("fastapi")
+
+from cs2tune import telemetry_ws  # noqa: E402
+
+
+class _Ticks:
+    """Stop event that stops the sampler after `ticks` iterations."""
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+        self.waits = []
+
+    def is_set(self):
+        return len(self.waits) >= self.ticks
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+
+
+def test_ring_since_returns_only_newer_frames():
+    ring = telemetry_ws.TelemetryRing(size=3)
+    assert ring.latest() == (0, None)
+    for i in range(5):
+        ring.publish({"fps": i})
+    assert ring.latest() == (5, {"fps": 4})
+    assert [seq for seq, _ in ring.since(0)] == [3, 4, 5]  # older frames fell out
+    assert ring.since(4) == [(5, {"fps": 4})]
+    assert ring.since(5) == []
+
+
+def test_sampler_logs_failures_and_publishes_frames(monkeypatch, caplog):
+    ring = telemetry_ws.TelemetryRing()
+    results = iter([RuntimeError("nvml gone"), None, {"fps": 240.0}, {"fps": 250.0}])
+
+    def sample_frame():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(telemetry_ws, "ring", ring)
+    monkeypatch.setattr(telemetry_ws, "sample_frame", sample_frame)
+    stop = _Ticks(4)
+    with caplog.at_level(logging.ERROR):
+        telemetry_ws.sampler_loop(stop)
+
+    assert "Telemetry sampling failed: nvml gone" in caplog.text
+    # Neither the failure nor the missing GPU publishes a frame
+    assert ring.since(0) == [(1, {"fps": 240.0}), (2, {"fps": 250.0})]
+    assert all(0 <= wait <= telemetry_ws.sample_interval() for wait in stop.waits)
+
+
+def test_emitter_backs_off_while_no_frames_arrive(monkeypatch):
+    delays = []
+
+    class Stop(Exception):
+        pass
+
+    async def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 7:
+            raise Stop
+
+    monkeypatch.setattr(telemetry_ws, "ring", telemetry_ws.TelemetryRing())
+    monkeypatch.setattr(telemetry_ws.asyncio, "sleep", sleep)
+    with pytest.raises(Stop):
+        asyncio.run(telemetry_ws.emit_telemetry())
+
+    interval = telemetry_ws.sample_interval()
+    expected = [min(interval * 2 ** i, telemetry_ws.NO_GPU_BACKOFF_MAX) for i in range(7)]
+    assert delays == pytest.approx(expected)
+    assert delays[-1] == telemetry_ws.NO_GPU_BACKOFF_MAX
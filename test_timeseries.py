@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from cs2tune.timeseries import SampleRing
+
+
+def _fill(ring, count, start=0):
+    for i in range(start, start + count):
+        ring.append(timestamp=float(i), fps=100.0 + i)
+
+
+def test_window_before_and_after_wraparound():
+    ring = SampleRing(4)
+    assert len(ring) == 0 and ring.latest() is None
+    assert len(ring.window()) == 0
+
+    _fill(ring, 3)
+    assert list(ring.window()["timestamp"]) == [0.0, 1.0, 2.0]
+
+    _fill(ring, 4, start=3)  # 7 samples into a ring of 4
+    assert len(ring) == 4
+    assert list(ring.window()["timestamp"]) == [3.0, 4.0, 5.0, 6.0]
+    assert list(ring.window(2)["fps"]) == [105.0, 106.0]
+    assert list(ring.window(10)["timestamp"]) == [3.0, 4.0, 5.0, 6.0]
+    assert ring.latest()["timestamp"] == 6.0
+
+
+def test_window_is_a_contiguous_read_only_view_of_the_double_written_buffer():
+    ring = SampleRing(4)
+    for start in range(0, 11):
+        _fill(ring, 1, start=start)
+        view = ring.window()
+        # Every window is one slice of the buffer, wherever the head is
+        assert view.base is not None and view.flags.c_contiguous
+        assert list(view["timestamp"]) == [float(i) for i in range(max(0, start - 3), start + 1)]
+    with pytest.raises(ValueError):
+        view["fps"][0] = 0.0
+
+    snapshot = ring.snapshot()
+    _fill(ring, 4, start=11)
+    # The view aliases rows that have since been overwritten; the snapshot does not
+    assert list(view["timestamp"]) == [11.0, 12.0, 13.0, 14.0]
+    assert list(snapshot["timestamp"]) == [7.0, 8.0, 9.0, 10.0]
+
+
+def test_since_returns_samples_from_a_time_onwards():
+    ring = SampleRing(5)
+    _fill(ring, 8)  # holds 3..7
+    assert list(ring.since(5.0)["timestamp"]) == [5.0, 6.0, 7.0]
+    assert list(ring.since(4.5)["timestamp"]) == [5.0, 6.0, 7.0]
+    assert list(ring.since(0.0)["timestamp"]) == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert len(ring.since(7.5)) == 0
+
+    ring.clear()
+    assert len(ring.since(0.0)) == 0
+    ring.append(1.0, 60.0, 50.0, 70.0, 90.0)
+    sample = ring.since(1.0)[0]
+    assert sample["gpu_usage"] == np.float32(90.0)